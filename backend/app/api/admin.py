@@ -1,9 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, List, Optional
 
-from app.models.schemas import RoleCreateRequest, UsageStats, UserCreateRequest
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.models.schemas import (
+    AuditEventPage,
+    PolicyEventPage,
+    PolicyRule,
+    RoleCreateRequest,
+    TenantPolicyRequest,
+    UsageStats,
+    UserCreateRequest,
+)
+from app.observability.audit import AuditLogger
+from app.observability.tracing import Tracer
 from app.services.admin_service import AdminService
+from app.services.policy_service import PolicyService
 
 
 router = APIRouter()
@@ -15,12 +28,30 @@ def get_admin_service() -> AdminService:
     return admin_service
 
 
+def get_policy_service() -> PolicyService:
+    from app.main import policy_service
+
+    return policy_service
+
+
+def get_audit_logger() -> AuditLogger:
+    from app.main import audit_logger
+
+    return audit_logger
+
+
+def get_tracer() -> Tracer:
+    from app.main import tracer
+
+    return tracer
+
+
 @router.post("/v1/admin/roles")
 async def create_role(
     request: RoleCreateRequest,
     admin_service: AdminService = Depends(get_admin_service),
 ) -> dict:
-    admin_service.create_role(request)
+    await admin_service.create_role(request)
     return {"status": "created"}
 
 
@@ -29,7 +60,7 @@ async def create_user(
     request: UserCreateRequest,
     admin_service: AdminService = Depends(get_admin_service),
 ) -> dict:
-    admin_service.create_user(request)
+    await admin_service.create_user(request)
     return {"status": "created"}
 
 
@@ -38,3 +69,54 @@ async def usage(
     admin_service: AdminService = Depends(get_admin_service),
 ) -> UsageStats:
     return admin_service.usage_stats()
+
+
+@router.get("/v1/admin/traces/{run_id}")
+async def trace(
+    run_id: str,
+    tracer: Tracer = Depends(get_tracer),
+) -> List[Dict[str, Any]]:
+    spans = tracer.spans_for(run_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return [span.to_dict() for span in spans]
+
+
+@router.post("/v1/admin/policies")
+async def set_policies(
+    request: TenantPolicyRequest,
+    policy_service: PolicyService = Depends(get_policy_service),
+) -> dict:
+    try:
+        policy_service.set_tenant_rules(request.tenant_id, request.rules)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return {"status": "updated"}
+
+
+@router.get("/v1/admin/policies/{tenant_id}", response_model=List[PolicyRule])
+async def get_policies(
+    tenant_id: str,
+    policy_service: PolicyService = Depends(get_policy_service),
+) -> List[PolicyRule]:
+    return policy_service.tenant_rules(tenant_id)
+
+
+@router.get("/v1/admin/policy-events", response_model=PolicyEventPage)
+async def policy_events(
+    cursor: Optional[int] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    policy_service: PolicyService = Depends(get_policy_service),
+) -> PolicyEventPage:
+    items, next_cursor = policy_service.list_events(cursor, limit)
+    return PolicyEventPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/v1/admin/audit-events", response_model=AuditEventPage)
+async def audit_events(
+    cursor: Optional[int] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    audit_logger: AuditLogger = Depends(get_audit_logger),
+) -> AuditEventPage:
+    items, next_cursor = audit_logger.list_events(cursor, limit)
+    return AuditEventPage(items=items, next_cursor=next_cursor)
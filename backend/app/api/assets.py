@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Optional
 
-from app.models.schemas import AssetCreateRequest, AssetResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.models.schemas import AssetCreateRequest, AssetListResponse, AssetResponse, AssetStatusRequest
 from app.services.asset_service import AssetService
+from app.services.repositories import AssetConflict
 
 
 router = APIRouter()
@@ -15,16 +18,97 @@ def get_asset_service() -> AssetService:
     return asset_service
 
 
+def _not_modified(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.post("/v1/assets", response_model=AssetResponse)
 async def create_asset(
     request: AssetCreateRequest,
     asset_service: AssetService = Depends(get_asset_service),
 ) -> AssetResponse:
-    return asset_service.create(request)
+    try:
+        return await asset_service.create(request)
+    except AssetConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
 
 
-@router.get("/v1/assets", response_model=list[AssetResponse])
+@router.get("/v1/assets", response_model=AssetListResponse)
 async def list_assets(
+    response: Response,
+    tenant_id: str = "default",
+    asset_type: Optional[str] = None,
+    name: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    if_none_match: Optional[str] = Header(default=None),
     asset_service: AssetService = Depends(get_asset_service),
-) -> list[AssetResponse]:
-    return asset_service.list_assets()
+):
+    etag = await asset_service.catalog_etag(tenant_id, asset_type, name, status, cursor, str(limit))
+    if _not_modified(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag})
+    try:
+        items, next_cursor = await asset_service.list_assets(
+            tenant_id, asset_type=asset_type, name=name, status=status, cursor=cursor, limit=limit
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    response.headers["ETag"] = etag
+    return AssetListResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get("/v1/assets/lookup", response_model=AssetResponse)
+async def lookup_asset(
+    response: Response,
+    asset_type: str,
+    name: str,
+    version: Optional[str] = None,
+    tenant_id: str = "default",
+    if_none_match: Optional[str] = Header(default=None),
+    asset_service: AssetService = Depends(get_asset_service),
+):
+    asset = await asset_service.resolve(tenant_id, asset_type, name, version)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    etag = asset_service.asset_etag(asset)
+    if _not_modified(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return asset
+
+
+@router.get("/v1/assets/{asset_id}", response_model=AssetResponse)
+async def get_asset(
+    asset_id: str,
+    response: Response,
+    tenant_id: str = "default",
+    if_none_match: Optional[str] = Header(default=None),
+    asset_service: AssetService = Depends(get_asset_service),
+):
+    asset = await asset_service.get(tenant_id, asset_id)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    etag = asset_service.asset_etag(asset)
+    if _not_modified(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return asset
+
+
+@router.post("/v1/assets/{asset_id}/status", response_model=AssetResponse)
+async def update_asset_status(
+    asset_id: str,
+    request: AssetStatusRequest,
+    tenant_id: str = "default",
+    asset_service: AssetService = Depends(get_asset_service),
+) -> AssetResponse:
+    asset = await asset_service.set_status(tenant_id, asset_id, request.status)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return asset
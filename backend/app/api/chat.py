@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import json
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
 from app.models.schemas import ChatMessageRequest, ChatMessageResponse
-from app.orchestrator.contracts import RunContext
+from app.orchestrator.contracts import RunContext, RunEvent
 from app.orchestrator.engine import OrchestratorEngine
 from app.services.admin_service import AdminService
 from app.services.state_service import StateService
+from app.services.ui_sync import SessionHub
 
 
 router = APIRouter()
@@ -30,16 +36,20 @@ def get_admin_service() -> AdminService:
     return admin_service
 
 
-@router.post("/v1/chat/message", response_model=ChatMessageResponse)
-async def chat_message(
+def get_session_hub() -> SessionHub:
+    from app.main import session_hub
+
+    return session_hub
+
+
+async def build_context(
     request: ChatMessageRequest,
-    engine: OrchestratorEngine = Depends(get_engine),
-    state_service: StateService = Depends(get_state_service),
-    admin_service: AdminService = Depends(get_admin_service),
-) -> ChatMessageResponse:
-    ui_state = state_service.get_state(request.session_id)
-    roles = admin_service.user_permissions(request.user_id)
-    ctx = RunContext(
+    state_service: StateService,
+    admin_service: AdminService,
+) -> RunContext:
+    ui_state = await state_service.get_state(request.session_id)
+    permissions = await admin_service.permission_set(request.user_id)
+    return RunContext(
         session_id=request.session_id,
         conversation_id=request.conversation_id,
         agent_id=request.agent_id,
@@ -47,8 +57,49 @@ async def chat_message(
         tenant_id=request.tenant_id,
         message=request.message,
         ui_state=ui_state,
-        policies={"roles": roles},
+        policies={"roles": sorted(permissions.permissions), "permissions": permissions},
         tool_catalog=[],
         kb_id=ui_state.get("kb_id"),
     )
-    return await engine.run(ctx)
+
+
+def encode_sse(event: RunEvent) -> str:
+    data = event.data.model_dump(mode="json") if isinstance(event.data, BaseModel) else event.data
+    return f"event: {event.event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/v1/chat/message", response_model=ChatMessageResponse)
+async def chat_message(
+    request: ChatMessageRequest,
+    engine: OrchestratorEngine = Depends(get_engine),
+    state_service: StateService = Depends(get_state_service),
+    admin_service: AdminService = Depends(get_admin_service),
+    session_hub: SessionHub = Depends(get_session_hub),
+) -> ChatMessageResponse:
+    ctx = await build_context(request, state_service, admin_service)
+    response = await engine.run(ctx)
+    await session_hub.dispatch_actions(request.session_id, response.tool_runs)
+    return response
+
+
+@router.post("/v1/chat/message/stream")
+async def chat_message_stream(
+    request: ChatMessageRequest,
+    engine: OrchestratorEngine = Depends(get_engine),
+    state_service: StateService = Depends(get_state_service),
+    admin_service: AdminService = Depends(get_admin_service),
+    session_hub: SessionHub = Depends(get_session_hub),
+) -> StreamingResponse:
+    ctx = await build_context(request, state_service, admin_service)
+
+    async def events() -> AsyncIterator[str]:
+        async for event in engine.stream(ctx):
+            if event.event == "action":
+                await session_hub.dispatch_actions(request.session_id, [event.data])
+            yield encode_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
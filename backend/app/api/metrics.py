@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.observability.metrics import MetricsRegistry
+
+
+router = APIRouter()
+
+
+def get_metrics() -> MetricsRegistry:
+    from app.main import metrics
+
+    return metrics
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(
+    metrics: MetricsRegistry = Depends(get_metrics),
+) -> PlainTextResponse:
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/v1/admin/latency")
+async def latency_summary(
+    metrics: MetricsRegistry = Depends(get_metrics),
+) -> list:
+    return metrics.latency_summary()
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import asyncio
+from typing import List
 
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+
+from app.config import settings
 from app.models.schemas import (
+    KnowledgeBaseBulkIngestResponse,
     KnowledgeBaseCreateRequest,
+    KnowledgeBaseDocumentAclRequest,
     KnowledgeBaseDocumentRequest,
     RAGQueryRequest,
     RAGQueryResponse,
@@ -53,6 +60,96 @@ async def add_document(
     return {"doc_id": doc_id}
 
 
+@router.post("/v1/kb/{kb_id}/documents/bulk", response_model=KnowledgeBaseBulkIngestResponse)
+async def bulk_add_documents(
+    kb_id: str,
+    http_request: Request,
+    rag_service: RAGService = Depends(get_rag_service),
+) -> KnowledgeBaseBulkIngestResponse:
+    if not rag_service.has_kb(kb_id):
+        raise HTTPException(status_code=404, detail="Knowledge base not found")
+    doc_ids: List[str] = []
+    batch: List[KnowledgeBaseDocumentRequest] = []
+    buffer = bytearray()
+    line_no = 0
+
+    def parse(line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            batch.append(KnowledgeBaseDocumentRequest.model_validate_json(line))
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=422,
+                detail={"line": line_no, "errors": exc.errors(include_url=False), "ingested": doc_ids},
+            )
+
+    async def flush() -> None:
+        prepared = await asyncio.to_thread(rag_service.prepare_documents, kb_id, list(batch))
+        batch.clear()
+        doc_ids.extend(rag_service.commit_documents(kb_id, prepared))
+
+    async for chunk in http_request.stream():
+        scan_from = len(buffer)
+        buffer.extend(chunk)
+        start = 0
+        newline = buffer.find(b"\n", scan_from)
+        while newline != -1:
+            line_no += 1
+            parse(bytes(buffer[start:newline]))
+            if len(batch) >= settings.rag_ingest_batch_size:
+                await flush()
+            start = newline + 1
+            newline = buffer.find(b"\n", start)
+        del buffer[:start]
+    line_no += 1
+    parse(bytes(buffer))
+    if batch:
+        await flush()
+    return KnowledgeBaseBulkIngestResponse(doc_ids=doc_ids)
+
+
+@router.put("/v1/kb/{kb_id}/documents/{doc_id}/acl")
+async def update_document_acl(
+    kb_id: str,
+    doc_id: str,
+    request: KnowledgeBaseDocumentAclRequest,
+    rag_service: RAGService = Depends(get_rag_service),
+) -> dict:
+    try:
+        rag_service.update_document_acl(kb_id, doc_id, request.acl)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return {"status": "updated"}
+
+
+@router.delete("/v1/kb/{kb_id}/documents/{doc_id}")
+async def delete_document(
+    kb_id: str,
+    doc_id: str,
+    rag_service: RAGService = Depends(get_rag_service),
+) -> dict:
+    try:
+        rag_service.delete_document(kb_id, doc_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return {"status": "deleted"}
+
+
+@router.post("/v1/kb/{kb_id}/snapshot")
+async def save_snapshot(
+    kb_id: str,
+    rag_service: RAGService = Depends(get_rag_service),
+) -> dict:
+    if not rag_service.has_kb(kb_id):
+        raise HTTPException(status_code=404, detail="Knowledge base not found")
+    try:
+        path = rag_service.save_snapshot(kb_id)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return {"kb_id": kb_id, "path": str(path)}
+
+
 @router.post("/v1/rag/query", response_model=RAGQueryResponse)
 async def rag_query(
     request: RAGQueryRequest,
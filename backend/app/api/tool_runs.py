@@ -1,19 +1,19 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 
 from app.models.schemas import ToolRunResult
 from app.services.admin_service import AdminService
-from app.services.tool_service import ToolService
+from app.services.ui_sync import SessionHub
 
 
 router = APIRouter()
 
 
-def get_tool_service() -> ToolService:
-    from app.main import tool_service
+def get_session_hub() -> SessionHub:
+    from app.main import session_hub
 
-    return tool_service
+    return session_hub
 
 
 def get_admin_service() -> AdminService:
@@ -25,9 +25,14 @@ def get_admin_service() -> AdminService:
 @router.post("/v1/tools/action-result")
 async def action_result(
     result: ToolRunResult,
-    tool_service: ToolService = Depends(get_tool_service),
+    session_hub: SessionHub = Depends(get_session_hub),
     admin_service: AdminService = Depends(get_admin_service),
 ) -> dict:
-    tool_service.record_result(result)
+    try:
+        await session_hub.record_tool_result(result)
+    except LookupError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
     admin_service.increment_usage("tool_runs")
     return {"status": "recorded"}
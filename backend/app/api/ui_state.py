@@ -1,9 +1,23 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from typing import Any, Dict, Optional
 
-from app.models.schemas import UIStatePatchRequest, UIStatePatchResponse
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from app.models.schemas import (
+    ToolRunResult,
+    UIStatePatchRequest,
+    UIStatePatchResponse,
+    UIStateResponse,
+    UISyncPatchMessage,
+)
+from app.services.admin_service import AdminService
 from app.services.state_service import StateService
+from app.services.state_store import StateVersionConflict
+from app.services.ui_sync import SessionHub
 
 
 router = APIRouter()
@@ -15,14 +29,111 @@ def get_state_service() -> StateService:
     return state_service
 
 
+def get_session_hub() -> SessionHub:
+    from app.main import session_hub
+
+    return session_hub
+
+
+def get_admin_service() -> AdminService:
+    from app.main import admin_service
+
+    return admin_service
+
+
 @router.post("/v1/ui/state", response_model=UIStatePatchResponse)
 async def patch_state(
     request: UIStatePatchRequest,
-    state_service: StateService = Depends(get_state_service),
+    session_hub: SessionHub = Depends(get_session_hub),
 ) -> UIStatePatchResponse:
-    event = state_service.apply_patch(request.session_id, request.ui_state_patch, request.version)
+    try:
+        event = await session_hub.apply_patch(request.session_id, request.ui_state_patch, request.version)
+    except StateVersionConflict as exc:
+        raise HTTPException(status_code=409, detail={"message": str(exc), "version": exc.current_version})
     return UIStatePatchResponse(
         session_id=request.session_id,
         version=event["version"],
         updated_at=event["updated_at"],
     )
+
+
+@router.get("/v1/ui/state/{session_id}", response_model=UIStateResponse)
+async def get_state(
+    session_id: str,
+    version: Optional[int] = None,
+    state_service: StateService = Depends(get_state_service),
+) -> UIStateResponse:
+    if version is None:
+        return UIStateResponse(
+            session_id=session_id,
+            version=await state_service.get_version(session_id),
+            ui_state=await state_service.get_state(session_id),
+        )
+    try:
+        ui_state = await state_service.get_state_at(session_id, version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="State version not retained")
+    return UIStateResponse(session_id=session_id, version=version, ui_state=ui_state)
+
+
+@router.websocket("/v1/ui/sync/{session_id}")
+async def sync_session(
+    websocket: WebSocket,
+    session_id: str,
+    session_hub: SessionHub = Depends(get_session_hub),
+    admin_service: AdminService = Depends(get_admin_service),
+) -> None:
+    await websocket.accept()
+    queue = session_hub.subscribe(session_id)
+    await websocket.send_json(await session_hub.snapshot(session_id))
+
+    async def forward() -> None:
+        while True:
+            await websocket.send_json(await queue.get())
+
+    sender = asyncio.create_task(forward())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                reply = {"type": "error", "id": None, "detail": "Sync messages must be valid JSON"}
+            else:
+                reply = await handle_sync_message(session_hub, session_id, message, queue, admin_service)
+            await queue.put(reply)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        session_hub.unsubscribe(session_id, queue)
+
+
+async def handle_sync_message(
+    session_hub: SessionHub,
+    session_id: str,
+    message: Any,
+    queue: asyncio.Queue,
+    admin_service: Optional[AdminService] = None,
+) -> Dict[str, Any]:
+    if not isinstance(message, dict):
+        return {"type": "error", "id": None, "detail": "Sync messages must be JSON objects"}
+    message_id = message.get("id")
+    try:
+        if message.get("type") == "patch":
+            frame = UISyncPatchMessage.model_validate(message)
+            event = await session_hub.apply_patch(session_id, frame.patch, frame.version, source=queue)
+            return {"type": "ack", "id": message_id, "version": event["version"]}
+        if message.get("type") == "tool_result":
+            result = ToolRunResult.model_validate(message["result"])
+            event = await session_hub.record_tool_result(result, session_id)
+            if admin_service is not None:
+                admin_service.increment_usage("tool_runs")
+            version = event["version"] if event else await session_hub.version(session_id)
+            return {"type": "ack", "id": message_id, "version": version}
+        if message.get("type") == "resync":
+            return await session_hub.snapshot(session_id)
+        return {"type": "error", "id": message_id, "detail": f"Unknown message type: {message.get('type')}"}
+    except StateVersionConflict as exc:
+        return {"type": "nack", "id": message_id, "version": exc.current_version, "detail": str(exc)}
+    except (KeyError, LookupError, ValueError, ValidationError) as exc:
+        return {"type": "error", "id": message_id, "detail": str(exc)}
@@ -1,9 +1,74 @@
-from pydantic import BaseModel
+import os
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 
 class Settings(BaseModel):
     app_name: str = "FabrixClone"
     environment: str = "development"
+    rag_chunk_size: int = 1000
+    rag_chunk_overlap: int = 200
+    rag_ingest_batch_size: int = 500
+    rag_embedding_dim: int = 256
+    rag_dense_min_score: float = 0.2
+    rag_dense_only_min_score: float = 0.8
+    rag_ivf_train_threshold: int = 50_000
+    rag_ivf_nprobe: int = 8
+    rag_query_cache_size: int = 4096
+    rag_query_cache_ttl_s: float = 300.0
+    redis_url: Optional[str] = Field(default_factory=lambda: os.getenv("REDIS_URL"))
+    tool_run_store_backend: str = Field(default_factory=lambda: os.getenv("TOOL_RUN_STORE_BACKEND", "memory"))
+    database_url: Optional[str] = Field(default_factory=lambda: os.getenv("DATABASE_URL"))
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_s: float = 30.0
+    db_pool_recycle_s: float = 1800.0
+    db_echo: bool = False
+    db_create_tables: bool = Field(default_factory=lambda: os.getenv("DB_CREATE_TABLES", "true").lower() == "true")
+    rbac_cache_ttl_s: float = 60.0
+    asset_max_page_size: int = 200
+    agent_plan_refresh_s: float = 30.0
+    agent_plan_cache_size: int = 1024
+    intent_dataset_name: str = "default"
+    intent_feature_dim: int = 1024
+    intent_train_epochs: int = 200
+    intent_min_confidence: float = 0.5
+    intent_batch_max_size: int = 32
+    intent_batch_max_delay_ms: float = 2.0
+    intent_max_tenants: int = 1024
+    llm_backend: str = Field(default_factory=lambda: os.getenv("LLM_BACKEND", "none"))
+    llm_base_url: str = Field(default_factory=lambda: os.getenv("LLM_BASE_URL", "https://api.openai.com/v1"))
+    llm_api_key: Optional[str] = Field(default_factory=lambda: os.getenv("LLM_API_KEY"))
+    llm_model: str = Field(default_factory=lambda: os.getenv("LLM_MODEL", "gpt-4o-mini"))
+    llm_max_tokens: int = 512
+    llm_temperature: float = 0.0
+    llm_timeout_s: float = 60.0
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_cache_size: int = 2048
+    llm_cache_ttl_s: float = 600.0
+    llm_tenant_token_budget: int = 0
+    llm_budget_window_s: float = 3600.0
+    tool_run_ttl_s: float = 3600.0
+    tool_run_max_runs: int = 10_000
+    state_store_backend: str = Field(default_factory=lambda: os.getenv("STATE_STORE_BACKEND", "memory"))
+    state_history_limit: int = 100
+    state_snapshot_interval: int = 20
+    state_ttl_s: float = 86400.0
+    ui_sync_queue_size: int = 256
+    policy_output_lookback_chars: int = 32
+    tool_limits_backend: str = Field(default_factory=lambda: os.getenv("TOOL_LIMITS_BACKEND", "memory"))
+    tool_rate_limit_window_s: float = 60.0
+    trace_buffer_size: int = 10_000
+    trace_export_path: Optional[str] = Field(default_factory=lambda: os.getenv("TRACE_EXPORT_PATH"))
+    event_log_capacity: int = 10_000
+    event_log_batch_size: int = 200
+    event_log_flush_interval_s: float = 1.0
+    event_log_max_pending: int = 50_000
+    event_sink_backend: str = Field(default_factory=lambda: os.getenv("EVENT_SINK_BACKEND", "file"))
+    event_sink_path: Optional[str] = Field(default_factory=lambda: os.getenv("EVENT_SINK_PATH"))
+    rag_snapshot_dir: Optional[str] = Field(default_factory=lambda: os.getenv("RAG_SNAPSHOT_DIR"))
 
 
 settings = Settings()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+
+
+class TTLCache:
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        ttl_s: float = 300.0,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._name = name
+        self._maxsize = maxsize
+        self._ttl_s = ttl_s
+        self._metrics = metrics or default_metrics
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._metrics.incr(f"{self._name}.misses")
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._metrics.incr(f"{self._name}.expirations")
+            self._metrics.incr(f"{self._name}.misses")
+            return None
+        self._entries.move_to_end(key)
+        self._metrics.incr(f"{self._name}.hits")
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_s, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._metrics.incr(f"{self._name}.evictions")
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1 +1,47 @@
-"""Database session placeholder."""
+"""Async SQLAlchemy engine and session factory for the optional database backend."""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import StaticPool
+except ImportError:
+    create_async_engine = None
+
+
+def create_db_engine(
+    url: str,
+    pool_size: int = 10,
+    max_overflow: int = 20,
+    pool_timeout_s: float = 30.0,
+    pool_recycle_s: float = 1800.0,
+    echo: bool = False,
+) -> Any:
+    if create_async_engine is None:
+        raise RuntimeError("The sqlalchemy package is required for the database backend")
+    if url.startswith("sqlite"):
+        if ":memory:" in url or url.endswith("://"):
+            return create_async_engine(url, echo=echo, poolclass=StaticPool, connect_args={"check_same_thread": False})
+        return create_async_engine(url, echo=echo)
+    return create_async_engine(
+        url,
+        echo=echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout_s,
+        pool_recycle=pool_recycle_s,
+        pool_pre_ping=True,
+    )
+
+
+def create_session_factory(engine: Any) -> Any:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def init_models(engine: Any) -> None:
+    from app.models.db import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,28 @@
+"""Shared httpx client factory for outbound HTTP calls such as the LLM adapter."""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def create_http_client(
+    timeout_s: float = 30.0,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry_s: float = 30.0,
+) -> Any:
+    if httpx is None:
+        raise RuntimeError("The httpx package is required for outbound HTTP clients")
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout_s),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_s,
+        ),
+    )
@@ -1 +1,16 @@
-"""Redis client placeholder."""
+"""Asyncio Redis client factory for the optional Redis-backed stores."""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+
+def create_redis_client(url: str) -> Any:
+    if redis is None:
+        raise RuntimeError("The redis package is required for Redis-backed stores")
+    return redis.Redis.from_url(url, decode_responses=True)
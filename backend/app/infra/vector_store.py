@@ -1 +1,224 @@
-"""Vector store placeholder."""
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def select_top_k(scores: np.ndarray, keys: np.ndarray, top_k: int) -> List[Tuple[float, int]]:
+    finite = np.isfinite(scores)
+    if not finite.all():
+        scores, keys = scores[finite], keys[finite]
+    if not scores.size or top_k <= 0:
+        return []
+    if top_k < scores.size:
+        part = np.argpartition(-scores, top_k - 1)[:top_k]
+        scores, keys = scores[part], keys[part]
+    order = np.argsort(-scores, kind="stable")
+    return [(float(scores[i]), int(keys[i])) for i in order]
+
+
+class VectorStore:
+    dim: int
+
+    def add_batch(self, keys: Sequence[int], vectors: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def remove(self, key: int) -> None:
+        raise NotImplementedError
+
+    def search_batch(
+        self, queries: np.ndarray, top_k: int, allowed: Optional[bytes] = None
+    ) -> List[List[Tuple[float, int]]]:
+        raise NotImplementedError
+
+    def search(self, query: np.ndarray, top_k: int, allowed: Optional[bytes] = None) -> List[Tuple[float, int]]:
+        return self.search_batch(np.atleast_2d(query), top_k, allowed)[0]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        raise NotImplementedError
+
+    def load_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        raise NotImplementedError
+
+
+class NumpyVectorStore(VectorStore):
+    def __init__(self, dim: int, initial_capacity: int = 1024) -> None:
+        self.dim = dim
+        self._matrix = np.zeros((initial_capacity, dim), dtype=np.float32)
+        self._live = np.zeros(initial_capacity, dtype=bool)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_batch(self, keys: Sequence[int], vectors: np.ndarray) -> None:
+        keys = np.asarray(keys, dtype=np.int64)
+        if not keys.size:
+            return
+        end = int(keys.max()) + 1
+        self._reserve(end)
+        self._matrix[keys] = normalize_rows(vectors)
+        self._live[keys] = True
+        self._size = max(self._size, end)
+
+    def remove(self, key: int) -> None:
+        if key < self._size:
+            self._live[key] = False
+
+    def search_batch(
+        self, queries: np.ndarray, top_k: int, allowed: Optional[bytes] = None
+    ) -> List[List[Tuple[float, int]]]:
+        queries = normalize_rows(queries)
+        candidates = np.flatnonzero(self._mask(allowed))
+        if not candidates.size:
+            return [[] for _ in range(len(queries))]
+        if candidates.size == self._size:
+            scores = queries @ self._matrix[: self._size].T
+        else:
+            scores = queries @ self._matrix[candidates].T
+        return [select_top_k(row, candidates, top_k) for row in scores]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"vectors": self._matrix[: self._size], "live": self._live[: self._size]}
+
+    def load_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        self._matrix = arrays["vectors"]
+        self._live = np.array(arrays["live"], dtype=bool)
+        self._size = len(self._live)
+
+    def _mask(self, allowed: Optional[bytes]) -> np.ndarray:
+        mask = self._live[: self._size]
+        if allowed is None:
+            return mask
+        bits = np.unpackbits(np.frombuffer(allowed, dtype=np.uint8), bitorder="little")[: self._size]
+        allowed_mask = np.zeros(self._size, dtype=bool)
+        allowed_mask[: bits.size] = bits
+        return mask & allowed_mask
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._matrix)
+        if size <= capacity:
+            return
+        capacity = max(capacity, 1)
+        while capacity < size:
+            capacity *= 2
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        live = np.zeros(capacity, dtype=bool)
+        live[: self._size] = self._live[: self._size]
+        self._matrix, self._live = matrix, live
+
+
+class IVFVectorStore(NumpyVectorStore):
+    def __init__(
+        self,
+        dim: int,
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+        train_threshold: int = 50_000,
+        kmeans_iterations: int = 10,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(dim)
+        self._n_lists = n_lists
+        self._nprobe = nprobe
+        self._train_threshold = train_threshold
+        self._kmeans_iterations = kmeans_iterations
+        self._rng = np.random.default_rng(seed)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._pending: Dict[int, List[int]] = {}
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def add_batch(self, keys: Sequence[int], vectors: np.ndarray) -> None:
+        super().add_batch(keys, vectors)
+        keys = np.asarray(keys, dtype=np.int64)
+        if self._centroids is not None:
+            labels = self._assign(self._matrix[keys])
+            for label, key in zip(labels.tolist(), keys.tolist()):
+                self._pending.setdefault(label, []).append(key)
+        elif int(self._live[: self._size].sum()) >= self._train_threshold:
+            self.train()
+
+    def train(self) -> None:
+        keys = np.flatnonzero(self._live[: self._size])
+        if not keys.size:
+            return
+        n_lists = min(self._n_lists or max(1, int(math.sqrt(keys.size))), keys.size)
+        sample = self._matrix[self._rng.choice(keys, min(keys.size, n_lists * 64), replace=False)]
+        centroids = sample[self._rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self._kmeans_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            filled, starts = np.unique(labels[order], return_index=True)
+            centroids[filled] = normalize_rows(np.add.reduceat(sample[order], starts, axis=0))
+        self._centroids = centroids
+        self._lists = self._build_lists(keys, self._assign(self._matrix[keys]))
+        self._pending = {}
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        arrays = super().arrays()
+        if self._centroids is not None:
+            labels = np.full(self._size, -1, dtype=np.int32)
+            for label in range(len(self._lists)):
+                labels[self._list(label)] = label
+            arrays.update(centroids=self._centroids, labels=labels)
+        return arrays
+
+    def load_arrays(self, arrays: Dict[str, np.ndarray]) -> None:
+        super().load_arrays(arrays)
+        self._centroids = None
+        self._lists = []
+        self._pending = {}
+        if "centroids" not in arrays:
+            return
+        self._centroids = np.array(arrays["centroids"], dtype=np.float32)
+        labels = np.asarray(arrays["labels"])
+        keys = np.flatnonzero(labels >= 0)
+        self._lists = self._build_lists(keys, labels[keys])
+
+    def search_batch(
+        self, queries: np.ndarray, top_k: int, allowed: Optional[bytes] = None
+    ) -> List[List[Tuple[float, int]]]:
+        if self._centroids is None:
+            return super().search_batch(queries, top_k, allowed)
+        queries = normalize_rows(queries)
+        mask = self._mask(allowed)
+        nprobe = min(self._nprobe, len(self._centroids))
+        probes = np.argpartition(-(queries @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        results = []
+        for query, probe in zip(queries, probes):
+            candidates = np.concatenate([self._list(int(label)) for label in probe])
+            candidates = candidates[mask[candidates]]
+            results.append(select_top_k(self._matrix[candidates] @ query, candidates, top_k))
+        return results
+
+    def _build_lists(self, keys: np.ndarray, labels: np.ndarray) -> List[np.ndarray]:
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(len(self._centroids) + 1))
+        return [keys[order[bounds[i] : bounds[i + 1]]] for i in range(len(self._centroids))]
+
+    def _assign(self, vectors: np.ndarray, batch_size: int = 65_536) -> np.ndarray:
+        labels = [
+            np.argmax(vectors[i : i + batch_size] @ self._centroids.T, axis=1)
+            for i in range(0, len(vectors), batch_size)
+        ]
+        return np.concatenate(labels) if labels else np.zeros(0, dtype=np.int64)
+
+    def _list(self, label: int) -> np.ndarray:
+        pending = self._pending.pop(label, None)
+        if pending:
+            self._lists[label] = np.concatenate([self._lists[label], np.asarray(pending, dtype=np.int64)])
+        return self._lists[label]
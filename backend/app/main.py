@@ -1,27 +1,243 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+import time
+from typing import Any, Optional
 
-from app.api import admin, assets, chat, rag, tool_runs, ui_state
+from fastapi import FastAPI, Request
+
+from app.api import admin, assets, chat, metrics as metrics_api, rag, tool_runs, ui_state
 from app.config import settings
+from app.infra.cache import TTLCache
+from app.infra.db_session import create_db_engine, create_session_factory, init_models
+from app.infra.http import create_http_client
+from app.infra.redis import create_redis_client
+from app.infra.vector_store import IVFVectorStore
+from app.observability.audit import AuditLogger
+from app.observability.event_log import EventLog, EventSink, create_event_sink
+from app.observability.metrics import metrics
+from app.observability.tracing import JsonLinesSpanExporter, Tracer
+from app.orchestrator.agent_plans import AGENT_ASSET_TYPE, AgentPlanCompiler, AgentPlanRegistry, default_nodes
 from app.orchestrator.engine import OrchestratorEngine
 from app.services.admin_service import AdminService
 from app.services.asset_service import AssetService
+from app.services.embeddings import HashingEmbedder
+from app.services.intent_classifier import INTENT_ASSET_TYPE, IntentService
+from app.services.llm_adapter import FakeLLMBackend, LLMAdapter, LLMBackend, OpenAIChatBackend, TokenBudget
 from app.services.policy_service import PolicyService
 from app.services.rag_service import RAGService
+from app.services.repositories import (
+    AdminRepository,
+    AssetRepository,
+    InMemoryAdminRepository,
+    InMemoryAssetRepository,
+)
 from app.services.state_service import StateService
+from app.services.state_store import InMemoryStateStore, RedisStateStore, StateStore
+from app.services.tool_limits import (
+    InMemoryPendingActionTracker,
+    PendingActionTracker,
+    RateLimiter,
+    RedisPendingActionTracker,
+    RedisTokenBucketLimiter,
+    TokenBucketLimiter,
+)
+from app.services.tool_run_store import InMemoryToolRunStore, RedisToolRunStore, ToolRunStore
 from app.services.tool_service import ToolService
+from app.services.ui_sync import SessionHub
 
 
 app = FastAPI(title=settings.app_name)
 
-state_service = StateService()
-policy_service = PolicyService()
-rag_service = RAGService()
-asset_service = AssetService()
-admin_service = AdminService()
-tool_service = ToolService()
-engine = OrchestratorEngine(policy_service, tool_service, rag_service)
+
+def build_db_engine() -> Optional[Any]:
+    if not settings.database_url:
+        return None
+    return create_db_engine(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout_s=settings.db_pool_timeout_s,
+        pool_recycle_s=settings.db_pool_recycle_s,
+        echo=settings.db_echo,
+    )
+
+
+def require_db_sessions(backend: str) -> Any:
+    if db_sessions is None:
+        raise RuntimeError(f"DATABASE_URL is required for the database {backend}")
+    return db_sessions
+
+
+def build_repositories() -> tuple[AssetRepository, AdminRepository]:
+    if db_sessions is None:
+        return InMemoryAssetRepository(), InMemoryAdminRepository()
+    from app.services.sql_repositories import SqlAdminRepository, SqlAssetRepository
+
+    return SqlAssetRepository(db_sessions), SqlAdminRepository(db_sessions)
+
+
+def build_event_sink() -> Optional[EventSink]:
+    if settings.event_sink_backend == "database":
+        from app.services.sql_repositories import DatabaseEventSink
+
+        return DatabaseEventSink(require_db_sessions("event sink"))
+    if settings.event_sink_path:
+        return create_event_sink(settings.event_sink_path)
+    return None
+
+
+def build_tool_run_store() -> ToolRunStore:
+    if settings.tool_run_store_backend == "database":
+        from app.services.sql_repositories import SqlToolRunStore
+
+        return SqlToolRunStore(require_db_sessions("tool run store"), ttl_s=settings.tool_run_ttl_s)
+    if settings.tool_run_store_backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("REDIS_URL is required for the redis tool run store")
+        return RedisToolRunStore(create_redis_client(settings.redis_url), ttl_s=settings.tool_run_ttl_s)
+    return InMemoryToolRunStore(max_runs=settings.tool_run_max_runs, ttl_s=settings.tool_run_ttl_s)
+
+
+def build_tool_limits() -> tuple[RateLimiter, PendingActionTracker]:
+    if settings.tool_limits_backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("REDIS_URL is required for the redis tool limits backend")
+        client = create_redis_client(settings.redis_url)
+        return RedisTokenBucketLimiter(client), RedisPendingActionTracker(client)
+    return TokenBucketLimiter(), InMemoryPendingActionTracker()
+
+
+def build_state_store() -> StateStore:
+    if settings.state_store_backend == "redis":
+        if not settings.redis_url:
+            raise RuntimeError("REDIS_URL is required for the redis state store")
+        return RedisStateStore(
+            create_redis_client(settings.redis_url),
+            history_limit=settings.state_history_limit,
+            snapshot_interval=settings.state_snapshot_interval,
+            ttl_s=settings.state_ttl_s,
+        )
+    return InMemoryStateStore(
+        history_limit=settings.state_history_limit,
+        snapshot_interval=settings.state_snapshot_interval,
+    )
+
+
+def build_llm_backend() -> Optional[LLMBackend]:
+    if settings.llm_backend == "openai":
+        return OpenAIChatBackend(http_client, settings.llm_base_url, api_key=settings.llm_api_key)
+    if settings.llm_backend == "fake":
+        return FakeLLMBackend()
+    return None
+
+
+def build_llm_adapter() -> Optional[LLMAdapter]:
+    backend = build_llm_backend()
+    if backend is None:
+        return None
+    return LLMAdapter(
+        backend,
+        settings.llm_model,
+        max_tokens=settings.llm_max_tokens,
+        temperature=settings.llm_temperature,
+        cache=TTLCache("llm.cache", maxsize=settings.llm_cache_size, ttl_s=settings.llm_cache_ttl_s),
+        budget=TokenBudget(settings.llm_tenant_token_budget, window_s=settings.llm_budget_window_s),
+    )
+
+
+def build_event_log(name: str, serialize=dict) -> EventLog:
+    return EventLog(
+        name,
+        capacity=settings.event_log_capacity,
+        sink=event_sink,
+        serialize=serialize,
+        batch_size=settings.event_log_batch_size,
+        flush_interval_s=settings.event_log_flush_interval_s,
+        max_pending=settings.event_log_max_pending,
+    )
+
+
+db_engine = build_db_engine()
+db_sessions = create_session_factory(db_engine) if db_engine is not None else None
+http_client = (
+    create_http_client(
+        timeout_s=settings.llm_timeout_s,
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+    )
+    if settings.llm_backend == "openai"
+    else None
+)
+event_sink = build_event_sink()
+policy_events = build_event_log("policy", serialize=lambda event: event.model_dump(mode="json"))
+audit_events = build_event_log("audit")
+audit_logger = AuditLogger(event_log=audit_events)
+state_service = StateService(build_state_store())
+policy_service = PolicyService(output_lookback=settings.policy_output_lookback_chars, event_log=policy_events)
+rag_service = RAGService(
+    chunk_size=settings.rag_chunk_size,
+    chunk_overlap=settings.rag_chunk_overlap,
+    embedder=HashingEmbedder(settings.rag_embedding_dim),
+    vector_store_factory=lambda dim: IVFVectorStore(
+        dim,
+        nprobe=settings.rag_ivf_nprobe,
+        train_threshold=settings.rag_ivf_train_threshold,
+    ),
+    dense_min_score=settings.rag_dense_min_score,
+    dense_only_min_score=settings.rag_dense_only_min_score,
+    snapshot_dir=settings.rag_snapshot_dir,
+    query_cache=TTLCache(
+        "rag.query_cache",
+        maxsize=settings.rag_query_cache_size,
+        ttl_s=settings.rag_query_cache_ttl_s,
+    ),
+)
+rag_service.load_snapshots()
+asset_repository, admin_repository = build_repositories()
+asset_service = AssetService(asset_repository, max_page_size=settings.asset_max_page_size)
+admin_service = AdminService(repository=admin_repository, permission_ttl_s=settings.rbac_cache_ttl_s)
+rate_limiter, pending_actions = build_tool_limits()
+tool_service = ToolService(
+    run_store=build_tool_run_store(),
+    rate_limiter=rate_limiter,
+    pending=pending_actions,
+    rate_limit_window_s=settings.tool_rate_limit_window_s,
+)
+session_hub = SessionHub(state_service, tool_service, queue_size=settings.ui_sync_queue_size)
+tracer = Tracer(
+    capacity=settings.trace_buffer_size,
+    exporter=JsonLinesSpanExporter(
+        settings.trace_export_path,
+        batch_size=settings.event_log_batch_size,
+        flush_interval_s=settings.event_log_flush_interval_s,
+        max_pending=settings.event_log_max_pending,
+    )
+    if settings.trace_export_path
+    else None,
+)
+intent_service = IntentService(
+    asset_service,
+    dataset_name=settings.intent_dataset_name,
+    dim=settings.intent_feature_dim,
+    epochs=settings.intent_train_epochs,
+    min_confidence=settings.intent_min_confidence,
+    max_batch=settings.intent_batch_max_size,
+    max_delay_s=settings.intent_batch_max_delay_ms / 1000,
+    max_tenants=settings.intent_max_tenants,
+)
+asset_service.add_validator(INTENT_ASSET_TYPE, intent_service.validate)
+asset_service.add_listener(intent_service.on_asset_changed)
+llm_adapter = build_llm_adapter()
+agent_plans = AgentPlanRegistry(
+    AgentPlanCompiler(default_nodes(policy_service, tool_service, rag_service, intent_service, llm_adapter), tool_service),
+    asset_service,
+    refresh_s=settings.agent_plan_refresh_s,
+    max_plans=settings.agent_plan_cache_size,
+)
+asset_service.add_validator(AGENT_ASSET_TYPE, agent_plans.validate)
+asset_service.add_listener(agent_plans.on_asset_changed)
+engine = OrchestratorEngine(policy_service, tool_service, rag_service, tracer=tracer, plans=agent_plans)
 
 app.include_router(chat.router)
 app.include_router(ui_state.router)
@@ -29,3 +245,44 @@ app.include_router(tool_runs.router)
 app.include_router(rag.router)
 app.include_router(assets.router)
 app.include_router(admin.router)
+app.include_router(metrics_api.router)
+
+
+@app.on_event("startup")
+async def open_database() -> None:
+    if db_engine is not None and settings.db_create_tables:
+        await init_models(db_engine)
+    if hasattr(event_sink, "bind"):
+        event_sink.bind(asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+async def close_event_logs() -> None:
+    await asyncio.to_thread(policy_events.close)
+    await asyncio.to_thread(audit_events.close)
+    await asyncio.to_thread(tracer.close)
+    if event_sink is not None:
+        event_sink.close()
+    if db_engine is not None:
+        await db_engine.dispose()
+    if http_client is not None:
+        await http_client.aclose()
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        labels = {
+            "method": request.method,
+            "route": getattr(route, "path", "unmatched"),
+            "status": status,
+        }
+        metrics.incr("http.requests", **labels)
+        metrics.observe("http.request.duration_seconds", time.perf_counter() - started, **labels)
@@ -1 +1,97 @@
-"""Placeholder for database models (SQLAlchemy in production)."""
+"""SQLAlchemy models for the database backend."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class AssetRecord(Base):
+    __tablename__ = "assets"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "asset_type", "name", "version", name="uq_assets_tenant_version"),
+        Index("ix_assets_tenant_created", "tenant_id", "created_at", "id"),
+        Index("ix_assets_tenant_type_created", "tenant_id", "asset_type", "created_at"),
+        Index("ix_assets_tenant_status_created", "tenant_id", "status", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(128), default="default")
+    asset_type: Mapped[str] = mapped_column(String(32))
+    name: Mapped[str] = mapped_column(String(255))
+    version: Mapped[str] = mapped_column(String(64))
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    status: Mapped[str] = mapped_column(String(32))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class AssetLatestRecord(Base):
+    __tablename__ = "asset_latest"
+
+    tenant_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    asset_type: Mapped[str] = mapped_column(String(32), primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    asset_id: Mapped[str] = mapped_column(String(36))
+
+
+class AssetRevisionRecord(Base):
+    __tablename__ = "asset_revisions"
+
+    tenant_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    revision: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class RoleRecord(Base):
+    __tablename__ = "roles"
+
+    role_name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    permissions: Mapped[List[str]] = mapped_column(JSON)
+
+
+class UserRecord(Base):
+    __tablename__ = "users"
+
+    user_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(128), index=True)
+    roles: Mapped[List[str]] = mapped_column(JSON)
+
+
+class PolicyEventRecord(Base):
+    __tablename__ = "policy_events"
+
+    event_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    policy: Mapped[str] = mapped_column(String(32))
+    action: Mapped[str] = mapped_column(String(32))
+    message: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
+class AuditLogRecord(Base):
+    __tablename__ = "audit_logs"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    actor: Mapped[str] = mapped_column(String(128))
+    action: Mapped[str] = mapped_column(String(128))
+    target: Mapped[str] = mapped_column(String(255))
+    meta: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
+class ToolRunRecord(Base):
+    __tablename__ = "tool_runs"
+    __table_args__ = (Index("ix_tool_runs_run_id", "run_id"), Index("ix_tool_runs_created_at", "created_at"))
+
+    action_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    run_id: Mapped[str] = mapped_column(String(36))
+    status: Mapped[str] = mapped_column(String(32))
+    output: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    ui_state_patch: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
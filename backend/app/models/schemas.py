@@ -20,6 +20,8 @@ class Citation(BaseModel):
     title: str
     page: Optional[int] = None
     snippet: Optional[str] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
 
 
 class ToolRunRequest(BaseModel):
@@ -50,12 +52,24 @@ class UIStatePatchRequest(BaseModel):
     version: int
 
 
+class UISyncPatchMessage(BaseModel):
+    id: Optional[Any] = None
+    patch: Dict[str, Any]
+    version: int
+
+
 class UIStatePatchResponse(BaseModel):
     session_id: str
     version: int
     updated_at: datetime
 
 
+class UIStateResponse(BaseModel):
+    session_id: str
+    version: int
+    ui_state: Dict[str, Any]
+
+
 class ToolManifest(BaseModel):
     name: str
     description: str
@@ -63,7 +77,7 @@ class ToolManifest(BaseModel):
     output_schema: Dict[str, Any]
     permissions: List[str] = Field(default_factory=list)
     timeout_ms: int = 30000
-    rate_limit: int = 100
+    rate_limit: int = Field(default=100, ge=0)
     audit_tags: List[str] = Field(default_factory=list)
 
 
@@ -81,6 +95,14 @@ class KnowledgeBaseDocumentRequest(BaseModel):
     acl: List[str] = Field(default_factory=list)
 
 
+class KnowledgeBaseBulkIngestResponse(BaseModel):
+    doc_ids: List[str] = Field(default_factory=list)
+
+
+class KnowledgeBaseDocumentAclRequest(BaseModel):
+    acl: List[str] = Field(default_factory=list)
+
+
 class RAGQueryRequest(BaseModel):
     kb_id: str
     query: str
@@ -93,6 +115,7 @@ class RAGQueryResponse(BaseModel):
 
 
 class AssetCreateRequest(BaseModel):
+    tenant_id: str = "default"
     asset_type: str
     name: str
     version: str
@@ -102,11 +125,22 @@ class AssetCreateRequest(BaseModel):
 
 class AssetResponse(BaseModel):
     id: str
+    tenant_id: str = "default"
     asset_type: str
     name: str
     version: str
     payload: Dict[str, Any]
     status: str
+    updated_at: Optional[datetime] = None
+
+
+class AssetStatusRequest(BaseModel):
+    status: str
+
+
+class AssetListResponse(BaseModel):
+    items: List[AssetResponse]
+    next_cursor: Optional[str] = None
 
 
 class UserCreateRequest(BaseModel):
@@ -128,6 +162,29 @@ class PolicyEvent(BaseModel):
     created_at: datetime
 
 
+class PolicyRule(BaseModel):
+    name: str
+    pattern: str
+    action: str = "block"
+    ignore_case: bool = False
+    message: str = ""
+
+
+class TenantPolicyRequest(BaseModel):
+    tenant_id: str
+    rules: List[PolicyRule] = Field(default_factory=list)
+
+
+class PolicyEventPage(BaseModel):
+    items: List[PolicyEvent]
+    next_cursor: Optional[int] = None
+
+
+class AuditEventPage(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[int] = None
+
+
 class UsageStats(BaseModel):
     tool_runs: int
     rag_queries: int
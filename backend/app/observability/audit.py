@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.observability.event_log import EventLog
 
 
 class AuditLogger:
-    def __init__(self) -> None:
-        self._events: List[Dict[str, Any]] = []
+    def __init__(self, event_log: Optional[EventLog] = None) -> None:
+        self._events = event_log or EventLog("audit")
 
     def log(self, actor: str, action: str, target: str, meta: Dict[str, Any]) -> None:
         self._events.append(
@@ -19,5 +21,5 @@ class AuditLogger:
             }
         )
 
-    def list_events(self) -> List[Dict[str, Any]]:
-        return list(self._events)
+    def list_events(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        return self._events.page(cursor, limit)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+
+
+class EventSink:
+    def write_batch(self, stream: str, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+class JsonLinesEventSink(EventSink):
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def write_batch(self, stream: str, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        lines = "".join(
+            json.dumps({"stream": stream, "seq": seq, **payload}, default=str) + "\n" for seq, payload in records
+        )
+        with self._lock, open(self._path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
+class SQLiteEventSink(EventSink):
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, stream TEXT NOT NULL, seq INTEGER NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def write_batch(self, stream: str, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        rows = [(stream, seq, json.dumps(payload, default=str)) for seq, payload in records]
+        with self._lock:
+            self._conn.executemany("INSERT INTO events (stream, seq, payload) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_event_sink(path: str) -> EventSink:
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteEventSink(path)
+    return JsonLinesEventSink(path)
+
+
+class EventLog:
+    def __init__(
+        self,
+        name: str,
+        capacity: int = 10_000,
+        sink: Optional[EventSink] = None,
+        serialize: Callable[[Any], Dict[str, Any]] = dict,
+        batch_size: int = 200,
+        flush_interval_s: float = 1.0,
+        max_pending: int = 50_000,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.name = name
+        self._recent: Deque[Tuple[int, Any]] = deque(maxlen=capacity)
+        self._sink = sink
+        self._serialize = serialize
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_s
+        self._pending: Deque[Tuple[int, Any]] = deque()
+        self._max_pending = max_pending
+        self._metrics = metrics or default_metrics
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+
+    def append(self, item: Any) -> int:
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._recent.append((seq, item))
+            if self._sink is not None and not self._closed:
+                if len(self._pending) >= self._max_pending:
+                    self._pending.popleft()
+                    self._metrics.incr("event_log.dropped", log=self.name)
+                self._pending.append((seq, item))
+                self._metrics.set_gauge("event_log.pending", len(self._pending), log=self.name)
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run_writer, name=f"event-log-{self.name}", daemon=True)
+                    self._writer.start()
+                if len(self._pending) >= self._batch_size:
+                    self._wakeup.notify()
+        self._metrics.incr("event_log.appended", log=self.name)
+        return seq
+
+    def page(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[Any], Optional[int]]:
+        with self._lock:
+            if not self._recent:
+                return [], None
+            first_seq = self._recent[0][0]
+            start = 0 if cursor is None else max(0, cursor + 1 - first_seq)
+            entries = list(islice(self._recent, start, start + limit))
+            has_more = start + len(entries) < len(self._recent)
+        next_cursor = entries[-1][0] if entries and has_more else None
+        return [item for _, item in entries], next_cursor
+
+    def flush(self) -> None:
+        while True:
+            with self._lock:
+                batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+                self._metrics.set_gauge("event_log.pending", len(self._pending), log=self.name)
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        if self._writer is not None:
+            self._writer.join()
+        self.flush()
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._lock:
+                if not self._closed and len(self._pending) < self._batch_size:
+                    self._wakeup.wait(self._flush_interval_s)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _write(self, batch: List[Tuple[int, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            self._sink.write_batch(self.name, [(seq, self._serialize(item)) for seq, item in batch])
+        except Exception:
+            self._metrics.incr("event_log.write_errors", log=self.name)
+            self._metrics.incr("event_log.dropped", len(batch), log=self.name)
+            return
+        self._metrics.incr("event_log.written", len(batch), log=self.name)
+        self._metrics.observe("event_log.flush_duration_seconds", time.perf_counter() - started, log=self.name)
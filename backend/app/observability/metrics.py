@@ -1,17 +1,185 @@
 from __future__ import annotations
 
-from typing import Dict
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+LATENCY_BUCKETS_S: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_:]")
+
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _series(name: str, labels: Dict[str, object]) -> SeriesKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _prometheus_name(name: str) -> str:
+    return _NAME_RE.sub("_", name)
+
+
+def _prometheus_labels(labels: Sequence[Tuple[str, str]], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_S) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def copy(self) -> "Histogram":
+        clone = Histogram(self.buckets)
+        clone.counts = list(self.counts)
+        clone.count = self.count
+        clone.sum = self.sum
+        return clone
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
 
 
 class MetricsRegistry:
     def __init__(self) -> None:
-        self._counters: Dict[str, int] = {}
+        self._counters: Dict[SeriesKey, float] = {}
+        self._gauges: Dict[SeriesKey, float] = {}
+        self._histograms: Dict[SeriesKey, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1, **labels: object) -> None:
+        key = _series(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def get(self, name: str, **labels: object) -> int:
+        return self._counters.get(_series(name, labels), 0)
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        key = _series(name, labels)
+        with self._lock:
+            self._gauges[key] = value
 
-    def incr(self, name: str, amount: int = 1) -> None:
-        self._counters[name] = self._counters.get(name, 0) + amount
+    def add_gauge(self, name: str, amount: float, **labels: object) -> None:
+        key = _series(name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + amount
 
-    def get(self, name: str) -> int:
-        return self._counters.get(name, 0)
+    def gauge(self, name: str, **labels: object) -> float:
+        return self._gauges.get(_series(name, labels), 0)
+
+    def observe(
+        self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS_S, **labels: object
+    ) -> None:
+        key = _series(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def histogram(self, name: str, **labels: object) -> Optional[Histogram]:
+        with self._lock:
+            histogram = self._histograms.get(_series(name, labels))
+            return histogram.copy() if histogram is not None else None
 
     def snapshot(self) -> Dict[str, int]:
-        return dict(self._counters)
+        with self._lock:
+            counters = list(self._counters.items())
+        return {name + _prometheus_labels(labels): value for (name, labels), value in counters}
+
+    def _histogram_items(self) -> List[Tuple[SeriesKey, Histogram]]:
+        with self._lock:
+            return sorted((key, histogram.copy()) for key, histogram in self._histograms.items())
+
+    def latency_summary(self, name: Optional[str] = None) -> List[Dict[str, object]]:
+        summary = []
+        for (series_name, labels), histogram in self._histogram_items():
+            if name is not None and series_name != name:
+                continue
+            summary.append(
+                {
+                    "name": series_name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "p50": histogram.quantile(0.50),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                }
+            )
+        return summary
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        typed: set[str] = set()
+
+        def declare(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+        for (name, labels), value in counters:
+            metric = _prometheus_name(name)
+            if not metric.endswith("_total"):
+                metric += "_total"
+            declare(metric, "counter")
+            lines.append(f"{metric}{_prometheus_labels(labels)} {value}")
+        for (name, labels), value in gauges:
+            metric = _prometheus_name(name)
+            declare(metric, "gauge")
+            lines.append(f"{metric}{_prometheus_labels(labels)} {value}")
+        for (name, labels), histogram in self._histogram_items():
+            metric = _prometheus_name(name)
+            declare(metric, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f"{metric}_bucket{_prometheus_labels(labels, ('le', repr(bound)))} {cumulative}")
+            lines.append(f"{metric}_bucket{_prometheus_labels(labels, ('le', '+Inf'))} {histogram.count}")
+            lines.append(f"{metric}_sum{_prometheus_labels(labels)} {histogram.sum}")
+            lines.append(f"{metric}_count{_prometheus_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
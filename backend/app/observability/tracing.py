@@ -1,7 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.observability.event_log import EventLog, EventSink
 
 
 @dataclass
@@ -13,3 +21,118 @@ class TraceEvent:
 
 def create_event(name: str, details: dict) -> TraceEvent:
     return TraceEvent(name=name, timestamp=datetime.utcnow(), details=details)
+
+
+@dataclass
+class Span:
+    trace_id: str
+    name: str
+    parent_id: Optional[str] = None
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter:
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+class _SpanFileSink(EventSink):
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def write_batch(self, stream: str, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        lines = "".join(json.dumps(payload, default=str) + "\n" for _, payload in records)
+        with self._lock, open(self._path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 200,
+        flush_interval_s: float = 1.0,
+        max_pending: int = 50_000,
+    ) -> None:
+        self._log = EventLog(
+            "spans",
+            capacity=1,
+            sink=_SpanFileSink(path),
+            serialize=Span.to_dict,
+            batch_size=batch_size,
+            flush_interval_s=flush_interval_s,
+            max_pending=max_pending,
+        )
+
+    def export(self, spans: List[Span]) -> None:
+        for span in spans:
+            self._log.append(span)
+
+    def close(self) -> None:
+        self._log.close()
+
+
+class Tracer:
+    def __init__(self, capacity: int = 10_000, exporter: Optional[SpanExporter] = None) -> None:
+        self._capacity = capacity
+        self._exporter = exporter
+        self._spans: Deque[Span] = deque()
+        self._by_trace: Dict[str, List[Span]] = {}
+
+    def set_exporter(self, exporter: Optional[SpanExporter]) -> None:
+        self._exporter = exporter
+
+    def close(self) -> None:
+        if self._exporter is not None:
+            self._exporter.close()
+
+    def start_span(self, name: str, trace_id: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        return Span(
+            trace_id=trace_id,
+            name=name,
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span, **attributes: Any) -> None:
+        span.end_ns = time.perf_counter_ns()
+        span.attributes.update(attributes)
+        if len(self._spans) >= self._capacity:
+            evicted = self._spans.popleft()
+            trace = self._by_trace.get(evicted.trace_id)
+            if trace:
+                trace.remove(evicted)
+                if not trace:
+                    del self._by_trace[evicted.trace_id]
+        self._spans.append(span)
+        self._by_trace.setdefault(span.trace_id, []).append(span)
+        if span.parent_id is None and self._exporter is not None:
+            self._exporter.export(self.spans_for(span.trace_id))
+
+    def spans_for(self, trace_id: str) -> List[Span]:
+        return list(self._by_trace.get(trace_id, []))
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from app.infra.cache import TTLCache
+from app.models.schemas import AssetResponse
+from app.observability.logger import logger
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.orchestrator.contracts import GraphNode, Node, RunContext
+from app.orchestrator.nodes.answer_synthesize import AnswerSynthesize
+from app.orchestrator.nodes.apply_result_patch import ApplyActionResultPatch
+from app.orchestrator.nodes.input_policy import InputPolicyCheck
+from app.orchestrator.nodes.intent_classify import IntentClassify
+from app.orchestrator.nodes.output_policy import OutputPolicyCheck
+from app.orchestrator.nodes.rag_retrieve import RAGRetrieve
+from app.orchestrator.nodes.request_tool import RequestToolExecution
+from app.services.asset_service import AssetService
+from app.services.intent_classifier import IntentService
+from app.services.llm_adapter import LLMAdapter
+from app.services.policy_service import PolicyService
+from app.services.rag_service import RAGService
+from app.services.tool_service import ToolService
+
+
+AGENT_ASSET_TYPE = "agent"
+DEFAULT_AGENT_ID = "default"
+REQUIRED_NODES = ("input_policy", "output_policy")
+STREAMING_NODES = ("answer",)
+
+DEFAULT_GRAPH: List[Dict[str, Any]] = [
+    {"name": "input_policy"},
+    {"name": "intent"},
+    {"name": "request_tool", "deps": ["input_policy", "intent"], "when": "tool_intent"},
+    {"name": "apply_result_patch", "deps": ["request_tool"], "when": "tool_intent"},
+    {"name": "rag_retrieve", "deps": ["input_policy", "intent"], "when": "needs_retrieval"},
+    {"name": "answer", "deps": ["apply_result_patch", "rag_retrieve"]},
+    {"name": "output_policy", "deps": ["answer"]},
+]
+
+
+def _is_tool_intent(ctx: RunContext) -> bool:
+    return ctx.policies.get("intent") == "tool"
+
+
+def _needs_retrieval(ctx: RunContext) -> bool:
+    return bool(ctx.kb_id) and not _is_tool_intent(ctx)
+
+
+PREDICATES: Dict[str, Callable[[RunContext], bool]] = {
+    "tool_intent": _is_tool_intent,
+    "needs_retrieval": _needs_retrieval,
+}
+
+
+def plan_levels(graph: List[GraphNode]) -> List[List[GraphNode]]:
+    by_name = {node.name: node for node in graph}
+    for node in graph:
+        missing = [dep for dep in node.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"Node {node.name} depends on unknown nodes: {missing}")
+    levels: List[List[GraphNode]] = []
+    placed: set[str] = set()
+    remaining = list(graph)
+    while remaining:
+        level = [node for node in remaining if all(dep in placed for dep in node.deps)]
+        if not level:
+            raise ValueError(f"Cycle in orchestrator graph: {[node.name for node in remaining]}")
+        levels.append(level)
+        placed.update(node.name for node in level)
+        remaining = [node for node in remaining if node.name not in placed]
+    return levels
+
+
+def default_nodes(
+    policy_service: PolicyService,
+    tool_service: ToolService,
+    rag_service: RAGService,
+    intent_service: Optional[IntentService] = None,
+    llm: Optional[LLMAdapter] = None,
+) -> Dict[str, Node]:
+    return {
+        "input_policy": InputPolicyCheck(policy_service),
+        "intent": IntentClassify(intent_service),
+        "request_tool": RequestToolExecution(tool_service),
+        "apply_result_patch": ApplyActionResultPatch(tool_service),
+        "rag_retrieve": RAGRetrieve(rag_service),
+        "answer": AnswerSynthesize(llm),
+        "output_policy": OutputPolicyCheck(policy_service),
+    }
+
+
+@dataclass(frozen=True)
+class AgentPlan:
+    agent_id: str
+    version: str
+    levels: Tuple[Tuple[GraphNode, ...], ...]
+    tools: Optional[FrozenSet[str]] = None
+    kb_id: Optional[str] = None
+    prompt: str = ""
+
+
+class AgentPlanCompiler:
+    def __init__(self, nodes: Dict[str, Node], tool_service: ToolService) -> None:
+        self._nodes = nodes
+        self._tool_service = tool_service
+
+    def tool_names(self) -> List[str]:
+        return [manifest.name for manifest in self._tool_service.list_manifests()]
+
+    def compile(self, agent_id: str, version: str, payload: Dict[str, Any]) -> AgentPlan:
+        specs = payload.get("graph") or DEFAULT_GRAPH
+        if not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+            raise ValueError("Agent graph must be a list of node specs")
+        graph = [self._graph_node(spec) for spec in specs]
+        missing = [kind for kind in REQUIRED_NODES if all(node.node is not self._nodes[kind] for node in graph)]
+        if missing:
+            raise ValueError(f"Agent graph must include {missing}")
+        names = [node.name for node in graph]
+        if len(set(names)) != len(names):
+            raise ValueError("Agent graph node names must be unique")
+
+        tools = payload.get("tools")
+        if tools is not None:
+            if not isinstance(tools, list):
+                raise ValueError("Agent tools must be a list of tool names")
+            unknown = sorted(set(tools) - set(self.tool_names()))
+            if unknown:
+                raise ValueError(f"Agent references unknown tools: {unknown}")
+            tools = frozenset(tools)
+        kb_id = payload.get("kb_id")
+        if kb_id is not None and not isinstance(kb_id, str):
+            raise ValueError("Agent kb_id must be a string")
+        prompt = payload.get("prompt", "")
+        if not isinstance(prompt, str):
+            raise ValueError("Agent prompt must be a string")
+        return AgentPlan(
+            agent_id=agent_id,
+            version=version,
+            levels=tuple(tuple(level) for level in plan_levels(graph)),
+            tools=tools,
+            kb_id=kb_id,
+            prompt=prompt,
+        )
+
+    def _graph_node(self, spec: Dict[str, Any]) -> GraphNode:
+        name = spec.get("name")
+        if not name:
+            raise ValueError("Agent graph nodes need a name")
+        kind = spec.get("node", name)
+        if kind not in self._nodes:
+            raise ValueError(f"Unknown node type: {kind}")
+        when = spec.get("when")
+        if when is not None and when not in PREDICATES:
+            raise ValueError(f"Unknown node condition: {when}")
+        stream = spec.get("stream", kind in STREAMING_NODES)
+        if not isinstance(stream, bool):
+            raise ValueError(f"Node {name} stream flag must be a boolean")
+        return GraphNode(
+            name,
+            self._nodes[kind],
+            deps=tuple(spec.get("deps", ())),
+            when=PREDICATES[when] if when else None,
+            streams_answer=stream,
+        )
+
+
+class AgentPlanRegistry:
+    def __init__(
+        self,
+        compiler: AgentPlanCompiler,
+        asset_service: Optional[AssetService] = None,
+        refresh_s: float = 30.0,
+        max_plans: int = 1024,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.compiler = compiler
+        self._asset_service = asset_service
+        self._max_plans = max_plans
+        self._metrics = metrics or default_metrics
+        self._compiled: "OrderedDict[Tuple[str, str, str], AgentPlan]" = OrderedDict()
+        self._last_good: "OrderedDict[Tuple[str, str], AgentPlan]" = OrderedDict()
+        self._active = TTLCache("agent_plans.active", maxsize=max_plans, ttl_s=refresh_s, metrics=self._metrics)
+        self.default_plan = compiler.compile(DEFAULT_AGENT_ID, "builtin", {})
+
+    def validate(self, asset: AssetResponse) -> None:
+        self.compiler.compile(asset.name, asset.version, asset.payload)
+
+    async def resolve(self, tenant_id: str, agent_id: str) -> AgentPlan:
+        if self._asset_service is None:
+            return self.default_plan
+        plan = self._active.get((tenant_id, agent_id))
+        if plan is None:
+            plan = await self.refresh(tenant_id, agent_id)
+        return plan
+
+    async def refresh(self, tenant_id: str, agent_id: str) -> AgentPlan:
+        asset = None
+        if self._asset_service is not None:
+            asset = await self._asset_service.resolve(tenant_id, AGENT_ASSET_TYPE, agent_id)
+        key = (tenant_id, agent_id)
+        if asset is None:
+            plan = self.default_plan
+            self._last_good.pop(key, None)
+        else:
+            try:
+                plan = self._plan_for(asset)
+            except ValueError as exc:
+                plan = self._last_good.get(key)
+                self._metrics.incr("agent_plans.compile_errors", fallback="last_good" if plan is not None else "none")
+                logger.warning("Agent %s/%s@%s failed to compile: %s", tenant_id, agent_id, asset.version, exc)
+                if plan is None:
+                    raise
+            else:
+                self._last_good[key] = plan
+            self._last_good.move_to_end(key)
+            while len(self._last_good) > self._max_plans:
+                self._last_good.popitem(last=False)
+        self._active.set(key, plan)
+        return plan
+
+    async def on_asset_changed(self, asset: AssetResponse) -> None:
+        if asset.asset_type == AGENT_ASSET_TYPE:
+            await self.refresh(asset.tenant_id, asset.name)
+
+    def _plan_for(self, asset: AssetResponse) -> AgentPlan:
+        key = (asset.tenant_id, asset.name, asset.version)
+        plan = self._compiled.get(key)
+        if plan is not None:
+            self._compiled.move_to_end(key)
+            return plan
+        plan = self.compiler.compile(asset.name, asset.version, asset.payload)
+        self._metrics.incr("agent_plans.compiled")
+        self._compiled[key] = plan
+        while len(self._compiled) > self._max_plans:
+            self._compiled.popitem(last=False)
+        return plan
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from app.models.schemas import Citation, ToolRunRequest
 
@@ -19,6 +19,8 @@ class RunContext:
     tool_catalog: List[str]
     kb_id: Optional[str] = None
     trace_id: Optional[str] = None
+    agent_version: Optional[str] = None
+    system_prompt: str = ""
 
 
 @dataclass
@@ -28,8 +30,27 @@ class NodeResult:
     rag_context: List[Citation] = field(default_factory=list)
     answer: str | None = None
     events: List[str] = field(default_factory=list)
+    answer_stream: Optional[AsyncIterator[str]] = None
 
 
 class Node:
     async def run(self, ctx: RunContext) -> NodeResult:
         raise NotImplementedError
+
+
+@dataclass
+class RunEvent:
+    event: str
+    data: Any
+
+
+@dataclass(frozen=True)
+class GraphNode:
+    name: str
+    node: Node
+    deps: Tuple[str, ...] = ()
+    when: Optional[Callable[[RunContext], bool]] = None
+    streams_answer: bool = False
+
+    def should_run(self, ctx: RunContext) -> bool:
+        return self.when is None or self.when(ctx)
@@ -1,29 +1,58 @@
 from __future__ import annotations
 
+import asyncio
+import re
 import uuid
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from app.models.schemas import ChatMessageResponse
-from app.orchestrator.contracts import NodeResult, RunContext
-from app.orchestrator.nodes.answer_synthesize import AnswerSynthesize
-from app.orchestrator.nodes.apply_result_patch import ApplyActionResultPatch
-from app.orchestrator.nodes.input_policy import InputPolicyCheck
-from app.orchestrator.nodes.intent_classify import IntentClassify
+from app.orchestrator.agent_plans import AgentPlan, AgentPlanCompiler, AgentPlanRegistry, default_nodes
+from app.orchestrator.contracts import GraphNode, NodeResult, RunContext, RunEvent
 from app.orchestrator.nodes.output_policy import OutputPolicyCheck
-from app.orchestrator.nodes.rag_retrieve import RAGRetrieve
-from app.orchestrator.nodes.request_tool import RequestToolExecution
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.observability.tracing import Span, Tracer
 from app.services.policy_service import PolicyService
 from app.services.rag_service import RAGService
 from app.services.tool_service import ToolService
 
 
+_TOKEN_RE = re.compile(r"\s*\S+")
+
+
+async def _iterate(items: List[str]) -> AsyncIterator[str]:
+    for item in items:
+        yield item
+
+
 class OrchestratorEngine:
-    def __init__(self, policy_service: PolicyService, tool_service: ToolService, rag_service: RAGService) -> None:
+    def __init__(
+        self,
+        policy_service: PolicyService,
+        tool_service: ToolService,
+        rag_service: RAGService,
+        tracer: Optional[Tracer] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        plans: Optional[AgentPlanRegistry] = None,
+    ) -> None:
         self._policy_service = policy_service
         self._tool_service = tool_service
         self._rag_service = rag_service
+        self._tracer = tracer or Tracer()
+        self._metrics = metrics or default_metrics
+        self._output_policy = OutputPolicyCheck(policy_service)
+        self._plans = plans or AgentPlanRegistry(
+            AgentPlanCompiler(default_nodes(policy_service, tool_service, rag_service), tool_service),
+            metrics=self._metrics,
+        )
 
     async def run(self, ctx: RunContext) -> ChatMessageResponse:
+        response = None
+        async for event in self.stream(ctx):
+            if event.event == "done":
+                response = event.data
+        return response
+
+    async def stream(self, ctx: RunContext) -> AsyncIterator[RunEvent]:
         run_id = ctx.trace_id or str(uuid.uuid4())
         ctx.trace_id = run_id
         combined_actions: List[Any] = []
@@ -31,34 +60,150 @@ class OrchestratorEngine:
         answer = ""
         state_patch: Dict[str, Any] = {}
         events: List[str] = []
+        plan = await self._plans.resolve(ctx.tenant_id, ctx.agent_id)
+        self._apply_plan(ctx, plan)
+        root = self._tracer.start_span(
+            "orchestrator.run",
+            run_id,
+            session_id=ctx.session_id,
+            agent_id=ctx.agent_id,
+            agent_version=plan.version,
+            tenant_id=ctx.tenant_id,
+        )
+        halt_reason: Optional[str] = None
+        yield RunEvent("run", {"run_id": run_id})
+
+        try:
+            for level in plan.levels:
+                runnable = [node for node in level if node.should_run(ctx)]
+                if not runnable:
+                    continue
+                results = await asyncio.gather(*(self._run_node(node, ctx, root) for node in runnable))
+                for node, result in zip(runnable, results):
+                    if result.rag_context:
+                        self._redact_citations(ctx, result)
+                    if "halt" in result.events and halt_reason is None:
+                        halt_reason = node.name
+                    yield RunEvent("node", {"node": node.name, "events": result.events})
+                    for action in result.actions_requested:
+                        yield RunEvent("action", action)
+                    if node.streams_answer or "halt" in result.events:
+                        for citation in result.rag_context:
+                            yield RunEvent("citation", citation)
+                        async for token in self._answer_tokens(ctx, node, result):
+                            yield RunEvent("token", {"text": token})
+                    self._merge_result(result, state_patch, combined_actions, citations, events)
+                    if result.answer:
+                        answer = result.answer
+                    self._update_context(ctx, result)
+                if halt_reason:
+                    break
+        finally:
+            self._tracer.end_span(
+                root,
+                intent=ctx.policies.get("intent"),
+                citations=len(citations),
+                actions=len(combined_actions),
+                halted_by=halt_reason,
+            )
+            self._metrics.observe("orchestrator.run.duration_seconds", root.duration_ms / 1000)
+
+        yield RunEvent(
+            "done",
+            ChatMessageResponse(run_id=run_id, answer=answer, citations=citations, tool_runs=combined_actions),
+        )
+
+    async def _run_node(self, node: GraphNode, ctx: RunContext, root: Span) -> NodeResult:
+        span = self._tracer.start_span(f"node.{node.name}", root.trace_id, parent=root)
+        try:
+            result = await node.node.run(ctx)
+            if result.answer_stream is not None and not node.streams_answer:
+                result.answer = "".join([chunk async for chunk in result.answer_stream])
+                result.answer_stream = None
+        except Exception as exc:
+            self._fail_node(node, span, exc)
+            raise
+        if result.answer_stream is not None:
+            result.answer_stream = self._traced_stream(node, span, result, result.answer_stream)
+        else:
+            self._finish_node(node, span, result)
+        return result
 
-        nodes = [
-            InputPolicyCheck(self._policy_service),
-            IntentClassify(),
-            RequestToolExecution(self._tool_service),
-            ApplyActionResultPatch(self._tool_service),
-            RAGRetrieve(self._rag_service),
-            AnswerSynthesize(),
-            OutputPolicyCheck(self._policy_service),
-        ]
-
-        for node in nodes:
-            result = await node.run(ctx)
-            self._merge_result(result, state_patch, combined_actions, citations, events)
-            if result.answer:
-                answer = result.answer
-            if "intent" in result.state_patch:
-                ctx.policies["intent"] = result.state_patch["intent"]
-            if result.rag_context:
-                ctx.policies["rag_answer"] = result.answer
-                ctx.policies["rag_citations"] = result.rag_context
-            if result.answer:
-                ctx.policies["answer"] = result.answer
-                ctx.policies["citations"] = len(result.rag_context)
-            if "halt" in result.events:
-                break
-
-        return ChatMessageResponse(run_id=run_id, answer=answer, citations=citations, tool_runs=combined_actions)
+    async def _traced_stream(
+        self, node: GraphNode, span: Span, result: NodeResult, stream: AsyncIterator[str]
+    ) -> AsyncIterator[str]:
+        try:
+            async for chunk in stream:
+                yield chunk
+        except BaseException as exc:
+            self._fail_node(node, span, exc)
+            raise
+        self._finish_node(node, span, result)
+
+    def _fail_node(self, node: GraphNode, span: Span, exc: BaseException) -> None:
+        self._tracer.end_span(span, error=repr(exc))
+        self._metrics.incr("orchestrator.node.errors", node=node.name)
+
+    def _finish_node(self, node: GraphNode, span: Span, result: NodeResult) -> None:
+        attributes: Dict[str, Any] = {"hits": len(result.rag_context), "actions": len(result.actions_requested)}
+        if "intent" in result.state_patch:
+            attributes["intent"] = result.state_patch["intent"]
+        if result.events:
+            attributes["events"] = list(result.events)
+        if "halt" in result.events:
+            attributes["halt_reason"] = result.answer
+        self._tracer.end_span(span, **attributes)
+        self._metrics.observe("orchestrator.node.duration_seconds", span.duration_ms / 1000, node=node.name)
+
+    def _apply_plan(self, ctx: RunContext, plan: AgentPlan) -> None:
+        ctx.agent_version = plan.version
+        ctx.tool_catalog = sorted(plan.tools) if plan.tools is not None else self._plans.compiler.tool_names()
+        ctx.kb_id = ctx.kb_id or plan.kb_id
+        ctx.system_prompt = plan.prompt
+
+    async def _answer_tokens(self, ctx: RunContext, node: GraphNode, result: NodeResult) -> AsyncIterator[str]:
+        if not node.streams_answer:
+            for token in _TOKEN_RE.findall(result.answer or ""):
+                yield token
+            return
+        redactor = self._output_policy.output_filter(ctx)
+        emitted: List[str] = []
+        chunks = result.answer_stream or _iterate(_TOKEN_RE.findall(result.answer or ""))
+        result.answer_stream = None
+        async for chunk in chunks:
+            text = redactor.feed(chunk)
+            if text:
+                emitted.append(text)
+                yield text
+        tail = redactor.flush()
+        if tail:
+            emitted.append(tail)
+            yield tail
+        if result.answer or emitted:
+            result.answer = "".join(emitted)
+        ctx.policies["redactions"] = redactor.redactions
+
+    def _redact_citations(self, ctx: RunContext, result: NodeResult) -> None:
+        citations = []
+        for citation in result.rag_context:
+            if citation.snippet:
+                redactor = self._output_policy.output_filter(ctx)
+                snippet = redactor.redact(citation.snippet)
+                if redactor.redactions:
+                    citation = citation.model_copy(update={"snippet": snippet})
+                    ctx.policies.setdefault("citation_redactions", []).extend(redactor.redactions)
+            citations.append(citation)
+        result.rag_context = citations
+
+    def _update_context(self, ctx: RunContext, result: NodeResult) -> None:
+        if "intent" in result.state_patch:
+            ctx.policies["intent"] = result.state_patch["intent"]
+        if result.rag_context:
+            ctx.policies["rag_answer"] = result.answer
+            ctx.policies["rag_citations"] = result.rag_context
+        if result.answer:
+            ctx.policies["answer"] = result.answer
+            ctx.policies["citations"] = len(result.rag_context)
 
     def _merge_result(
         self,
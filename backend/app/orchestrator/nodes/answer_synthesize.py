@@ -1,12 +1,54 @@
 from __future__ import annotations
 
+from typing import AsyncIterator, List, Optional
+
+from app.models.schemas import Citation
+from app.observability.logger import logger
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
 from app.orchestrator.contracts import Node, NodeResult, RunContext
+from app.services.llm_adapter import LLMAdapter, LLMError, Messages, TokenBudgetExceeded
+
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant for a data application. Answer concisely."
+CONTEXT_PROMPT = "Answer using only the context below and cite document titles.\n\n{context}"
+BUDGET_EXCEEDED_ANSWER = "The assistant has reached its usage limit for now. Please try again later."
+DEFAULT_ANSWER = "Acknowledged. Let me know if you need help with data or actions."
 
 
 class AnswerSynthesize(Node):
+    def __init__(self, llm: Optional[LLMAdapter] = None, metrics: Optional[MetricsRegistry] = None) -> None:
+        self._llm = llm
+        self._metrics = metrics or default_metrics
+
     async def run(self, ctx: RunContext) -> NodeResult:
         if ctx.policies.get("intent") == "tool":
             return NodeResult(answer="Tool action requested. Awaiting UI execution.")
+        citations: List[Citation] = ctx.policies.get("rag_citations", [])
+        if self._llm is not None:
+            return NodeResult(rag_context=citations, answer_stream=self._generate(ctx, citations))
         if ctx.policies.get("rag_answer"):
-            return NodeResult(answer=ctx.policies["rag_answer"], rag_context=ctx.policies.get("rag_citations", []))
-        return NodeResult(answer="Acknowledged. Let me know if you need help with data or actions.")
+            return NodeResult(answer=ctx.policies["rag_answer"], rag_context=citations)
+        return NodeResult(answer=DEFAULT_ANSWER)
+
+    def messages(self, ctx: RunContext, citations: List[Citation]) -> Messages:
+        messages = [{"role": "system", "content": ctx.system_prompt or DEFAULT_SYSTEM_PROMPT}]
+        context = "\n\n".join(f"[{citation.title}] {citation.snippet}" for citation in citations if citation.snippet)
+        if context:
+            messages.append({"role": "system", "content": CONTEXT_PROMPT.format(context=context)})
+        messages.append({"role": "user", "content": ctx.message})
+        return messages
+
+    async def _generate(self, ctx: RunContext, citations: List[Citation]) -> AsyncIterator[str]:
+        emitted = False
+        try:
+            async for chunk in self._llm.stream(self.messages(ctx, citations), tenant_id=ctx.tenant_id):
+                emitted = True
+                yield chunk
+        except TokenBudgetExceeded:
+            self._metrics.incr("answer.llm_fallbacks", reason="budget")
+            yield BUDGET_EXCEEDED_ANSWER
+        except LLMError as exc:
+            self._metrics.incr("answer.llm_fallbacks", reason="error")
+            logger.warning("LLM answer failed for run %s: %s", ctx.trace_id, exc)
+            if not emitted:
+                yield ctx.policies.get("rag_answer") or DEFAULT_ANSWER
@@ -12,7 +12,7 @@ class ApplyActionResultPatch(Node):
         if not ctx.trace_id:
             return NodeResult()
         patches = {}
-        for result in self._tool_service.list_results(ctx.trace_id):
+        for result in await self._tool_service.list_results(ctx.trace_id):
             patches.update(result.ui_state_patch)
         if patches:
             return NodeResult(state_patch=patches)
@@ -9,7 +9,7 @@ class InputPolicyCheck(Node):
         self._policy_service = policy_service
 
     async def run(self, ctx: RunContext) -> NodeResult:
-        allowed, message = self._policy_service.check_input(ctx.message)
+        allowed, message = self._policy_service.check_input(ctx.message, ctx.tenant_id)
         if not allowed:
             return NodeResult(answer=message, events=["halt"])
         if message:
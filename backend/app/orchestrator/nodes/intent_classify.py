@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from app.orchestrator.contracts import Node, NodeResult, RunContext
+from app.services.intent_classifier import IntentService
 
 
 class IntentClassify(Node):
+    def __init__(self, intent_service: Optional[IntentService] = None) -> None:
+        self._intent_service = intent_service
+
     async def run(self, ctx: RunContext) -> NodeResult:
+        if self._intent_service is not None:
+            intent = await self._intent_service.classify(ctx.tenant_id, ctx.message)
+            if intent is not None:
+                return NodeResult(state_patch={"intent": intent})
         message = ctx.message.lower()
         intent = "chat"
         if any(keyword in message for keyword in ["filter", "sort", "group"]):
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from typing import List
+
 from app.orchestrator.contracts import Node, NodeResult, RunContext
+from app.services.output_filter import StreamRedactor
 from app.services.policy_service import PolicyService
 
 
@@ -8,10 +11,25 @@ class OutputPolicyCheck(Node):
     def __init__(self, policy_service: PolicyService) -> None:
         self._policy_service = policy_service
 
+    def output_filter(self, ctx: RunContext) -> StreamRedactor:
+        return self._policy_service.output_filter(ctx.tenant_id)
+
     async def run(self, ctx: RunContext) -> NodeResult:
         answer = ctx.policies.get("answer", "")
         citations = ctx.policies.get("citations", 0)
-        _, message = self._policy_service.check_output(answer, citations)
+        redacted_answer = None
+        redactions = ctx.policies.get("redactions")
+        if redactions is None:
+            redactor = self.output_filter(ctx)
+            redacted = redactor.redact(answer)
+            redactions = redactor.redactions
+            if redactions:
+                redacted_answer = redacted
+        redactions = list(redactions) + ctx.policies.get("citation_redactions", [])
+        events: List[str] = []
+        if redactions:
+            events.append(self._policy_service.record_redactions(redactions))
+        _, message = self._policy_service.check_output(redacted_answer or answer, citations)
         if message:
-            return NodeResult(events=[message])
-        return NodeResult()
+            events.append(message)
+        return NodeResult(answer=redacted_answer, events=events)
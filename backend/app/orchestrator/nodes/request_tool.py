@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+from typing import List
+
+from app.models.schemas import ToolRunRequest
 from app.orchestrator.contracts import Node, NodeResult, RunContext
+from app.services.grid_actions import KIND_VERBS, GridActionParser, GridParse
+from app.services.rbac import PermissionDenied
+from app.services.tool_limits import RateLimitExceeded
 from app.services.tool_service import ToolService
 
 
@@ -9,19 +15,47 @@ class RequestToolExecution(Node):
         self._tool_service = tool_service
 
     async def run(self, ctx: RunContext) -> NodeResult:
-        message = ctx.message.lower()
-        tool_name = ""
-        args = {"gridId": "main"}
-        if "filter" in message:
-            tool_name = "grid.setFilter"
-            args["filters"] = [{"field": "status", "op": "eq", "value": "active"}]
-        elif "sort" in message:
-            tool_name = "grid.setSort"
-            args["sorts"] = [{"field": "created_at", "dir": "desc"}]
-        elif "group" in message:
-            tool_name = "grid.setGroup"
-            args["groups"] = ["category"]
-        if not tool_name:
-            return NodeResult()
-        action = self._tool_service.create_action(tool_name, args, run_id=ctx.trace_id or "")
-        return NodeResult(actions_requested=[action])
+        index = self._tool_service.tool_index()
+        parsed = GridActionParser(index).parse(ctx.message, ctx.ui_state)
+        if not parsed.actions:
+            if not parsed.unresolved:
+                return NodeResult()
+            tool = parsed.unresolved[0]
+            if tool not in ctx.tool_catalog:
+                return NodeResult(answer=f"{tool} is not available for this agent.", events=["halt"])
+            return NodeResult(answer=self._clarify(parsed, index.kinds[tool][0]), events=["halt"])
+        for action in parsed.actions:
+            if action.tool not in ctx.tool_catalog:
+                return NodeResult(answer=f"{action.tool} is not available for this agent.", events=["halt"])
+            try:
+                self._tool_service.check_permissions(
+                    self._tool_service.get_manifest(action.tool), ctx.policies.get("permissions")
+                )
+            except PermissionDenied:
+                return NodeResult(answer=f"You do not have permission to run {action.tool}.", events=["halt"])
+
+        actions: List[ToolRunRequest] = []
+        for action in parsed.actions:
+            try:
+                actions.append(
+                    await self._tool_service.create_action(
+                        action.tool,
+                        action.args,
+                        run_id=ctx.trace_id or "",
+                        tenant_id=ctx.tenant_id,
+                        permissions=ctx.policies.get("permissions"),
+                    )
+                )
+            except RateLimitExceeded:
+                return NodeResult(
+                    actions_requested=actions,
+                    answer="Too many tool requests. Please try again shortly.",
+                    events=["halt"],
+                )
+        return NodeResult(actions_requested=actions)
+
+    def _clarify(self, parsed: GridParse, kind: str) -> str:
+        question = f"Which column should I {KIND_VERBS[kind]}?"
+        if not parsed.columns:
+            return question
+        return f"{question} Available columns: {', '.join(column.label or column.field for column in parsed.columns)}."
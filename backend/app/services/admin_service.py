@@ -1,35 +1,67 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
 from app.models.schemas import RoleCreateRequest, UsageStats, UserCreateRequest
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.services.rbac import PermissionSet
+from app.services.repositories import AdminRepository, InMemoryAdminRepository
+
+
+USAGE_KEYS = ("tool_runs", "rag_queries", "policy_violations")
 
 
 class AdminService:
-    def __init__(self) -> None:
-        self._roles: Dict[str, List[str]] = {}
-        self._users: Dict[str, List[str]] = {}
-        self._usage = {"tool_runs": 0, "rag_queries": 0, "policy_violations": 0}
+    def __init__(
+        self,
+        metrics: Optional[MetricsRegistry] = None,
+        repository: Optional[AdminRepository] = None,
+        permission_ttl_s: float = 60.0,
+    ) -> None:
+        self._repository = repository or InMemoryAdminRepository()
+        self._metrics = metrics or default_metrics
+        self._permission_ttl_s = permission_ttl_s
+        self._permission_cache: Dict[str, Tuple[float, PermissionSet]] = {}
+        self._role_users: Dict[str, Set[str]] = {}
 
-    def create_role(self, request: RoleCreateRequest) -> None:
-        self._roles[request.role_name] = request.permissions
+    async def create_role(self, request: RoleCreateRequest) -> None:
+        await self._repository.upsert_role(request.role_name, request.permissions)
+        for user_id in self._role_users.pop(request.role_name, set()):
+            self._invalidate_user(user_id)
 
-    def create_user(self, request: UserCreateRequest) -> None:
-        self._users[request.user_id] = request.roles
+    async def create_user(self, request: UserCreateRequest) -> None:
+        await self._repository.upsert_user(request.user_id, request.tenant_id, request.roles)
+        self._invalidate_user(request.user_id)
 
-    def user_permissions(self, user_id: str) -> List[str]:
-        perms: List[str] = []
-        roles = self._users.get(user_id, [])
+    async def permission_set(self, user_id: str) -> PermissionSet:
+        entry = self._permission_cache.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._metrics.incr("rbac.cache", result="hit")
+            return entry[1]
+        self._metrics.incr("rbac.cache", result="miss")
+        roles = await self._repository.user_roles(user_id)
+        role_permissions = await self._repository.role_permissions(roles)
+        permissions = PermissionSet(
+            permission for role in roles for permission in role_permissions.get(role, [])
+        )
+        self._permission_cache[user_id] = (time.monotonic() + self._permission_ttl_s, permissions)
         for role in roles:
-            perms.extend(self._roles.get(role, []))
-        return perms
+            self._role_users.setdefault(role, set()).add(user_id)
+        return permissions
+
+    async def user_permissions(self, user_id: str) -> List[str]:
+        return sorted((await self.permission_set(user_id)).permissions)
+
+    def _invalidate_user(self, user_id: str) -> None:
+        self._permission_cache.pop(user_id, None)
 
     def increment_usage(self, key: str) -> None:
-        if key in self._usage:
-            self._usage[key] += 1
+        if key in USAGE_KEYS:
+            self._metrics.incr(f"usage.{key}")
 
     def record_policy_violation(self) -> None:
-        self._usage["policy_violations"] += 1
+        self.increment_usage("policy_violations")
 
     def usage_stats(self) -> UsageStats:
-        return UsageStats(**self._usage)
+        return UsageStats(**{key: self._metrics.get(f"usage.{key}") for key in USAGE_KEYS})
@@ -1,27 +1,95 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
-from typing import Dict, List
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 
 from app.models.schemas import AssetCreateRequest, AssetResponse
+from app.services.repositories import AssetRepository, InMemoryAssetRepository
 
 
 class AssetService:
-    def __init__(self) -> None:
-        self._assets: Dict[str, AssetResponse] = {}
+    def __init__(self, repository: Optional[AssetRepository] = None, max_page_size: int = 200) -> None:
+        self._repository = repository or InMemoryAssetRepository()
+        self._max_page_size = max_page_size
+        self._validators: Dict[str, Callable[[AssetResponse], None]] = {}
+        self._listeners: List[Callable[[AssetResponse], Awaitable[None]]] = []
 
-    def create(self, request: AssetCreateRequest) -> AssetResponse:
+    def add_validator(self, asset_type: str, validator: Callable[[AssetResponse], None]) -> None:
+        self._validators[asset_type] = validator
+
+    def add_listener(self, listener: Callable[[AssetResponse], Awaitable[None]]) -> None:
+        self._listeners.append(listener)
+
+    async def create(self, request: AssetCreateRequest) -> AssetResponse:
         asset_id = str(uuid.uuid4())
         asset = AssetResponse(
             id=asset_id,
+            tenant_id=request.tenant_id,
             asset_type=request.asset_type,
             name=request.name,
             version=request.version,
             payload=request.payload,
             status=request.status,
+            updated_at=datetime.utcnow(),
         )
-        self._assets[asset_id] = asset
+        validator = self._validators.get(asset.asset_type)
+        if validator is not None:
+            validator(asset)
+        await self._repository.add(asset)
+        await self._notify(asset)
+        return asset
+
+    async def get(self, tenant_id: str, asset_id: str) -> Optional[AssetResponse]:
+        return await self._repository.get(tenant_id, asset_id)
+
+    async def resolve(
+        self, tenant_id: str, asset_type: str, name: str, version: Optional[str] = None
+    ) -> Optional[AssetResponse]:
+        if version is None:
+            return await self._repository.latest_published(tenant_id, asset_type, name)
+        return await self._repository.find(tenant_id, asset_type, name, version)
+
+    async def set_status(self, tenant_id: str, asset_id: str, status: str) -> Optional[AssetResponse]:
+        asset = await self._repository.set_status(tenant_id, asset_id, status)
+        if asset is not None:
+            await self._notify(asset)
         return asset
 
-    def list_assets(self) -> List[AssetResponse]:
-        return list(self._assets.values())
+    async def list_assets(
+        self,
+        tenant_id: str = "default",
+        asset_type: Optional[str] = None,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[AssetResponse], Optional[str]]:
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        return await self._repository.list(
+            tenant_id,
+            asset_type=asset_type,
+            name=name,
+            status=status,
+            cursor=cursor,
+            limit=min(limit, self._max_page_size),
+        )
+
+    async def catalog_etag(self, tenant_id: str, *query: Optional[str]) -> str:
+        revision = await self._repository.revision(tenant_id)
+        return _etag(tenant_id, revision, *query)
+
+    async def _notify(self, asset: AssetResponse) -> None:
+        for listener in self._listeners:
+            await listener(asset)
+
+    def asset_etag(self, asset: AssetResponse) -> str:
+        updated_at = asset.updated_at.isoformat() if asset.updated_at else ""
+        return _etag(asset.tenant_id, asset.id, asset.status, updated_at)
+
+
+def _etag(*parts: Optional[str]) -> str:
+    digest = hashlib.sha1("\x1f".join(part or "" for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
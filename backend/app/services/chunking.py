@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+
+def _last_break(text: str, start: int, end: int) -> int:
+    return max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+
+
+def _first_break(text: str, start: int, end: int) -> int:
+    hits = [i for i in (text.find(" ", start, end), text.find("\n", start, end)) if i != -1]
+    return min(hits) if hits else -1
+
+
+def chunk_spans(text: str, size: int, overlap: int) -> List[Tuple[int, int]]:
+    if size <= 0:
+        raise ValueError("chunk size must be positive")
+    if not 0 <= overlap < size:
+        raise ValueError("chunk overlap must be in [0, size)")
+    length = len(text)
+    if length <= size:
+        return [(0, length)]
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    while True:
+        end = min(start + size, length)
+        if end < length:
+            cut = _last_break(text, start + size // 2, end)
+            if cut > start:
+                end = cut
+        spans.append((start, end))
+        if end >= length:
+            return spans
+        next_start = max(end - overlap, start + 1)
+        if overlap:
+            cut = _first_break(text, next_start, end)
+            if cut != -1:
+                next_start = cut + 1
+        start = next_start
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import zlib
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.services.rag_index import tokenize
+
+
+class Embedder:
+    dim: int
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+
+class HashingEmbedder(Embedder):
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+        self._bucket = lru_cache(maxsize=262_144)(self._hash_feature)
+
+    def _hash_feature(self, feature: str) -> Tuple[int, float]:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        return digest % self.dim, 1.0 if digest & 0x80000000 else -1.0
+
+    def features(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self.features(text):
+                column, sign = self._bucket(feature)
+                matrix[row, column] += sign
+        return matrix
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+from app.models.schemas import ToolManifest
+
+
+DEFAULT_GRID_ID = "main"
+
+KIND_ARGS = {"filters": "filter", "sorts": "sort", "groups": "group"}
+KIND_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "filter": ("filter", "where", "only", "exclude", "필터", "조건", "걸러"),
+    "sort": ("sort", "order", "arrange", "정렬", "순서"),
+    "group": ("group", "그룹", "묶어", "분류"),
+}
+KIND_VERBS = {"filter": "filter", "sort": "sort by", "group": "group by"}
+
+_STOPWORDS = frozenset(
+    "a an and apply by for from grid in of on or set the then to with rows row records record table "
+    "please me show list all".split()
+)
+_SUFFIXES = ("", "s", "es", "ed", "ing", "er")
+_WORD_RE = re.compile(r"\w+")
+_CAMEL_RE = re.compile(r"(?<=[a-z])(?=[A-Z])|[._\-\s]+")
+_PARTICLE_RE = re.compile(r"^(?:에서|으로|이|가|은|는|을|를|의|에|로)")
+_VALUE_SUFFIX_RE = re.compile(r"(?:인것|이고|이며|으로|인|만|로)$")
+
+_DESC_WORDS = frozenset(
+    "desc descending newest latest highest largest biggest most recent 내림차순 최신 높은 큰 최근".split()
+)
+_ASC_WORDS = frozenset("asc ascending oldest earliest lowest smallest least 오름차순 오래된 낮은 작은".split())
+_NEGATIONS = re.compile(r"(?:\bnot|\bexcept|\bwithout|\bexclude|\bexcluding)\s+$", re.I)
+
+OPERATORS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("gte", (">=", "≥", "at least", "greater than or equal to", "no less than")),
+    ("lte", ("<=", "≤", "at most", "less than or equal to", "no more than")),
+    ("neq", ("!=", "<>", "is not", "isn't", "not equal to", "not")),
+    ("gt", (">", "greater than", "more than", "over", "above", "after")),
+    ("lt", ("<", "less than", "under", "below", "before")),
+    ("contains", ("contains", "containing", "includes", "like")),
+    ("startsWith", ("starts with", "begins with")),
+    ("endsWith", ("ends with",)),
+    ("eq", ("==", "=", ":", "equals", "equal to", "is", "are")),
+)
+POSTFIX_OPERATORS = {"이상": "gte", "이하": "lte", "초과": "gt", "미만": "lt", "포함": "contains", "제외": "neq"}
+
+
+def _phrase_pattern(phrase: str) -> str:
+    body = r"\s+".join(re.escape(part) for part in phrase.split())
+    return body + r"\b" if phrase[-1].isalnum() else body
+
+
+_OPERATOR_LOOKUP = {phrase: op for op, phrases in OPERATORS for phrase in phrases}
+_CLAUSE_RE = re.compile(
+    r"^\s*(?P<op>"
+    + "|".join(_phrase_pattern(phrase) for phrase in sorted(_OPERATOR_LOOKUP, key=len, reverse=True))
+    + r")?\s*(?P<value>\"[^\"]*\"|'[^']*'|-?\d+(?:\.\d+)?|[^\s,;]+)\s*(?P<postfix>"
+    + "|".join(POSTFIX_OPERATORS)
+    + r")?",
+    re.I,
+)
+_LOOSE_FIELD_RE = re.compile(r"\b(?:by|on)\s+([A-Za-z_][\w.]*)", re.I)
+_LOOSE_FILTER_RE = re.compile(
+    r"\b([A-Za-z_][\w.]*)\s*(?=[=:<>!]|(?:is|are|not|contains|over|under|above|below|at least|at most|greater|less)\b)",
+    re.I,
+)
+
+
+@dataclass(frozen=True)
+class GridColumn:
+    field: str
+    label: str = ""
+    type: str = "string"
+    values: Tuple[str, ...] = ()
+
+    def names(self) -> Set[str]:
+        names = {self.field.lower(), self.field.replace("_", " ").lower()}
+        if self.label:
+            names.add(self.label.lower())
+        return names
+
+
+@dataclass
+class GridAction:
+    tool: str
+    args: Dict[str, Any]
+
+
+@dataclass
+class GridParse:
+    actions: List[GridAction] = field(default_factory=list)
+    unresolved: List[str] = field(default_factory=list)
+    grid_id: str = DEFAULT_GRID_ID
+    columns: List[GridColumn] = field(default_factory=list)
+
+
+def _column(raw: Any) -> Optional[GridColumn]:
+    if isinstance(raw, str):
+        return GridColumn(raw)
+    if isinstance(raw, dict) and isinstance(raw.get("field"), str):
+        return GridColumn(
+            raw["field"],
+            label=str(raw.get("label") or raw.get("headerName") or ""),
+            type=str(raw.get("type") or "string"),
+            values=tuple(str(value) for value in raw.get("values") or raw.get("options") or ()),
+        )
+    return None
+
+
+def grid_columns(ui_state: Dict[str, Any]) -> Dict[str, List[GridColumn]]:
+    grids: Dict[str, List[GridColumn]] = {}
+    for grid_id, grid in (ui_state.get("grids") or {}).items():
+        if isinstance(grid, dict):
+            grids[grid_id] = [column for column in map(_column, grid.get("columns") or ()) if column]
+    for key, value in ui_state.items():
+        if key.startswith("grid.") and key.endswith(".columns") and isinstance(value, list):
+            grids.setdefault(key[5:-8], [column for column in map(_column, value) if column])
+    return grids
+
+
+def _keywords(text: str) -> Set[str]:
+    words = set()
+    for word in _CAMEL_RE.split(text):
+        for token in _WORD_RE.findall(word.lower()):
+            if token in _STOPWORDS or len(token) < 3:
+                continue
+            words.add(token[:-1] if token.endswith("s") and len(token) > 4 else token)
+    return words
+
+
+class ToolIndex:
+    def __init__(self, manifests: Iterable[ToolManifest]) -> None:
+        self.kinds: Dict[str, Tuple[str, str]] = {}
+        self._keywords: Dict[str, Set[str]] = {}
+        for manifest in manifests:
+            keywords = _keywords(manifest.name) | _keywords(manifest.description)
+            properties = manifest.input_schema.get("properties", {})
+            for prop in properties:
+                keywords |= _keywords(prop)
+                if prop in KIND_ARGS and "gridId" in properties:
+                    kind = KIND_ARGS[prop]
+                    self.kinds[manifest.name] = (kind, prop)
+                    keywords.update(KIND_KEYWORDS[kind])
+            for keyword in keywords:
+                self._keywords.setdefault(keyword, set()).add(manifest.name)
+        self._max_keyword = max((len(keyword) for keyword in self._keywords), default=0)
+
+    def lookup(self, token: str) -> Set[str]:
+        token = token.lower()
+        if token.isascii():
+            for suffix in _SUFFIXES:
+                if suffix and token.endswith(suffix) and token[: -len(suffix)] in self._keywords:
+                    return self._keywords[token[: -len(suffix)]]
+            return self._keywords.get(token, set())
+        for length in range(min(len(token), self._max_keyword), 1, -1):
+            tools = self._keywords.get(token[:length])
+            if tools:
+                return tools
+        return set()
+
+    def mentions(self, message: str, skip: List[Tuple[int, int]]) -> List[Tuple[int, int, str]]:
+        found: List[Tuple[int, int, str]] = []
+        seen: Set[str] = set()
+        for match in _WORD_RE.finditer(message):
+            if any(start <= match.start() < end for start, end in skip):
+                continue
+            for tool in sorted(self.lookup(match.group())):
+                if tool not in seen:
+                    seen.add(tool)
+                    found.append((match.start(), match.end(), tool))
+        return found
+
+
+class GridActionParser:
+    def __init__(self, index: ToolIndex) -> None:
+        self._index = index
+
+    def parse(self, message: str, ui_state: Dict[str, Any]) -> GridParse:
+        grids = grid_columns(ui_state)
+        grid_id = self._grid_id(message, ui_state, grids)
+        columns = grids.get(grid_id, [])
+        mentions = self._column_mentions(message, columns)
+        result = GridParse(grid_id=grid_id, columns=columns)
+
+        tools = [
+            (start, end, tool)
+            for start, end, tool in self._index.mentions(message, [(start, end) for start, end, _ in mentions])
+            if tool in self._index.kinds
+        ]
+        for number, (position, keyword_end, tool) in enumerate(tools):
+            kind, arg = self._index.kinds[tool]
+            following = tools[number + 1][0] if number + 1 < len(tools) else len(message)
+            preceding = tools[number - 1][1] if number else 0
+            values: List[Any] = []
+            for start, end in ((keyword_end, following), (preceding, position)):
+                segment = [mention for mention in mentions if start <= mention[0] < end]
+                values = self._values(kind, message, start, end, segment, columns)
+                if values:
+                    break
+            if values:
+                result.actions.append(GridAction(tool, {"gridId": grid_id, arg: values}))
+            else:
+                result.unresolved.append(tool)
+        return result
+
+    def _grid_id(self, message: str, ui_state: Dict[str, Any], grids: Dict[str, List[GridColumn]]) -> str:
+        lowered = message.lower()
+        for grid_id in grids:
+            if re.search(rf"(?<!\w){re.escape(grid_id.lower())}(?!\w)", lowered) and len(grids) > 1:
+                return grid_id
+        active = ui_state.get("activeGridId") or ui_state.get("grid.active")
+        if isinstance(active, str):
+            return active
+        return next(iter(grids)) if len(grids) == 1 else DEFAULT_GRID_ID
+
+    def _column_mentions(self, message: str, columns: List[GridColumn]) -> List[Tuple[int, int, GridColumn]]:
+        by_name = {name: column for column in columns for name in column.names()}
+        if not by_name:
+            return []
+        pattern = re.compile(
+            r"(?<!\w)(" + "|".join(re.escape(name) for name in sorted(by_name, key=len, reverse=True)) + r")(?![a-z0-9_])",
+            re.I,
+        )
+        return [(match.start(), match.end(), by_name[match.group(1).lower()]) for match in pattern.finditer(message)]
+
+    def _values(
+        self,
+        kind: str,
+        message: str,
+        start: int,
+        end: int,
+        mentions: List[Tuple[int, int, GridColumn]],
+        columns: List[GridColumn],
+    ) -> List[Any]:
+        if not columns:
+            mentions = self._loose_mentions(_LOOSE_FILTER_RE if kind == "filter" else _LOOSE_FIELD_RE, message, start, end)
+        if kind == "group":
+            return list(dict.fromkeys(column.field for _, _, column in mentions))
+        if kind == "sort":
+            return self._sorts(message, start, end, mentions)
+        return self._filters(message, start, end, mentions, columns)
+
+    def _loose_mentions(
+        self, pattern: Pattern[str], message: str, start: int, end: int
+    ) -> List[Tuple[int, int, GridColumn]]:
+        mentions = []
+        for match in pattern.finditer(message, start, end):
+            name = match.group(1)
+            if name.lower() not in _STOPWORDS and not self._index.lookup(name):
+                mentions.append((match.start(1), match.end(1), GridColumn(name)))
+        return mentions
+
+    def _sorts(self, message: str, start: int, end: int, mentions: List[Tuple[int, int, GridColumn]]) -> List[Any]:
+        sorts: Dict[str, str] = {}
+        for number, (_, stop, column) in enumerate(mentions):
+            window_end = mentions[number + 1][0] if number + 1 < len(mentions) else end
+            window_start = mentions[number - 1][1] if number else start
+            direction = _direction(message[stop:window_end]) or _direction(message[window_start : mentions[number][0]])
+            sorts.setdefault(column.field, direction or "asc")
+        return [{"field": name, "dir": direction} for name, direction in sorts.items()]
+
+    def _filters(
+        self,
+        message: str,
+        start: int,
+        end: int,
+        mentions: List[Tuple[int, int, GridColumn]],
+        columns: List[GridColumn],
+    ) -> List[Any]:
+        filters: List[Dict[str, Any]] = []
+        consumed: List[Tuple[int, int]] = []
+        for number, (_, stop, column) in enumerate(mentions):
+            window_end = mentions[number + 1][0] if number + 1 < len(mentions) else end
+            clause = _clause(column, message[stop:window_end])
+            if clause is not None:
+                op, value, length = clause
+                filters.append({"field": column.field, "op": op, "value": value})
+                consumed.append((stop, stop + length))
+        for column in columns:
+            for value in column.values:
+                pattern = re.compile(rf"(?<!\w){re.escape(value)}(?![a-z0-9_])", re.I)
+                for match in pattern.finditer(message, start, end):
+                    if any(begin <= match.start() < stop for begin, stop in consumed):
+                        continue
+                    negated = _NEGATIONS.search(message[: match.start()]) or message[match.end() :].lstrip().startswith("제외")
+                    filters.append({"field": column.field, "op": "neq" if negated else "eq", "value": value})
+                    consumed.append((match.start(), match.end()))
+        return filters
+
+
+def _direction(text: str) -> Optional[str]:
+    for token in _WORD_RE.findall(text.lower()):
+        if token in _DESC_WORDS or any(token.startswith(word) for word in _DESC_WORDS if not word.isascii()):
+            return "desc"
+        if token in _ASC_WORDS or any(token.startswith(word) for word in _ASC_WORDS if not word.isascii()):
+            return "asc"
+    return None
+
+
+def _clause(column: GridColumn, text: str) -> Optional[Tuple[str, Any, int]]:
+    text = _PARTICLE_RE.sub(lambda match: " " * len(match.group()), text, count=1)
+    match = _CLAUSE_RE.match(text)
+    if match is None:
+        return None
+    raw = match.group("value")
+    if raw[0] in "\"'":
+        raw = raw[1:-1]
+    else:
+        raw = _VALUE_SUFFIX_RE.sub("", raw)
+    if not raw or (raw.lower() in _STOPWORDS and not match.group("op")):
+        return None
+    op = POSTFIX_OPERATORS.get(match.group("postfix") or "") or _OPERATOR_LOOKUP.get(
+        " ".join((match.group("op") or "").lower().split()), "eq"
+    )
+    value = _coerce(column, raw)
+    if value is None:
+        return None
+    return op, value, match.end()
+
+
+def _coerce(column: GridColumn, raw: str) -> Any:
+    if column.values:
+        lookup = {value.lower(): value for value in column.values}
+        return lookup.get(raw.lower())
+    if column.type in ("number", "numeric", "integer", "float"):
+        try:
+            number = float(raw.replace(",", ""))
+        except ValueError:
+            return None
+        return int(number) if number.is_integer() else number
+    if column.type == "boolean":
+        return {"true": True, "yes": True, "false": False, "no": False}.get(raw.lower())
+    return raw
+
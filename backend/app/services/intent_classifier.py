@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.schemas import AssetResponse
+from app.observability.logger import logger
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.services.asset_service import AssetService
+from app.services.embeddings import HashingEmbedder
+from app.services.rag_index import tokenize
+from app.services.repositories import PUBLISHED
+
+
+INTENTS = ("chat", "rag", "tool")
+INTENT_ASSET_TYPE = "intent_dataset"
+
+
+class IntentFeaturizer(HashingEmbedder):
+    def __init__(self, dim: int = 1024, char_ngram: int = 3) -> None:
+        super().__init__(dim)
+        self._char_ngram = char_ngram
+
+    def features(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        n = self._char_ngram
+        for token in tokens:
+            padded = f"<{token}>"
+            features.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = super().embed_batch(texts)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+class LinearIntentModel:
+    def __init__(self, labels: Sequence[str], weights: np.ndarray, bias: np.ndarray) -> None:
+        self.labels = tuple(labels)
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+
+    def probabilities(self, features: np.ndarray) -> np.ndarray:
+        return _softmax(features @ self.weights + self.bias)
+
+    @classmethod
+    def train(
+        cls,
+        features: np.ndarray,
+        targets: Sequence[str],
+        labels: Sequence[str] = INTENTS,
+        epochs: int = 200,
+        learning_rate: float = 1.0,
+        l2: float = 1e-4,
+    ) -> "LinearIntentModel":
+        index = {label: column for column, label in enumerate(labels)}
+        onehot = np.zeros((len(targets), len(labels)), dtype=np.float32)
+        onehot[np.arange(len(targets)), [index[target] for target in targets]] = 1.0
+        weights = np.zeros((features.shape[1], len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        scale = 1.0 / max(len(targets), 1)
+        for _ in range(epochs):
+            error = _softmax(features @ weights + bias) - onehot
+            weights -= learning_rate * (scale * (features.T @ error) + l2 * weights)
+            bias -= learning_rate * scale * error.sum(axis=0)
+        return cls(labels, weights, bias)
+
+
+class IntentClassifier:
+    def __init__(
+        self,
+        featurizer: IntentFeaturizer,
+        model: LinearIntentModel,
+        max_batch: int = 32,
+        max_delay_s: float = 0.002,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._featurizer = featurizer
+        self._model = model
+        self._max_batch = max_batch
+        self._max_delay_s = max_delay_s
+        self._metrics = metrics or default_metrics
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def predict_batch(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        probabilities = self._model.probabilities(self._featurizer.embed_batch(texts))
+        best = probabilities.argmax(axis=1)
+        return [(self._model.labels[column], float(probabilities[row, column])) for row, column in enumerate(best)]
+
+    async def predict(self, text: str) -> Tuple[str, float]:
+        if self._max_batch <= 1:
+            return self.predict_batch([text])[0]
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay_s, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self._metrics.observe("intent.batch_size", len(batch))
+        try:
+            predictions = self.predict_batch([text for text, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+
+def parse_examples(payload: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    examples = payload.get("examples")
+    if not isinstance(examples, list) or not examples:
+        raise ValueError("Intent dataset needs a non-empty examples list")
+    texts: List[str] = []
+    targets: List[str] = []
+    for example in examples:
+        if not isinstance(example, dict) or not isinstance(example.get("text"), str):
+            raise ValueError("Intent examples need a text field")
+        if example.get("intent") not in INTENTS:
+            raise ValueError(f"Intent examples must be labeled with one of {list(INTENTS)}")
+        texts.append(example["text"])
+        targets.append(example["intent"])
+    if len(set(targets)) < 2:
+        raise ValueError("Intent dataset needs examples for at least two intents")
+    return texts, targets
+
+
+class IntentService:
+    def __init__(
+        self,
+        asset_service: Optional[AssetService] = None,
+        dataset_name: str = "default",
+        dim: int = 1024,
+        epochs: int = 200,
+        min_confidence: float = 0.5,
+        max_batch: int = 32,
+        max_delay_s: float = 0.002,
+        max_tenants: int = 1024,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._asset_service = asset_service
+        self._dataset_name = dataset_name
+        self._featurizer = IntentFeaturizer(dim)
+        self._epochs = epochs
+        self._min_confidence = min_confidence
+        self._max_batch = max_batch
+        self._max_delay_s = max_delay_s
+        self._max_tenants = max_tenants
+        self._metrics = metrics or default_metrics
+        self._classifiers: "OrderedDict[str, Optional[IntentClassifier]]" = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    def validate(self, asset: AssetResponse) -> None:
+        parse_examples(asset.payload)
+
+    def train(self, payload: Dict[str, Any]) -> IntentClassifier:
+        texts, targets = parse_examples(payload)
+        model = LinearIntentModel.train(self._featurizer.embed_batch(texts), targets, epochs=self._epochs)
+        self._metrics.incr("intent.models_trained")
+        return IntentClassifier(
+            self._featurizer,
+            model,
+            max_batch=self._max_batch,
+            max_delay_s=self._max_delay_s,
+            metrics=self._metrics,
+        )
+
+    async def classify(self, tenant_id: str, text: str) -> Optional[str]:
+        if tenant_id not in self._classifiers:
+            if self._asset_service is None:
+                return None
+            if tenant_id not in self._loading and len(self._loading) < self._max_tenants:
+                self._loading[tenant_id] = asyncio.create_task(self.reload(tenant_id))
+            return None
+        self._classifiers.move_to_end(tenant_id)
+        classifier = self._classifiers[tenant_id]
+        if classifier is None:
+            return None
+        intent, confidence = await classifier.predict(text)
+        if confidence < self._min_confidence:
+            self._metrics.incr("intent.low_confidence", intent=intent)
+            return None
+        return intent
+
+    async def reload(self, tenant_id: str) -> None:
+        try:
+            asset = None
+            if self._asset_service is not None:
+                asset = await self._asset_service.resolve(tenant_id, INTENT_ASSET_TYPE, self._dataset_name)
+            classifier = await asyncio.to_thread(self.train, asset.payload) if asset is not None else None
+        except Exception:
+            self._metrics.incr("intent.reload_errors")
+            logger.exception("Failed to load intent model for tenant %s", tenant_id)
+            if tenant_id not in self._classifiers:
+                self._remember(tenant_id, None)
+            return
+        finally:
+            self._loading.pop(tenant_id, None)
+        self._remember(tenant_id, classifier)
+        if asset is not None:
+            self._versions[tenant_id] = asset.version
+
+    async def on_asset_changed(self, asset: AssetResponse) -> None:
+        if asset.asset_type != INTENT_ASSET_TYPE or asset.name != self._dataset_name:
+            return
+        if asset.status == PUBLISHED or self._versions.get(asset.tenant_id) == asset.version:
+            await self.reload(asset.tenant_id)
+
+    def _remember(self, tenant_id: str, classifier: Optional[IntentClassifier]) -> None:
+        self._classifiers[tenant_id] = classifier
+        self._classifiers.move_to_end(tenant_id)
+        self._versions.pop(tenant_id, None)
+        while len(self._classifiers) > self._max_tenants:
+            evicted, _ = self._classifiers.popitem(last=False)
+            self._versions.pop(evicted, None)
+            self._metrics.incr("intent.classifier_evictions")
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.infra.cache import TTLCache
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+
+
+Messages = List[Dict[str, str]]
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+class TokenBudgetExceeded(RuntimeError):
+    pass
+
+
+class _CallAbandoned(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class LLMResponse:
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def estimate_prompt_tokens(messages: Messages) -> int:
+    return sum(estimate_tokens(message.get("content", "")) + 4 for message in messages)
+
+
+def _chunks(text: str, size: int = 16) -> List[str]:
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+class LLMBackend:
+    name = "base"
+
+    async def complete(self, messages: Messages, model: str, max_tokens: int, temperature: float) -> LLMResponse:
+        raise NotImplementedError
+
+    def stream(self, messages: Messages, model: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+
+class FakeLLMBackend(LLMBackend):
+    name = "fake"
+
+    def __init__(self, latency_s: float = 0.0) -> None:
+        self._latency_s = latency_s
+        self.calls = 0
+
+    def reply(self, messages: Messages, max_tokens: int) -> str:
+        question = next((message["content"] for message in reversed(messages) if message["role"] == "user"), "")
+        digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+        return " ".join(f"[{digest}] {question}".split()[:max_tokens])
+
+    async def complete(self, messages: Messages, model: str, max_tokens: int, temperature: float) -> LLMResponse:
+        self.calls += 1
+        if self._latency_s:
+            await asyncio.sleep(self._latency_s)
+        text = self.reply(messages, max_tokens)
+        return LLMResponse(text, model, estimate_prompt_tokens(messages), len(text.split()))
+
+    async def stream(self, messages: Messages, model: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        self.calls += 1
+        words = self.reply(messages, max_tokens).split(" ")
+        for index, word in enumerate(words):
+            if self._latency_s:
+                await asyncio.sleep(self._latency_s / len(words))
+            yield word if index == 0 else " " + word
+
+
+class OpenAIChatBackend(LLMBackend):
+    name = "openai"
+
+    def __init__(self, client: Any, base_url: str, api_key: Optional[str] = None) -> None:
+        self._client = client
+        self._url = base_url.rstrip("/") + "/chat/completions"
+        self._headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    def _payload(self, messages: Messages, model: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
+        return {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+
+    async def complete(self, messages: Messages, model: str, max_tokens: int, temperature: float) -> LLMResponse:
+        try:
+            response = await self._client.post(
+                self._url, json=self._payload(messages, model, max_tokens, temperature), headers=self._headers
+            )
+        except Exception as exc:
+            raise LLMError(f"LLM request failed: {exc!r}") from exc
+        if response.status_code >= 400:
+            raise LLMError(f"LLM request failed with status {response.status_code}: {response.text[:200]}")
+        data = response.json()
+        usage = data.get("usage") or {}
+        return LLMResponse(
+            data["choices"][0]["message"].get("content") or "",
+            data.get("model", model),
+            usage.get("prompt_tokens", estimate_prompt_tokens(messages)),
+            usage.get("completion_tokens", 0),
+        )
+
+    async def stream(self, messages: Messages, model: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        payload = {**self._payload(messages, model, max_tokens, temperature), "stream": True}
+        try:
+            async with self._client.stream("POST", self._url, json=payload, headers=self._headers) as response:
+                if response.status_code >= 400:
+                    body = await response.aread()
+                    raise LLMError(f"LLM request failed with status {response.status_code}: {body[:200]!r}")
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    for choice in json.loads(data).get("choices", []):
+                        content = (choice.get("delta") or {}).get("content")
+                        if content:
+                            yield content
+        except LLMError:
+            raise
+        except Exception as exc:
+            raise LLMError(f"LLM stream failed: {exc!r}") from exc
+
+
+class TokenBudget:
+    def __init__(self, tokens_per_window: int = 0, window_s: float = 3600.0) -> None:
+        self._limit = tokens_per_window
+        self._window_s = window_s
+        self._window = -1
+        self._used: Dict[str, int] = {}
+
+    def _current(self, tenant_id: str) -> int:
+        window = int(time.time() // self._window_s)
+        if window != self._window:
+            self._window = window
+            self._used.clear()
+        return self._used.get(tenant_id, 0)
+
+    def used(self, tenant_id: str) -> int:
+        return self._current(tenant_id)
+
+    def reserve(self, tenant_id: str, tokens: int) -> None:
+        used = self._current(tenant_id)
+        if self._limit and used + tokens > self._limit:
+            raise TokenBudgetExceeded(f"Token budget exhausted for tenant {tenant_id}")
+        self._used[tenant_id] = used + tokens
+
+    def settle(self, tenant_id: str, reserved: int, actual: int) -> None:
+        used = max(self._current(tenant_id) - reserved + actual, 0)
+        if used:
+            self._used[tenant_id] = used
+        else:
+            self._used.pop(tenant_id, None)
+
+
+class LLMAdapter:
+    def __init__(
+        self,
+        backend: LLMBackend,
+        model: str,
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        cache: Optional[TTLCache] = None,
+        budget: Optional[TokenBudget] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._backend = backend
+        self._model = model
+        self._max_tokens = max_tokens
+        self._temperature = temperature
+        self._metrics = metrics or default_metrics
+        self._cache = cache or TTLCache("llm.cache", metrics=self._metrics)
+        self._budget = budget or TokenBudget()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def prompt_key(self, tenant_id: str, messages: Messages, model: str, max_tokens: int, temperature: float) -> str:
+        raw = json.dumps([tenant_id, model, max_tokens, temperature, messages], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _options(
+        self, model: Optional[str], max_tokens: Optional[int], temperature: Optional[float]
+    ) -> Tuple[str, int, float]:
+        return (
+            model or self._model,
+            max_tokens or self._max_tokens,
+            self._temperature if temperature is None else temperature,
+        )
+
+    def _cached(self, key: str, temperature: float) -> Optional[LLMResponse]:
+        if temperature > 0:
+            return None
+        response = self._cache.get(key)
+        if response is not None:
+            self._metrics.incr("llm.requests", backend=self._backend.name, outcome="cache_hit")
+            return replace(response, cached=True)
+        return None
+
+    def _record(
+        self, tenant_id: str, key: str, reserved: int, response: LLMResponse, temperature: float, started: float
+    ) -> None:
+        self._budget.settle(tenant_id, reserved, response.prompt_tokens + response.completion_tokens)
+        if temperature <= 0:
+            self._cache.set(key, response)
+        self._metrics.incr("llm.requests", backend=self._backend.name, outcome="call")
+        self._metrics.incr("llm.tokens", response.prompt_tokens, kind="prompt", model=response.model)
+        self._metrics.incr("llm.tokens", response.completion_tokens, kind="completion", model=response.model)
+        self._metrics.observe("llm.duration_seconds", time.perf_counter() - started, backend=self._backend.name)
+
+    def _reserve(self, tenant_id: str, messages: Messages, max_tokens: int) -> int:
+        reserved = estimate_prompt_tokens(messages) + max_tokens
+        try:
+            self._budget.reserve(tenant_id, reserved)
+        except TokenBudgetExceeded:
+            self._metrics.incr("llm.budget_exceeded")
+            raise
+        return reserved
+
+    def _forget(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
+
+    async def _join(self, key: str) -> Optional[LLMResponse]:
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                return None
+            self._metrics.incr("llm.requests", backend=self._backend.name, outcome="coalesced")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            except _CallAbandoned:
+                pass
+
+    async def complete(
+        self,
+        messages: Messages,
+        tenant_id: str = "",
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> LLMResponse:
+        model, max_tokens, temperature = self._options(model, max_tokens, temperature)
+        key = self.prompt_key(tenant_id, messages, model, max_tokens, temperature)
+        cached = self._cached(key, temperature)
+        if cached is not None:
+            return cached
+        joined = await self._join(key)
+        if joined is not None:
+            return joined
+
+        reserved = self._reserve(tenant_id, messages, max_tokens)
+        task = asyncio.ensure_future(self._call(tenant_id, key, reserved, messages, model, max_tokens, temperature))
+        self._inflight[key] = task
+        task.add_done_callback(partial(self._forget, key))
+        return await asyncio.shield(task)
+
+    async def _call(
+        self,
+        tenant_id: str,
+        key: str,
+        reserved: int,
+        messages: Messages,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMResponse:
+        started = time.perf_counter()
+        try:
+            response = await self._backend.complete(messages, model, max_tokens, temperature)
+        except BaseException:
+            self._budget.settle(tenant_id, reserved, 0)
+            self._metrics.incr("llm.errors", backend=self._backend.name)
+            raise
+        self._record(tenant_id, key, reserved, response, temperature, started)
+        return response
+
+    async def stream(
+        self,
+        messages: Messages,
+        tenant_id: str = "",
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        model, max_tokens, temperature = self._options(model, max_tokens, temperature)
+        key = self.prompt_key(tenant_id, messages, model, max_tokens, temperature)
+        cached = self._cached(key, temperature)
+        if cached is None:
+            cached = await self._join(key)
+        if cached is not None:
+            for chunk in _chunks(cached.text):
+                yield chunk
+            return
+
+        reserved = self._reserve(tenant_id, messages, max_tokens)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(partial(self._forget, key))
+        self._inflight[key] = future
+        started = time.perf_counter()
+        parts: List[str] = []
+        try:
+            async for chunk in self._backend.stream(messages, model, max_tokens, temperature):
+                parts.append(chunk)
+                yield chunk
+        except BaseException as exc:
+            used = estimate_prompt_tokens(messages) + estimate_tokens("".join(parts)) if parts else 0
+            self._budget.settle(tenant_id, reserved, used)
+            if isinstance(exc, Exception):
+                self._metrics.incr("llm.errors", backend=self._backend.name)
+                future.set_exception(exc)
+            else:
+                future.set_exception(_CallAbandoned())
+                self._forget(key, future)
+            raise
+        text = "".join(parts)
+        response = LLMResponse(text, model, estimate_prompt_tokens(messages), estimate_tokens(text))
+        self._record(tenant_id, key, reserved, response, temperature, started)
+        future.set_result(response)
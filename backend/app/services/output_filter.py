@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import List
+
+from app.services.policy_scanner import PolicyMatch, PolicyScanner
+
+
+REDACTION_MARK = "[REDACTED]"
+
+
+class StreamRedactor:
+    def __init__(self, scanner: PolicyScanner, lookback: int = 32, actions: tuple[str, ...] = ("block",)) -> None:
+        self._scanner = scanner
+        self._lookback = lookback
+        self._actions = actions
+        self._buffer = ""
+        self._context = ""
+        self.redactions: List[PolicyMatch] = []
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        return self._emit(final=False)
+
+    def flush(self) -> str:
+        return self._emit(final=True)
+
+    def redact(self, text: str) -> str:
+        return self.feed(text) + self.flush()
+
+    def _emit(self, final: bool) -> str:
+        if not self._buffer:
+            return ""
+        text = self._context + self._buffer
+        offset = len(self._context)
+        safe_end = len(text) if final else max(offset, len(text) - self._lookback)
+        matches = [
+            match
+            for match in self._scanner.scan(text)
+            if match.rule.action in self._actions and match.end > offset
+        ]
+        for match in matches:
+            if match.start < safe_end < match.end:
+                safe_end = max(offset, match.start)
+        if safe_end == offset:
+            return ""
+
+        pieces: List[str] = []
+        cursor = offset
+        for match in matches:
+            if match.end > safe_end:
+                break
+            start = max(match.start, offset)
+            pieces.append(text[cursor:start])
+            pieces.append(REDACTION_MARK)
+            cursor = match.end
+            self.redactions.append(match)
+        pieces.append(text[cursor:safe_end])
+
+        self._buffer = text[safe_end:]
+        self._context = text[max(0, safe_end - self._lookback) : safe_end]
+        return "".join(pieces)
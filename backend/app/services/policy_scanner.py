@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from app.models.schemas import PolicyRule
+
+
+POLICY_ACTIONS = ("block", "warn")
+
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=")
+_REGEX_METACHARS = set(".^$*+?{}[]\\|()")
+
+
+@dataclass(frozen=True)
+class PolicyMatch:
+    rule: PolicyRule
+    start: int
+    end: int
+
+
+def validate_rule(rule: PolicyRule) -> None:
+    if rule.action not in POLICY_ACTIONS:
+        raise ValueError(f"Policy {rule.name}: action must be one of {list(POLICY_ACTIONS)}")
+    try:
+        compiled = re.compile(f"(?:{rule.pattern})")
+    except re.error as exc:
+        raise ValueError(f"Policy {rule.name}: invalid pattern: {exc}")
+    if compiled.groupindex or _BACKREFERENCE_RE.search(rule.pattern):
+        raise ValueError(f"Policy {rule.name}: named groups and backreferences are not supported")
+
+
+def is_literal(pattern: str) -> bool:
+    return bool(pattern) and not _REGEX_METACHARS.intersection(pattern)
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+class PolicyScanner:
+    def __init__(self, rules: Sequence[PolicyRule]) -> None:
+        self.rules = sorted(rules, key=lambda rule: POLICY_ACTIONS.index(rule.action))
+        self._regex_rules: Dict[str, PolicyRule] = {}
+        self._literal_rules: Dict[str, Tuple[bool, Dict[str, PolicyRule]]] = {}
+        alternatives: List[str] = []
+        for action in POLICY_ACTIONS:
+            for ignore_case in (False, True):
+                literals: Dict[str, PolicyRule] = {}
+                for rule in self.rules:
+                    if rule.action == action and rule.ignore_case == ignore_case and is_literal(rule.pattern):
+                        literals.setdefault(rule.pattern.lower() if ignore_case else rule.pattern, rule)
+                if literals:
+                    name = f"l{len(self._literal_rules)}"
+                    self._literal_rules[name] = (ignore_case, literals)
+                    body = trie_pattern(literals)
+                    alternatives.append(f"(?P<{name}>(?i:{body}))" if ignore_case else f"(?P<{name}>{body})")
+            for rule in self.rules:
+                if rule.action == action and not is_literal(rule.pattern):
+                    name = f"r{len(self._regex_rules)}"
+                    self._regex_rules[name] = rule
+                    body = f"(?i:{rule.pattern})" if rule.ignore_case else f"(?:{rule.pattern})"
+                    alternatives.append(f"(?P<{name}>{body})")
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def scan(self, text: str) -> List[PolicyMatch]:
+        if self._pattern is None:
+            return []
+        matches: List[PolicyMatch] = []
+        for match in self._pattern.finditer(text):
+            if match.end() == match.start():
+                continue
+            group = match.lastgroup
+            rule = self._regex_rules.get(group)
+            if rule is None:
+                ignore_case, literals = self._literal_rules[group]
+                matched = match.group()
+                rule = literals.get(matched.lower() if ignore_case else matched) or next(iter(literals.values()))
+            matches.append(PolicyMatch(rule, match.start(), match.end()))
+        return matches
@@ -3,35 +3,97 @@ from __future__ import annotations
 import re
 import uuid
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from app.models.schemas import PolicyEvent
+from app.models.schemas import PolicyEvent, PolicyRule
+from app.observability.event_log import EventLog
+from app.services.output_filter import StreamRedactor
+from app.services.policy_scanner import PolicyMatch, PolicyScanner, validate_rule
+
+
+DEFAULT_RULES = (
+    PolicyRule(name="pii.resident_id", pattern=r"\b\d{6}-\d{7}\b", message="PII detected"),
+    PolicyRule(name="pii.ssn", pattern=r"\b\d{3}-\d{2}-\d{4}\b", message="PII detected"),
+    PolicyRule(name="pii.phone", pattern=r"\b\d{2,3}-\d{3,4}-\d{4}\b", message="PII detected"),
+    PolicyRule(
+        name="injection.ignore_instructions",
+        pattern=r"ignore (all|previous) instructions",
+        action="warn",
+        ignore_case=True,
+        message="Prompt injection detected",
+    ),
+    PolicyRule(
+        name="injection.system_prompt",
+        pattern=r"system prompt",
+        action="warn",
+        ignore_case=True,
+        message="Prompt injection detected",
+    ),
+)
 
 
 class PolicyService:
-    def __init__(self) -> None:
-        self._events: List[PolicyEvent] = []
-        self._pii_patterns = [
-            re.compile(r"\b\d{6}-\d{7}\b"),
-            re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
-            re.compile(r"\b\d{2,3}-\d{3,4}-\d{4}\b"),
-        ]
-        self._injection_patterns = [
-            re.compile(r"ignore (all|previous) instructions", re.IGNORECASE),
-            re.compile(r"system prompt", re.IGNORECASE),
-        ]
-
-    def check_input(self, message: str) -> tuple[bool, str]:
-        for pattern in self._pii_patterns:
-            if pattern.search(message):
-                self._record("input", "block", "PII detected")
+    def __init__(
+        self,
+        rules: Sequence[PolicyRule] = DEFAULT_RULES,
+        output_lookback: int = 32,
+        event_log: Optional[EventLog] = None,
+    ) -> None:
+        self._events = event_log or EventLog("policy", serialize=lambda event: event.model_dump(mode="json"))
+        self._rules = list(rules)
+        self._output_lookback = output_lookback
+        self._tenant_rules: Dict[str, List[PolicyRule]] = {}
+        self._scanners: Dict[str, PolicyScanner] = {}
+        self._default_scanner = PolicyScanner(self._rules)
+
+    def set_tenant_rules(self, tenant_id: str, rules: Sequence[PolicyRule]) -> None:
+        for rule in rules:
+            validate_rule(rule)
+        if not rules:
+            self._tenant_rules.pop(tenant_id, None)
+            self._scanners.pop(tenant_id, None)
+            return
+        try:
+            scanner = PolicyScanner(self._rules + list(rules))
+        except re.error as exc:
+            raise ValueError(f"Invalid policy rule set: {exc}")
+        self._tenant_rules[tenant_id] = list(rules)
+        self._scanners[tenant_id] = scanner
+
+    def tenant_rules(self, tenant_id: str) -> List[PolicyRule]:
+        return list(self._tenant_rules.get(tenant_id, []))
+
+    def scanner(self, tenant_id: str = "") -> PolicyScanner:
+        return self._scanners.get(tenant_id, self._default_scanner)
+
+    def scan(self, text: str, tenant_id: str = "") -> List[PolicyMatch]:
+        return self.scanner(tenant_id).scan(text)
+
+    def check_input(self, message: str, tenant_id: str = "") -> tuple[bool, str]:
+        matches = self.scan(message, tenant_id)
+        blocked = [match for match in matches if match.rule.action == "block"]
+        if blocked:
+            rule = blocked[0].rule
+            self._record("input", "block", rule.message or f"Policy {rule.name} matched")
+            if rule.name.startswith("pii."):
                 return False, "Input blocked due to PII policy."
-        for pattern in self._injection_patterns:
-            if pattern.search(message):
-                self._record("input", "redact", "Prompt injection detected")
+            return False, f"Input blocked by policy {rule.name}."
+        if matches:
+            rule = matches[0].rule
+            self._record("input", "redact", rule.message or f"Policy {rule.name} matched")
+            if rule.name.startswith("injection."):
                 return True, "Potential injection detected; proceeding with caution."
+            return True, f"Input matched policy {rule.name}; proceeding with caution."
         return True, ""
 
+    def output_filter(self, tenant_id: str = "") -> StreamRedactor:
+        return StreamRedactor(self.scanner(tenant_id), lookback=self._output_lookback)
+
+    def record_redactions(self, matches: Sequence[PolicyMatch]) -> str:
+        rules = sorted({match.rule.name for match in matches})
+        self._record("output", "redact", f"Redacted {len(matches)} spans: {', '.join(rules)}")
+        return "Sensitive content redacted from answer."
+
     def check_output(self, answer: str, citations: int) -> tuple[bool, str]:
         if citations == 0:
             self._record("output", "redact", "No citations present")
@@ -49,5 +111,5 @@ class PolicyService:
             )
         )
 
-    def list_events(self) -> List[PolicyEvent]:
-        return list(self._events)
+    def list_events(self, cursor: Optional[int] = None, limit: int = 100) -> Tuple[List[PolicyEvent], Optional[int]]:
+        return self._events.page(cursor, limit)
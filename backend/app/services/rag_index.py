@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.infra.vector_store import select_top_k
+
+if TYPE_CHECKING:
+    from app.services.rag_segment import PostingsSegment
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _set_bit(bitmap: bytearray, key: int) -> None:
+    index = key >> 3
+    if index >= len(bitmap):
+        bitmap.extend(bytes(index + 1 - len(bitmap)))
+    bitmap[index] |= 1 << (key & 7)
+
+
+def _clear_bit(bitmap: bytearray, key: int) -> None:
+    index = key >> 3
+    if index < len(bitmap):
+        bitmap[index] &= ~(1 << (key & 7)) & 0xFF
+
+
+def bitmap_mask(bitmap: bytes, size: int) -> np.ndarray:
+    bits = np.unpackbits(np.frombuffer(bitmap, dtype=np.uint8), bitorder="little")[:size]
+    mask = np.zeros(size, dtype=bool)
+    mask[: bits.size] = bits
+    return mask
+
+
+class InvertedIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75, base: Optional["PostingsSegment"] = None) -> None:
+        self._k1 = k1
+        self._b = b
+        self._base = base
+        self._postings: Dict[str, Dict[int, int]] = {}
+        if base is not None:
+            self._lengths = np.array(base.lengths, dtype=np.int32)
+            self._tombstones = np.zeros(len(self._lengths), dtype=bool)
+            self._total_length = int(self._lengths.sum())
+            self._live_count = base.doc_count
+        else:
+            self._lengths = np.zeros(1024, dtype=np.int32)
+            self._tombstones = np.zeros(0, dtype=bool)
+            self._total_length = 0
+            self._live_count = 0
+        self._key_count = len(self._tombstones)
+        self._has_tombstones = False
+
+    @property
+    def doc_count(self) -> int:
+        return self._live_count
+
+    @property
+    def key_count(self) -> int:
+        return self._key_count
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self._lengths[: self._key_count]
+
+    def add(self, text: str) -> int:
+        key = self._key_count
+        terms = tokenize(text)
+        postings = self._postings
+        for term, tf in Counter(terms).items():
+            term_postings = postings.get(term)
+            if term_postings is None:
+                term_postings = postings[term] = {}
+            term_postings[key] = tf
+        if key >= len(self._lengths):
+            self._lengths = np.concatenate([self._lengths, np.zeros(max(key, 1024), dtype=np.int32)])
+        self._lengths[key] = len(terms)
+        self._key_count += 1
+        self._total_length += len(terms)
+        self._live_count += 1
+        return key
+
+    def remove(self, key: int, text: str) -> None:
+        if key < len(self._tombstones):
+            self._tombstones[key] = True
+            self._has_tombstones = True
+        else:
+            for term in set(tokenize(text)):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= int(self._lengths[key])
+        self._lengths[key] = 0
+        self._live_count -= 1
+
+    def terms(self) -> List[str]:
+        terms = set(self._postings)
+        if self._base is not None:
+            terms.update(self._base.terms())
+        return sorted(terms)
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        keys: List[np.ndarray] = []
+        tfs: List[np.ndarray] = []
+        if self._base is not None:
+            base_keys, base_tfs = self._base.postings(term)
+            if self._has_tombstones and base_keys.size:
+                keep = ~self._tombstones[base_keys]
+                base_keys, base_tfs = base_keys[keep], base_tfs[keep]
+            keys.append(base_keys)
+            tfs.append(base_tfs)
+        live = self._postings.get(term)
+        if live:
+            keys.append(np.fromiter(live.keys(), dtype=np.int64, count=len(live)))
+            tfs.append(np.fromiter(live.values(), dtype=np.int32, count=len(live)))
+        if not keys:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32)
+        if len(keys) == 1:
+            return keys[0], tfs[0]
+        return np.concatenate(keys), np.concatenate(tfs)
+
+    def overlap_mask(self, query: str, keys: np.ndarray) -> np.ndarray:
+        mask = np.zeros(len(keys), dtype=bool)
+        if not len(keys):
+            return mask
+        live_keys = keys.tolist()
+        for term in set(tokenize(query)):
+            if self._base is not None:
+                base_keys = self._base.postings(term)[0]
+                if base_keys.size:
+                    positions = np.minimum(np.searchsorted(base_keys, keys), base_keys.size - 1)
+                    mask |= base_keys[positions] == keys
+            live = self._postings.get(term)
+            if live:
+                mask |= np.fromiter((key in live for key in live_keys), dtype=bool, count=len(live_keys))
+        if self._has_tombstones:
+            in_base = keys < len(self._tombstones)
+            mask[in_base] &= ~self._tombstones[keys[in_base]]
+        return mask
+
+    def document_frequency(self, term: str) -> int:
+        return len(self.postings(term)[0])
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        allowed: Optional[bytes] = None,
+    ) -> List[Tuple[float, int]]:
+        doc_count = self.doc_count
+        if not doc_count:
+            return []
+        avg_length = self._total_length / doc_count or 1.0
+        k1, b = self._k1, self._b
+        mask = None if allowed is None else bitmap_mask(allowed, self._key_count)
+        key_parts: List[np.ndarray] = []
+        score_parts: List[np.ndarray] = []
+        for term in set(tokenize(query)):
+            keys, tfs = self.postings(term)
+            if not keys.size:
+                continue
+            df = keys.size
+            idf = math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+            if mask is not None:
+                keep = mask[keys]
+                keys, tfs = keys[keep], tfs[keep]
+            norm = k1 * (1.0 - b + b * self._lengths[keys] / avg_length)
+            key_parts.append(keys)
+            score_parts.append(idf * tfs * (k1 + 1.0) / (tfs + norm))
+        if not key_parts:
+            return []
+        keys = np.concatenate(key_parts)
+        scores = np.concatenate(score_parts)
+        if len(key_parts) > 1:
+            keys, inverse = np.unique(keys, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+        return select_top_k(scores, keys, top_k)
+
+
+class ChunkTable:
+    def __init__(self, doc_ids: Optional[List[str]] = None, rows: Optional[np.ndarray] = None) -> None:
+        self._doc_ids: List[str] = list(doc_ids or [])
+        self._ordinals = {doc_id: ordinal for ordinal, doc_id in enumerate(self._doc_ids)}
+        self._base = rows if rows is not None else np.zeros((0, 3), dtype=np.int64)
+        self._rows = array("q")
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._rows) // 3
+
+    def append(self, doc_id: str, start: int, end: int) -> int:
+        ordinal = self._ordinals.get(doc_id)
+        if ordinal is None:
+            ordinal = self._ordinals[doc_id] = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+        key = len(self)
+        self._rows.extend((ordinal, start, end))
+        return key
+
+    def get(self, key: int) -> Tuple[str, int, int]:
+        if key < len(self._base):
+            ordinal, start, end = (int(value) for value in self._base[key])
+        else:
+            offset = (key - len(self._base)) * 3
+            ordinal, start, end = self._rows[offset : offset + 3]
+        return self._doc_ids[ordinal], start, end
+
+    def export(self) -> Tuple[List[str], np.ndarray]:
+        live = np.frombuffer(self._rows, dtype=np.int64).reshape(-1, 3) if self._rows else np.zeros((0, 3), np.int64)
+        return list(self._doc_ids), np.concatenate([self._base, live])
+
+
+class AclIndex:
+    def __init__(self, kb_acl: Iterable[str]) -> None:
+        self._kb_acl = frozenset(kb_acl)
+        self._role_bitmaps: Dict[str, bytearray] = {}
+        self._public = bytearray()
+        self._live = bytearray()
+
+    def add(self, key: int, acl: Iterable[str]) -> None:
+        _set_bit(self._live, key)
+        self._assign(key, acl)
+
+    def update(self, key: int, old_acl: Iterable[str], new_acl: Iterable[str]) -> None:
+        self._unassign(key, old_acl)
+        self._assign(key, new_acl)
+
+    def remove(self, key: int, acl: Iterable[str]) -> None:
+        _clear_bit(self._live, key)
+        self._unassign(key, acl)
+
+    @classmethod
+    def from_state(
+        cls, kb_acl: Iterable[str], public: bytes, live: bytes, role_bitmaps: Dict[str, bytes]
+    ) -> "AclIndex":
+        acl_index = cls(kb_acl)
+        acl_index._public = bytearray(public)
+        acl_index._live = bytearray(live)
+        acl_index._role_bitmaps = {role: bytearray(bitmap) for role, bitmap in role_bitmaps.items()}
+        return acl_index
+
+    def state(self) -> Tuple[List[str], bytes, bytes, Dict[str, bytes]]:
+        roles = {role: bytes(bitmap) for role, bitmap in self._role_bitmaps.items()}
+        return sorted(self._kb_acl), bytes(self._public), bytes(self._live), roles
+
+    def effective_roles(self, roles: Iterable[str]) -> frozenset:
+        return frozenset(role for role in roles if role in self._role_bitmaps or role in self._kb_acl)
+
+    def allowed(self, roles: Iterable[str]) -> bytes:
+        roles = set(roles)
+        if self._kb_acl and self._kb_acl.isdisjoint(roles):
+            return b""
+        mask = int.from_bytes(self._public, "little")
+        for role in roles:
+            bitmap = self._role_bitmaps.get(role)
+            if bitmap is not None:
+                mask |= int.from_bytes(bitmap, "little")
+        mask &= int.from_bytes(self._live, "little")
+        return mask.to_bytes(len(self._live), "little")
+
+    def _assign(self, key: int, acl: Iterable[str]) -> None:
+        acl = list(acl)
+        if not acl:
+            _set_bit(self._public, key)
+        for role in acl:
+            _set_bit(self._role_bitmaps.setdefault(role, bytearray()), key)
+
+    def _unassign(self, key: int, acl: Iterable[str]) -> None:
+        acl = list(acl)
+        if not acl:
+            _clear_bit(self._public, key)
+        for role in acl:
+            bitmap = self._role_bitmaps.get(role)
+            if bitmap is not None:
+                _clear_bit(bitmap, key)
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[List[Tuple[float, int]]], top_k: int, k: int = 60
+) -> List[Tuple[float, int]]:
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (_, key) in enumerate(ranking):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank + 1)
+    return heapq.nlargest(top_k, ((score, key) for key, score in fused.items()))
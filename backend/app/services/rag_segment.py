@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.rag_index import AclIndex, ChunkTable, InvertedIndex
+
+
+SEGMENT_FORMAT = 1
+_STAGING_MARKERS = (".tmp-", ".old-")
+
+
+def is_staging_dir(path: Path) -> bool:
+    return any(marker in path.name for marker in _STAGING_MARKERS)
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_tree(path: Path) -> None:
+    for child in path.iterdir():
+        with open(child, "rb") as handle:
+            os.fsync(handle.fileno())
+    _fsync_dir(path)
+
+
+def recover_segments(directory: Path) -> None:
+    for path in sorted(directory.iterdir()):
+        if not path.is_dir() or not is_staging_dir(path):
+            continue
+        target = directory / path.name.split(".", 1)[0]
+        if ".old-" in path.name and not target.exists() and (path / "manifest.json").exists():
+            os.replace(path, target)
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+    _fsync_dir(directory)
+
+
+def _write_array(path: Path, name: str, array: np.ndarray) -> None:
+    np.save(path / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+
+
+def _load_array(path: Path, name: str) -> np.ndarray:
+    return np.load(path / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+
+
+class PostingsSegment:
+    def __init__(self, path: Path, doc_count: int) -> None:
+        self.doc_count = doc_count
+        self.lengths = _load_array(path, "lengths")
+        self._term_blob = _load_array(path, "terms")
+        self._term_offsets = _load_array(path, "term_offsets")
+        self._posting_offsets = _load_array(path, "posting_offsets")
+        self._keys = _load_array(path, "posting_keys")
+        self._tfs = _load_array(path, "posting_tfs")
+
+    def _term(self, index: int) -> bytes:
+        return self._term_blob[self._term_offsets[index] : self._term_offsets[index + 1]].tobytes()
+
+    def _find(self, term: bytes) -> int:
+        low, high = 0, len(self._term_offsets) - 1
+        while low < high:
+            mid = (low + high) // 2
+            if self._term(mid) < term:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(self._term_offsets) - 1 and self._term(low) == term:
+            return low
+        return -1
+
+    def terms(self) -> List[str]:
+        return [self._term(index).decode("utf-8") for index in range(len(self._term_offsets) - 1)]
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        index = self._find(term.encode("utf-8"))
+        if index < 0:
+            return self._keys[:0], self._tfs[:0]
+        start, end = self._posting_offsets[index], self._posting_offsets[index + 1]
+        return self._keys[start:end], self._tfs[start:end]
+
+
+class KnowledgeBaseSegment:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.manifest = json.loads((path / "manifest.json").read_text())
+        if self.manifest.get("format") != SEGMENT_FORMAT:
+            raise ValueError(f"Unsupported KB segment format in {path}")
+        self.postings = PostingsSegment(path, self.manifest["doc_count"])
+        self.chunks = _load_array(path, "chunks")
+        self.vector_arrays = {name: _load_array(path, f"vectors.{name}") for name in self.manifest["vector_arrays"]}
+        acl_bitmaps = np.load(path / "acl.npy", allow_pickle=False)
+        self.acl_state = (
+            self.manifest["kb"]["acl"],
+            acl_bitmaps[0].tobytes(),
+            acl_bitmaps[1].tobytes(),
+            {role: acl_bitmaps[row + 2].tobytes() for row, role in enumerate(self.manifest["acl_roles"])},
+        )
+        self._text: Optional[mmap.mmap] = None
+        with open(path / "documents.bin", "rb") as handle:
+            if os.fstat(handle.fileno()).st_size:
+                self._text = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def text(self, offset: int, length: int) -> str:
+        if self._text is None:
+            return ""
+        return self._text[offset : offset + length].decode("utf-8")
+
+
+def write_segment(
+    path: Path,
+    kb: dict,
+    documents: List[Tuple[dict, str]],
+    chunks: ChunkTable,
+    index: InvertedIndex,
+    acl_index: AclIndex,
+    vector_arrays: Dict[str, np.ndarray],
+) -> None:
+    tmp = path.with_name(f"{path.name}.tmp-{uuid.uuid4().hex}")
+    tmp.mkdir(parents=True)
+
+    doc_ordinals = {doc["doc_id"]: ordinal for ordinal, (doc, _) in enumerate(documents)}
+    doc_entries = []
+    offset = 0
+    with open(tmp / "documents.bin", "wb") as handle:
+        for doc, text in documents:
+            encoded = text.encode("utf-8")
+            handle.write(encoded)
+            keys = doc["chunk_keys"]
+            doc_entries.append(
+                {
+                    "doc_id": doc["doc_id"],
+                    "title": doc["title"],
+                    "source_uri": doc["source_uri"],
+                    "page": doc["page"],
+                    "acl": doc["acl"],
+                    "chunk_start": keys[0] if len(keys) else 0,
+                    "chunk_count": len(keys),
+                    "text_offset": offset,
+                    "text_length": len(encoded),
+                }
+            )
+            offset += len(encoded)
+
+    chunk_doc_ids, rows = chunks.export()
+    remap = np.array([doc_ordinals.get(doc_id, -1) for doc_id in chunk_doc_ids], dtype=np.int64)
+    rows = rows.copy()
+    if len(rows):
+        rows[:, 0] = remap[rows[:, 0]]
+    _write_array(tmp, "chunks", rows)
+
+    terms = index.terms()
+    encoded_terms = [term.encode("utf-8") for term in terms]
+    posting_keys: List[np.ndarray] = []
+    posting_tfs: List[np.ndarray] = []
+    posting_offsets = [0]
+    for term in terms:
+        keys, tfs = index.postings(term)
+        order = np.argsort(keys, kind="stable")
+        posting_keys.append(np.asarray(keys, dtype=np.int64)[order])
+        posting_tfs.append(np.asarray(tfs, dtype=np.int32)[order])
+        posting_offsets.append(posting_offsets[-1] + len(keys))
+    _write_array(tmp, "terms", np.frombuffer(b"".join(encoded_terms), dtype=np.uint8))
+    _write_array(tmp, "term_offsets", np.cumsum([0] + [len(term) for term in encoded_terms], dtype=np.int64))
+    _write_array(tmp, "posting_offsets", np.array(posting_offsets, dtype=np.int64))
+    _write_array(tmp, "posting_keys", np.concatenate(posting_keys) if posting_keys else np.zeros(0, np.int64))
+    _write_array(tmp, "posting_tfs", np.concatenate(posting_tfs) if posting_tfs else np.zeros(0, np.int32))
+    _write_array(tmp, "lengths", index.lengths)
+
+    kb_acl, public, live, role_bitmaps = acl_index.state()
+    roles = sorted(role_bitmaps)
+    width = max([len(public), len(live)] + [len(bitmap) for bitmap in role_bitmaps.values()])
+    acl_bitmaps = np.zeros((len(roles) + 2, width), dtype=np.uint8)
+    for row, bitmap in enumerate([public, live] + [role_bitmaps[role] for role in roles]):
+        acl_bitmaps[row, : len(bitmap)] = np.frombuffer(bitmap, dtype=np.uint8)
+    np.save(tmp / "acl.npy", acl_bitmaps, allow_pickle=False)
+
+    for name, array in vector_arrays.items():
+        _write_array(tmp, f"vectors.{name}", array)
+
+    manifest = {
+        "format": SEGMENT_FORMAT,
+        "kb": {**kb, "acl": kb_acl},
+        "doc_count": index.doc_count,
+        "documents": doc_entries,
+        "acl_roles": roles,
+        "vector_arrays": sorted(vector_arrays),
+    }
+    (tmp / "manifest.json").write_text(json.dumps(manifest))
+    _fsync_tree(tmp)
+
+    old = path.with_name(f"{path.name}.old-{uuid.uuid4().hex}")
+    if path.exists():
+        os.replace(path, old)
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+    shutil.rmtree(old, ignore_errors=True)
@@ -1,22 +1,74 @@
 from __future__ import annotations
 
+import time
 import uuid
-from typing import Dict, List
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from app.models.schemas import Citation
+import numpy as np
+
+from app.infra.cache import TTLCache
+from app.infra.vector_store import VectorStore
+from app.models.schemas import Citation, KnowledgeBaseDocumentRequest
+from app.observability.logger import logger
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.services.chunking import chunk_spans
+from app.services.embeddings import Embedder
+from app.services.rag_index import AclIndex, ChunkTable, InvertedIndex, reciprocal_rank_fusion, tokenize
+from app.services.rag_segment import KnowledgeBaseSegment, is_staging_dir, recover_segments, write_segment
+
+
+PreparedBatch = Tuple[List[Tuple[KnowledgeBaseDocumentRequest, List[Tuple[int, int, str]]]], Optional[np.ndarray]]
 
 
 class RAGService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        snippet_length: int = 200,
+        embedder: Optional[Embedder] = None,
+        vector_store_factory: Optional[Callable[[int], VectorStore]] = None,
+        dense_min_score: float = 0.0,
+        dense_only_min_score: float = 1.0,
+        snapshot_dir: Optional[str] = None,
+        query_cache: Optional[TTLCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+        self._snippet_length = snippet_length
+        self._embedder = embedder
+        self._vector_store_factory = vector_store_factory
+        self._dense_min_score = dense_min_score
+        self._dense_only_min_score = dense_only_min_score
+        self._snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self._query_cache = query_cache
+        self._metrics = metrics or default_metrics
         self._knowledge_bases: Dict[str, dict] = {}
-        self._documents: Dict[str, List[dict]] = {}
+        self._documents: Dict[str, Dict[str, dict]] = {}
+        self._chunks: Dict[str, ChunkTable] = {}
+        self._indexes: Dict[str, InvertedIndex] = {}
+        self._acl_indexes: Dict[str, AclIndex] = {}
+        self._vector_stores: Dict[str, VectorStore] = {}
+        self._segments: Dict[str, KnowledgeBaseSegment] = {}
+        self._versions: Dict[str, int] = {}
 
     def create_kb(self, name: str, description: str | None, acl: List[str]) -> str:
         kb_id = str(uuid.uuid4())
         self._knowledge_bases[kb_id] = {"name": name, "description": description, "acl": acl}
-        self._documents[kb_id] = []
+        self._documents[kb_id] = {}
+        self._chunks[kb_id] = ChunkTable()
+        self._indexes[kb_id] = InvertedIndex()
+        self._acl_indexes[kb_id] = AclIndex(acl)
+        self._versions[kb_id] = 0
+        if self._embedder is not None and self._vector_store_factory is not None:
+            self._vector_stores[kb_id] = self._vector_store_factory(self._embedder.dim)
         return kb_id
 
+    def has_kb(self, kb_id: str) -> bool:
+        return kb_id in self._knowledge_bases
+
     def add_document(
         self,
         kb_id: str,
@@ -26,38 +78,212 @@ class RAGService:
         page: int | None,
         acl: List[str],
     ) -> str:
-        doc_id = str(uuid.uuid4())
-        self._documents[kb_id].append(
-            {
+        request = KnowledgeBaseDocumentRequest(title=title, text=text, source_uri=source_uri, page=page, acl=acl)
+        return self.add_documents(kb_id, [request])[0]
+
+    def prepare_documents(self, kb_id: str, requests: Iterable[KnowledgeBaseDocumentRequest]) -> PreparedBatch:
+        prepared = []
+        texts: List[str] = []
+        for request in requests:
+            spans = [
+                (start, end, f"{request.title}\n{request.text[start:end]}")
+                for start, end in chunk_spans(request.text, self._chunk_size, self._chunk_overlap)
+            ]
+            prepared.append((request, spans))
+            texts.extend(text for _, _, text in spans)
+        embeddings = None
+        if texts and kb_id in self._vector_stores:
+            embeddings = self._embedder.embed_batch(texts)
+        return prepared, embeddings
+
+    def add_documents(self, kb_id: str, requests: Iterable[KnowledgeBaseDocumentRequest]) -> List[str]:
+        return self.commit_documents(kb_id, self.prepare_documents(kb_id, requests))
+
+    def commit_documents(self, kb_id: str, batch: PreparedBatch) -> List[str]:
+        prepared, embeddings = batch
+        documents = self._documents[kb_id]
+        chunks = self._chunks[kb_id]
+        index = self._indexes[kb_id]
+        acl_index = self._acl_indexes[kb_id]
+        vector_store = self._vector_stores.get(kb_id)
+        doc_ids: List[str] = []
+        new_keys: List[int] = []
+        for request, spans in prepared:
+            doc_id = str(uuid.uuid4())
+            chunk_keys: List[int] = []
+            for start, end, chunk_text in spans:
+                key = index.add(chunk_text)
+                acl_index.add(key, request.acl)
+                chunks.append(doc_id, start, end)
+                chunk_keys.append(key)
+            new_keys.extend(chunk_keys)
+            documents[doc_id] = {
                 "doc_id": doc_id,
-                "title": title,
-                "text": text,
-                "source_uri": source_uri,
-                "page": page,
-                "acl": acl,
+                "title": request.title,
+                "text": request.text,
+                "source_uri": request.source_uri,
+                "page": request.page,
+                "acl": request.acl,
+                "chunk_keys": chunk_keys,
             }
-        )
-        return doc_id
-
-    def query(self, kb_id: str, query: str, roles: List[str]) -> tuple[str, List[Citation]]:
-        docs = self._documents.get(kb_id, [])
-        hits: List[dict] = []
-        for doc in docs:
-            if doc["acl"] and not set(doc["acl"]).intersection(roles):
-                continue
-            if query.lower() in doc["text"].lower() or query.lower() in doc["title"].lower():
-                hits.append(doc)
-        citations = [
-            Citation(
-                doc_id=doc["doc_id"],
-                title=doc["title"],
-                page=doc["page"],
-                snippet=doc["text"][:200],
+            doc_ids.append(doc_id)
+        if vector_store is not None and new_keys:
+            vector_store.add_batch(new_keys, embeddings)
+        self._versions[kb_id] += 1
+        return doc_ids
+
+    def update_document_acl(self, kb_id: str, doc_id: str, acl: List[str]) -> None:
+        doc = self._documents[kb_id][doc_id]
+        acl_index = self._acl_indexes[kb_id]
+        for key in doc["chunk_keys"]:
+            acl_index.update(key, doc["acl"], acl)
+        doc["acl"] = acl
+        self._versions[kb_id] += 1
+
+    def delete_document(self, kb_id: str, doc_id: str) -> None:
+        doc = self._documents[kb_id].pop(doc_id)
+        chunks = self._chunks[kb_id]
+        index = self._indexes[kb_id]
+        acl_index = self._acl_indexes[kb_id]
+        vector_store = self._vector_stores.get(kb_id)
+        text = self._document_text(kb_id, doc)
+        for key in doc["chunk_keys"]:
+            _, start, end = chunks.get(key)
+            index.remove(key, f"{doc['title']}\n{text[start:end]}")
+            acl_index.remove(key, doc["acl"])
+            if vector_store is not None:
+                vector_store.remove(key)
+        self._versions[kb_id] += 1
+
+    def query(
+        self, kb_id: str, query: str, roles: List[str], top_k: int = 3
+    ) -> tuple[str, List[Citation]]:
+        index = self._indexes.get(kb_id)
+        if index is None:
+            return "No relevant documents found.", []
+        started = time.perf_counter()
+        cache_key = None
+        if self._query_cache is not None:
+            effective_roles = self._acl_indexes[kb_id].effective_roles(roles)
+            cache_key = (kb_id, self._versions[kb_id], " ".join(query.lower().split()), top_k, effective_roles)
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                self._metrics.observe("rag.query.duration_seconds", time.perf_counter() - started, cache="hit")
+                return cached
+        documents = self._documents[kb_id]
+        chunks = self._chunks[kb_id]
+        allowed = self._acl_indexes[kb_id].allowed(roles)
+        terms = set(tokenize(query))
+        citations: List[Citation] = []
+        for _, key in self._retrieve(kb_id, index, query, top_k, allowed):
+            doc_id, start, end = chunks.get(key)
+            doc = documents[doc_id]
+            text = self._document_text(kb_id, doc)
+            start, end = self._snippet_span(text, start, end, terms)
+            citations.append(
+                Citation(
+                    doc_id=doc["doc_id"],
+                    title=doc["title"],
+                    page=doc["page"],
+                    snippet=text[start:end],
+                    start=start,
+                    end=end,
+                )
             )
-            for doc in hits[:3]
-        ]
         if citations:
             answer = "\n".join([f"{c.title}: {c.snippet}" for c in citations])
         else:
             answer = "No relevant documents found."
+        if cache_key is not None:
+            self._query_cache.set(cache_key, (answer, citations))
+        self._metrics.observe("rag.query.duration_seconds", time.perf_counter() - started, cache="miss")
         return answer, citations
+
+    def save_snapshot(self, kb_id: str) -> Path:
+        if self._snapshot_dir is None:
+            raise RuntimeError("RAG snapshot directory is not configured")
+        path = self._snapshot_dir / kb_id
+        vector_store = self._vector_stores.get(kb_id)
+        write_segment(
+            path,
+            kb=self._knowledge_bases[kb_id],
+            documents=[(doc, self._document_text(kb_id, doc)) for doc in self._documents[kb_id].values()],
+            chunks=self._chunks[kb_id],
+            index=self._indexes[kb_id],
+            acl_index=self._acl_indexes[kb_id],
+            vector_arrays=vector_store.arrays() if vector_store is not None else {},
+        )
+        return path
+
+    def load_snapshots(self) -> List[str]:
+        if self._snapshot_dir is None or not self._snapshot_dir.is_dir():
+            return []
+        kb_ids = []
+        recover_segments(self._snapshot_dir)
+        for path in sorted(self._snapshot_dir.iterdir()):
+            if path.is_dir() and not is_staging_dir(path) and (path / "manifest.json").exists():
+                self.open_snapshot(path)
+                kb_ids.append(path.name)
+        logger.info("Opened %d RAG snapshots from %s", len(kb_ids), self._snapshot_dir)
+        return kb_ids
+
+    def open_snapshot(self, path: Path) -> str:
+        kb_id = path.name
+        segment = KnowledgeBaseSegment(path)
+        manifest = segment.manifest
+        documents: Dict[str, dict] = {}
+        for entry in manifest["documents"]:
+            start = entry["chunk_start"]
+            documents[entry["doc_id"]] = {
+                "doc_id": entry["doc_id"],
+                "title": entry["title"],
+                "source_uri": entry["source_uri"],
+                "page": entry["page"],
+                "acl": entry["acl"],
+                "chunk_keys": range(start, start + entry["chunk_count"]),
+                "text_span": (entry["text_offset"], entry["text_length"]),
+            }
+        self._segments[kb_id] = segment
+        self._knowledge_bases[kb_id] = manifest["kb"]
+        self._documents[kb_id] = documents
+        self._chunks[kb_id] = ChunkTable([entry["doc_id"] for entry in manifest["documents"]], segment.chunks)
+        self._indexes[kb_id] = InvertedIndex(base=segment.postings)
+        self._acl_indexes[kb_id] = AclIndex.from_state(*segment.acl_state)
+        self._versions[kb_id] = self._versions.get(kb_id, 0) + 1
+        if self._embedder is not None and self._vector_store_factory is not None:
+            vector_store = self._vector_store_factory(self._embedder.dim)
+            if segment.vector_arrays:
+                vector_store.load_arrays(segment.vector_arrays)
+            self._vector_stores[kb_id] = vector_store
+        return kb_id
+
+    def _document_text(self, kb_id: str, doc: dict) -> str:
+        if "text" in doc:
+            return doc["text"]
+        return self._segments[kb_id].text(*doc["text_span"])
+
+    def _retrieve(
+        self, kb_id: str, index: InvertedIndex, query: str, top_k: int, allowed: bytes
+    ) -> List[tuple[float, int]]:
+        vector_store = self._vector_stores.get(kb_id)
+        if vector_store is None:
+            return index.search(query, top_k, allowed)
+        candidate_k = max(top_k * 4, 20)
+        lexical = index.search(query, candidate_k, allowed)
+        dense = [
+            hit
+            for hit in vector_store.search(self._embedder.embed(query), candidate_k, allowed)
+            if hit[0] > self._dense_min_score
+        ]
+        overlap = index.overlap_mask(query, np.array([key for _, key in dense], dtype=np.int64))
+        dense = [hit for hit, shared in zip(dense, overlap) if shared or hit[0] >= self._dense_only_min_score]
+        return reciprocal_rank_fusion([lexical, dense], top_k)
+
+    def _snippet_span(self, text: str, start: int, end: int, terms: set[str]) -> tuple[int, int]:
+        if end - start <= self._snippet_length:
+            return start, end
+        lowered = text[start:end].lower()
+        positions = [pos for pos in (lowered.find(term) for term in terms) if pos != -1]
+        if positions:
+            start = max(start, min(end - self._snippet_length, start + min(positions) - self._snippet_length // 4))
+        return start, start + self._snippet_length
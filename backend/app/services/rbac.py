@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Optional, Pattern
+
+
+class PermissionDenied(PermissionError):
+    pass
+
+
+def _wildcard_regex(permission: str) -> str:
+    parts = permission.split("*")
+    body = ""
+    for index, part in enumerate(parts):
+        body += re.escape(part)
+        if index < len(parts) - 1:
+            body += ".*" if index == len(parts) - 2 and not parts[-1] else "[^:]*"
+    return body
+
+
+class PermissionSet:
+    def __init__(self, permissions: Iterable[str]) -> None:
+        self.permissions = frozenset(permissions)
+        self._exact = frozenset(permission for permission in self.permissions if "*" not in permission)
+        wildcards = sorted(permission for permission in self.permissions if "*" in permission)
+        self._pattern: Optional[Pattern[str]] = (
+            re.compile("|".join(f"(?:{_wildcard_regex(permission)})" for permission in wildcards))
+            if wildcards
+            else None
+        )
+        self._checked: Dict[str, bool] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.permissions)
+
+    def allows(self, required: str) -> bool:
+        if required in self._exact:
+            return True
+        if self._pattern is None:
+            return False
+        allowed = self._checked.get(required)
+        if allowed is None:
+            allowed = self._checked[required] = self._pattern.fullmatch(required) is not None
+        return allowed
+
+    def allows_all(self, required: Iterable[str]) -> bool:
+        return all(self.allows(permission) for permission in required)
+
+    def missing(self, required: Iterable[str]) -> list[str]:
+        return [permission for permission in required if not self.allows(permission)]
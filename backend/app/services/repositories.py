@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.schemas import AssetResponse
+
+
+PUBLISHED = "published"
+
+
+class AssetConflict(ValueError):
+    pass
+
+
+def version_key(version: str) -> Tuple[Tuple[int, int, str], ...]:
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"[.\-+]", version))
+
+
+def latest_published(assets: Iterable[AssetResponse]) -> Optional[AssetResponse]:
+    published = [asset for asset in assets if asset.status == PUBLISHED]
+    return max(published, key=lambda asset: version_key(asset.version)) if published else None
+
+
+class AssetRepository:
+    async def add(self, asset: AssetResponse) -> None:
+        raise NotImplementedError
+
+    async def get(self, tenant_id: str, asset_id: str) -> Optional[AssetResponse]:
+        raise NotImplementedError
+
+    async def find(self, tenant_id: str, asset_type: str, name: str, version: str) -> Optional[AssetResponse]:
+        raise NotImplementedError
+
+    async def latest_published(self, tenant_id: str, asset_type: str, name: str) -> Optional[AssetResponse]:
+        raise NotImplementedError
+
+    async def set_status(self, tenant_id: str, asset_id: str, status: str) -> Optional[AssetResponse]:
+        raise NotImplementedError
+
+    async def list(
+        self,
+        tenant_id: str,
+        asset_type: Optional[str] = None,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[AssetResponse], Optional[str]]:
+        raise NotImplementedError
+
+    async def revision(self, tenant_id: str) -> str:
+        raise NotImplementedError
+
+
+class _TenantCatalog:
+    def __init__(self) -> None:
+        self.rows: List[AssetResponse] = []
+        self.seq_by_id: Dict[str, int] = {}
+        self.by_key: Dict[Tuple[str, str, str], int] = {}
+        self.indexes: Dict[Tuple[str, Any], List[int]] = {}
+        self.latest: Dict[Tuple[str, str], int] = {}
+        self.revision = 0
+
+    def index(self, field: str, value: Any, seq: int) -> None:
+        insort(self.indexes.setdefault((field, value), []), seq)
+
+    def unindex(self, field: str, value: Any, seq: int) -> None:
+        seqs = self.indexes.get((field, value), [])
+        position = bisect_left(seqs, seq)
+        if position < len(seqs) and seqs[position] == seq:
+            del seqs[position]
+
+    def refresh_latest(self, asset_type: str, name: str) -> None:
+        versions = [self.rows[seq] for seq in self.indexes.get(("name", (asset_type, name)), [])]
+        latest = latest_published(versions)
+        if latest is None:
+            self.latest.pop((asset_type, name), None)
+        else:
+            self.latest[(asset_type, name)] = self.seq_by_id[latest.id]
+
+
+class InMemoryAssetRepository(AssetRepository):
+    def __init__(self) -> None:
+        self._tenants: Dict[str, _TenantCatalog] = {}
+
+    def _catalog(self, tenant_id: str) -> _TenantCatalog:
+        catalog = self._tenants.get(tenant_id)
+        if catalog is None:
+            catalog = self._tenants[tenant_id] = _TenantCatalog()
+        return catalog
+
+    async def add(self, asset: AssetResponse) -> None:
+        catalog = self._catalog(asset.tenant_id)
+        key = (asset.asset_type, asset.name, asset.version)
+        if key in catalog.by_key:
+            raise AssetConflict(f"Asset {asset.asset_type}/{asset.name}@{asset.version} already exists")
+        seq = len(catalog.rows)
+        catalog.rows.append(asset)
+        catalog.seq_by_id[asset.id] = seq
+        catalog.by_key[key] = seq
+        catalog.index("type", asset.asset_type, seq)
+        catalog.index("name", (asset.asset_type, asset.name), seq)
+        catalog.index("status", asset.status, seq)
+        if asset.status == PUBLISHED:
+            catalog.refresh_latest(asset.asset_type, asset.name)
+        catalog.revision += 1
+
+    async def get(self, tenant_id: str, asset_id: str) -> Optional[AssetResponse]:
+        catalog = self._tenants.get(tenant_id)
+        if catalog is None or asset_id not in catalog.seq_by_id:
+            return None
+        return catalog.rows[catalog.seq_by_id[asset_id]]
+
+    async def find(self, tenant_id: str, asset_type: str, name: str, version: str) -> Optional[AssetResponse]:
+        catalog = self._tenants.get(tenant_id)
+        seq = catalog.by_key.get((asset_type, name, version)) if catalog else None
+        return catalog.rows[seq] if seq is not None else None
+
+    async def latest_published(self, tenant_id: str, asset_type: str, name: str) -> Optional[AssetResponse]:
+        catalog = self._tenants.get(tenant_id)
+        seq = catalog.latest.get((asset_type, name)) if catalog else None
+        return catalog.rows[seq] if seq is not None else None
+
+    async def set_status(self, tenant_id: str, asset_id: str, status: str) -> Optional[AssetResponse]:
+        catalog = self._tenants.get(tenant_id)
+        if catalog is None or asset_id not in catalog.seq_by_id:
+            return None
+        seq = catalog.seq_by_id[asset_id]
+        asset = catalog.rows[seq]
+        updated = asset.model_copy(update={"status": status, "updated_at": datetime.utcnow()})
+        catalog.rows[seq] = updated
+        catalog.unindex("status", asset.status, seq)
+        catalog.index("status", status, seq)
+        if PUBLISHED in (asset.status, status):
+            catalog.refresh_latest(asset.asset_type, asset.name)
+        catalog.revision += 1
+        return updated
+
+    async def list(
+        self,
+        tenant_id: str,
+        asset_type: Optional[str] = None,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[AssetResponse], Optional[str]]:
+        catalog = self._tenants.get(tenant_id)
+        if catalog is None:
+            return [], None
+        start = int(cursor) + 1 if cursor else 0
+        candidates: List[List[int]] = []
+        if asset_type is not None and name is not None:
+            candidates.append(catalog.indexes.get(("name", (asset_type, name)), []))
+        elif asset_type is not None:
+            candidates.append(catalog.indexes.get(("type", asset_type), []))
+        if status is not None:
+            candidates.append(catalog.indexes.get(("status", status), []))
+        if candidates:
+            seqs = min(candidates, key=len)
+            scan: Iterable[int] = seqs[bisect_left(seqs, start) :]
+        else:
+            scan = range(start, len(catalog.rows))
+
+        items: List[AssetResponse] = []
+        last_seq = -1
+        for seq in scan:
+            asset = catalog.rows[seq]
+            if (
+                (asset_type is not None and asset.asset_type != asset_type)
+                or (name is not None and asset.name != name)
+                or (status is not None and asset.status != status)
+            ):
+                continue
+            if len(items) == limit:
+                return items, str(last_seq)
+            items.append(asset)
+            last_seq = seq
+        return items, None
+
+    async def revision(self, tenant_id: str) -> str:
+        catalog = self._tenants.get(tenant_id)
+        return str(catalog.revision) if catalog else "0"
+
+
+class AdminRepository:
+    async def upsert_role(self, role_name: str, permissions: List[str]) -> None:
+        raise NotImplementedError
+
+    async def upsert_user(self, user_id: str, tenant_id: str, roles: List[str]) -> None:
+        raise NotImplementedError
+
+    async def user_roles(self, user_id: str) -> List[str]:
+        raise NotImplementedError
+
+    async def role_permissions(self, roles: List[str]) -> Dict[str, List[str]]:
+        raise NotImplementedError
+
+
+class InMemoryAdminRepository(AdminRepository):
+    def __init__(self) -> None:
+        self._roles: Dict[str, List[str]] = {}
+        self._users: Dict[str, List[str]] = {}
+
+    async def upsert_role(self, role_name: str, permissions: List[str]) -> None:
+        self._roles[role_name] = permissions
+
+    async def upsert_user(self, user_id: str, tenant_id: str, roles: List[str]) -> None:
+        self._users[user_id] = roles
+
+    async def user_roles(self, user_id: str) -> List[str]:
+        return list(self._users.get(user_id, []))
+
+    async def role_permissions(self, roles: List[str]) -> Dict[str, List[str]]:
+        return {role: list(self._roles[role]) for role in roles if role in self._roles}
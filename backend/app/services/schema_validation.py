@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List
+
+Validator = Callable[[Any, str], None]
+CompiledSchema = Callable[[Any], None]
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+ANNOTATION_KEYWORDS = frozenset({"$schema", "$id", "$comment", "title", "description", "default", "examples", "format"})
+SUPPORTED_KEYWORDS = ANNOTATION_KEYWORDS | frozenset(
+    {
+        "type",
+        "enum",
+        "const",
+        "required",
+        "properties",
+        "additionalProperties",
+        "minItems",
+        "maxItems",
+        "items",
+        "minLength",
+        "maxLength",
+        "pattern",
+        "minimum",
+        "maximum",
+        "exclusiveMinimum",
+        "exclusiveMaximum",
+        "allOf",
+        "anyOf",
+        "oneOf",
+    }
+)
+
+
+def _noop(value: Any, path: str) -> None:
+    return None
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    validate = _compile(schema or {})
+
+    def run(value: Any) -> None:
+        validate(value, "$")
+
+    return run
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    if not isinstance(schema, dict):
+        raise ValueError(f"Schema must be an object, got {type(schema).__name__}")
+    unsupported = sorted(set(schema) - SUPPORTED_KEYWORDS)
+    if unsupported:
+        raise ValueError(f"Unsupported schema keywords: {unsupported}")
+    if "items" in schema and not isinstance(schema["items"], dict):
+        raise ValueError("Schema items must be a single schema object")
+    checks: List[Validator] = []
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        unknown = [name for name in names if name not in _TYPE_CHECKS]
+        if unknown:
+            raise ValueError(f"Unsupported schema type: {unknown}")
+        type_checks = [_TYPE_CHECKS[name] for name in names]
+        expected = " or ".join(names)
+
+        def check_type(value: Any, path: str) -> None:
+            if not any(check(value) for check in type_checks):
+                raise ValueError(f"{path}: expected {expected}, got {type(value).__name__}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value: Any, path: str) -> None:
+            if value not in allowed:
+                raise ValueError(f"{path}: must be one of {allowed}")
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        constant = schema["const"]
+
+        def check_const(value: Any, path: str) -> None:
+            if value != constant:
+                raise ValueError(f"{path}: must equal {constant!r}")
+
+        checks.append(check_const)
+
+    checks.extend(_compile_object(schema))
+    checks.extend(_compile_array(schema))
+    checks.extend(_compile_scalar(schema))
+
+    for keyword in ("allOf", "anyOf", "oneOf"):
+        if keyword in schema:
+            checks.append(_compile_combinator(keyword, [_compile(sub) for sub in schema[keyword]]))
+
+    if not checks:
+        return _noop
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value: Any, path: str) -> None:
+        for check in checks:
+            check(value, path)
+
+    return validate
+
+
+def _compile_object(schema: Dict[str, Any]) -> List[Validator]:
+    checks: List[Validator] = []
+    required = list(schema.get("required", []))
+    properties = {name: _compile(sub) for name, sub in schema.get("properties", {}).items()}
+    additional = schema.get("additionalProperties", True)
+
+    if required:
+
+        def check_required(value: Any, path: str) -> None:
+            if isinstance(value, dict):
+                for field in required:
+                    if field not in value:
+                        raise ValueError(f"Missing required field: {path}.{field}")
+
+        checks.append(check_required)
+
+    if properties:
+        property_items = [(name, validator) for name, validator in properties.items() if validator is not _noop]
+
+        def check_properties(value: Any, path: str) -> None:
+            if isinstance(value, dict):
+                for name, validator in property_items:
+                    if name in value:
+                        validator(value[name], f"{path}.{name}")
+
+        if property_items:
+            checks.append(check_properties)
+
+    if additional is not True:
+        extra_validator = _compile(additional) if isinstance(additional, dict) else None
+        known = set(properties)
+
+        def check_additional(value: Any, path: str) -> None:
+            if not isinstance(value, dict):
+                return
+            for name in value.keys() - known:
+                if extra_validator is None:
+                    raise ValueError(f"{path}: unexpected field {name!r}")
+                extra_validator(value[name], f"{path}.{name}")
+
+        checks.append(check_additional)
+
+    return checks
+
+
+def _compile_array(schema: Dict[str, Any]) -> List[Validator]:
+    checks: List[Validator] = []
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+
+    if min_items is not None or max_items is not None:
+
+        def check_length(value: Any, path: str) -> None:
+            if isinstance(value, list):
+                if min_items is not None and len(value) < min_items:
+                    raise ValueError(f"{path}: expected at least {min_items} items")
+                if max_items is not None and len(value) > max_items:
+                    raise ValueError(f"{path}: expected at most {max_items} items")
+
+        checks.append(check_length)
+
+    if "items" in schema:
+        item_validator = _compile(schema["items"])
+        if item_validator is not _noop:
+
+            def check_items(value: Any, path: str) -> None:
+                if isinstance(value, list):
+                    for index, item in enumerate(value):
+                        item_validator(item, f"{path}[{index}]")
+
+            checks.append(check_items)
+
+    return checks
+
+
+def _compile_scalar(schema: Dict[str, Any]) -> List[Validator]:
+    checks: List[Validator] = []
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    bounds = [
+        (schema.get("minimum"), lambda value, bound: value >= bound, ">="),
+        (schema.get("maximum"), lambda value, bound: value <= bound, "<="),
+        (schema.get("exclusiveMinimum"), lambda value, bound: value > bound, ">"),
+        (schema.get("exclusiveMaximum"), lambda value, bound: value < bound, "<"),
+    ]
+    bounds = [bound for bound in bounds if bound[0] is not None]
+
+    if min_length is not None or max_length is not None or pattern is not None:
+
+        def check_string(value: Any, path: str) -> None:
+            if not isinstance(value, str):
+                return
+            if min_length is not None and len(value) < min_length:
+                raise ValueError(f"{path}: shorter than {min_length} characters")
+            if max_length is not None and len(value) > max_length:
+                raise ValueError(f"{path}: longer than {max_length} characters")
+            if pattern is not None and not pattern.search(value):
+                raise ValueError(f"{path}: does not match {pattern.pattern!r}")
+
+        checks.append(check_string)
+
+    if bounds:
+
+        def check_bounds(value: Any, path: str) -> None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return
+            for bound, accepts, operator in bounds:
+                if not accepts(value, bound):
+                    raise ValueError(f"{path}: must be {operator} {bound}")
+
+        checks.append(check_bounds)
+
+    return checks
+
+
+def _compile_combinator(keyword: str, validators: List[Validator]) -> Validator:
+    def matches(validator: Validator, value: Any, path: str) -> bool:
+        try:
+            validator(value, path)
+        except ValueError:
+            return False
+        return True
+
+    if keyword == "allOf":
+
+        def check_all(value: Any, path: str) -> None:
+            for validator in validators:
+                validator(value, path)
+
+        return check_all
+
+    if keyword == "anyOf":
+
+        def check_any(value: Any, path: str) -> None:
+            if not any(matches(validator, value, path) for validator in validators):
+                raise ValueError(f"{path}: does not match any allowed schema")
+
+        return check_any
+
+    def check_one(value: Any, path: str) -> None:
+        if sum(matches(validator, value, path) for validator in validators) != 1:
+            raise ValueError(f"{path}: must match exactly one schema")
+
+    return check_one
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from app.models.db import (
+    AssetLatestRecord,
+    AssetRecord,
+    AssetRevisionRecord,
+    AuditLogRecord,
+    PolicyEventRecord,
+    RoleRecord,
+    ToolRunRecord,
+    UserRecord,
+)
+from app.models.schemas import AssetResponse, ToolRunResult
+from app.observability.event_log import EventSink
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.services.repositories import (
+    PUBLISHED,
+    AdminRepository,
+    AssetConflict,
+    AssetRepository,
+    latest_published,
+)
+from app.services.tool_run_store import ToolRunStore
+
+
+def _upsert(session: Any, model: Any, values: Dict[str, Any], keys: List[str]) -> Any:
+    statement = _insert(session)(model).values(**values)
+    updates = {name: value for name, value in values.items() if name not in keys}
+    return statement.on_conflict_do_update(index_elements=keys, set_=updates)
+
+
+def _insert(session: Any) -> Any:
+    return pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+
+
+def _asset_response(record: AssetRecord) -> AssetResponse:
+    return AssetResponse(
+        id=record.id,
+        tenant_id=record.tenant_id,
+        asset_type=record.asset_type,
+        name=record.name,
+        version=record.version,
+        payload=record.payload,
+        status=record.status,
+        updated_at=record.updated_at,
+    )
+
+
+def _encode_cursor(record: AssetRecord) -> str:
+    return f"{record.created_at.isoformat()}|{record.id}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    created_at, _, asset_id = cursor.partition("|")
+    if not asset_id:
+        raise ValueError("Invalid cursor")
+    return datetime.fromisoformat(created_at), asset_id
+
+
+class SqlAssetRepository(AssetRepository):
+    def __init__(self, session_factory: Any) -> None:
+        self._session_factory = session_factory
+
+    async def add(self, asset: AssetResponse) -> None:
+        try:
+            async with self._session_factory() as session, session.begin():
+                session.add(AssetRecord(**asset.model_dump()))
+                await session.flush()
+                if asset.status == PUBLISHED:
+                    await self._refresh_latest(session, asset.tenant_id, asset.asset_type, asset.name)
+                await self._bump_revision(session, asset.tenant_id)
+        except IntegrityError as exc:
+            raise AssetConflict(f"Asset {asset.asset_type}/{asset.name}@{asset.version} already exists") from exc
+
+    async def get(self, tenant_id: str, asset_id: str) -> Optional[AssetResponse]:
+        async with self._session_factory() as session:
+            record = await session.get(AssetRecord, asset_id)
+        return _asset_response(record) if record and record.tenant_id == tenant_id else None
+
+    async def find(self, tenant_id: str, asset_type: str, name: str, version: str) -> Optional[AssetResponse]:
+        async with self._session_factory() as session:
+            record = await session.scalar(
+                select(AssetRecord).where(
+                    AssetRecord.tenant_id == tenant_id,
+                    AssetRecord.asset_type == asset_type,
+                    AssetRecord.name == name,
+                    AssetRecord.version == version,
+                )
+            )
+        return _asset_response(record) if record else None
+
+    async def latest_published(self, tenant_id: str, asset_type: str, name: str) -> Optional[AssetResponse]:
+        async with self._session_factory() as session:
+            record = await session.scalar(
+                select(AssetRecord)
+                .join(AssetLatestRecord, AssetLatestRecord.asset_id == AssetRecord.id)
+                .where(
+                    AssetLatestRecord.tenant_id == tenant_id,
+                    AssetLatestRecord.asset_type == asset_type,
+                    AssetLatestRecord.name == name,
+                )
+            )
+        return _asset_response(record) if record else None
+
+    async def set_status(self, tenant_id: str, asset_id: str, status: str) -> Optional[AssetResponse]:
+        async with self._session_factory() as session, session.begin():
+            record = await session.get(AssetRecord, asset_id)
+            if record is None or record.tenant_id != tenant_id:
+                return None
+            previous = record.status
+            record.status = status
+            record.updated_at = datetime.utcnow()
+            await session.flush()
+            if PUBLISHED in (previous, status):
+                await self._refresh_latest(session, tenant_id, record.asset_type, record.name)
+            await self._bump_revision(session, tenant_id)
+            return _asset_response(record)
+
+    async def list(
+        self,
+        tenant_id: str,
+        asset_type: Optional[str] = None,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[AssetResponse], Optional[str]]:
+        query = select(AssetRecord).where(AssetRecord.tenant_id == tenant_id)
+        if asset_type is not None:
+            query = query.where(AssetRecord.asset_type == asset_type)
+        if name is not None:
+            query = query.where(AssetRecord.name == name)
+        if status is not None:
+            query = query.where(AssetRecord.status == status)
+        if cursor:
+            created_at, asset_id = _decode_cursor(cursor)
+            query = query.where(
+                or_(
+                    AssetRecord.created_at > created_at,
+                    and_(AssetRecord.created_at == created_at, AssetRecord.id > asset_id),
+                )
+            )
+        query = query.order_by(AssetRecord.created_at, AssetRecord.id).limit(limit + 1)
+        async with self._session_factory() as session:
+            records = list(await session.scalars(query))
+        next_cursor = _encode_cursor(records[limit - 1]) if len(records) > limit else None
+        return [_asset_response(record) for record in records[:limit]], next_cursor
+
+    async def revision(self, tenant_id: str) -> str:
+        async with self._session_factory() as session:
+            revision = await session.scalar(
+                select(AssetRevisionRecord.revision).where(AssetRevisionRecord.tenant_id == tenant_id)
+            )
+        return str(revision or 0)
+
+    async def _refresh_latest(self, session: Any, tenant_id: str, asset_type: str, name: str) -> None:
+        records = await session.scalars(
+            select(AssetRecord).where(
+                AssetRecord.tenant_id == tenant_id,
+                AssetRecord.asset_type == asset_type,
+                AssetRecord.name == name,
+                AssetRecord.status == PUBLISHED,
+            )
+        )
+        latest = latest_published(_asset_response(record) for record in records)
+        key = {"tenant_id": tenant_id, "asset_type": asset_type, "name": name}
+        if latest is None:
+            await session.execute(
+                delete(AssetLatestRecord).where(
+                    AssetLatestRecord.tenant_id == tenant_id,
+                    AssetLatestRecord.asset_type == asset_type,
+                    AssetLatestRecord.name == name,
+                )
+            )
+        else:
+            await session.execute(_upsert(session, AssetLatestRecord, {**key, "asset_id": latest.id}, list(key)))
+
+    async def _bump_revision(self, session: Any, tenant_id: str) -> None:
+        statement = _insert(session)(AssetRevisionRecord).values(tenant_id=tenant_id, revision=1)
+        await session.execute(
+            statement.on_conflict_do_update(index_elements=["tenant_id"], set_={"revision": AssetRevisionRecord.revision + 1})
+        )
+
+
+class SqlAdminRepository(AdminRepository):
+    def __init__(self, session_factory: Any) -> None:
+        self._session_factory = session_factory
+
+    async def upsert_role(self, role_name: str, permissions: List[str]) -> None:
+        async with self._session_factory() as session, session.begin():
+            await session.execute(
+                _upsert(session, RoleRecord, {"role_name": role_name, "permissions": permissions}, ["role_name"])
+            )
+
+    async def upsert_user(self, user_id: str, tenant_id: str, roles: List[str]) -> None:
+        async with self._session_factory() as session, session.begin():
+            values = {"user_id": user_id, "tenant_id": tenant_id, "roles": roles}
+            await session.execute(_upsert(session, UserRecord, values, ["user_id"]))
+
+    async def user_roles(self, user_id: str) -> List[str]:
+        async with self._session_factory() as session:
+            record = await session.get(UserRecord, user_id)
+        return list(record.roles) if record else []
+
+    async def role_permissions(self, roles: List[str]) -> Dict[str, List[str]]:
+        if not roles:
+            return {}
+        async with self._session_factory() as session:
+            records = await session.scalars(select(RoleRecord).where(RoleRecord.role_name.in_(roles)))
+            return {record.role_name: list(record.permissions) for record in records}
+
+
+class SqlToolRunStore(ToolRunStore):
+    def __init__(
+        self,
+        session_factory: Any,
+        ttl_s: float = 3600.0,
+        purge_interval_s: float = 60.0,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ttl = timedelta(seconds=ttl_s)
+        self._purge_interval_s = purge_interval_s
+        self._metrics = metrics or default_metrics
+        self._next_purge = 0.0
+
+    async def add(self, result: ToolRunResult) -> None:
+        async with self._session_factory() as session, session.begin():
+            await session.execute(_upsert(session, ToolRunRecord, result.model_dump(), ["action_id"]))
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + self._purge_interval_s
+                purged = await session.execute(
+                    delete(ToolRunRecord).where(ToolRunRecord.created_at < datetime.utcnow() - self._ttl)
+                )
+                if purged.rowcount:
+                    self._metrics.incr("tool.run_store.evictions", purged.rowcount, reason="ttl")
+
+    async def list_for_run(self, run_id: str) -> List[ToolRunResult]:
+        async with self._session_factory() as session:
+            records = await session.scalars(
+                select(ToolRunRecord)
+                .where(ToolRunRecord.run_id == run_id, ToolRunRecord.created_at >= datetime.utcnow() - self._ttl)
+                .order_by(ToolRunRecord.created_at)
+            )
+            return [
+                ToolRunResult(
+                    run_id=record.run_id,
+                    action_id=record.action_id,
+                    status=record.status,
+                    output=record.output,
+                    ui_state_patch=record.ui_state_patch,
+                )
+                for record in records
+            ]
+
+
+class DatabaseEventSink(EventSink):
+    def __init__(self, session_factory: Any, timeout_s: float = 30.0) -> None:
+        self._session_factory = session_factory
+        self._timeout_s = timeout_s
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def write_batch(self, stream: str, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if self._loop is None:
+            raise RuntimeError("DatabaseEventSink is not bound to an event loop")
+        future = asyncio.run_coroutine_threadsafe(self._insert(stream, records), self._loop)
+        future.result(self._timeout_s)
+
+    async def _insert(self, stream: str, records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if stream == "policy":
+            rows = [
+                PolicyEventRecord(**{**payload, "created_at": datetime.fromisoformat(payload["created_at"])})
+                for _, payload in records
+            ]
+        elif stream == "audit":
+            rows = [AuditLogRecord(**payload) for _, payload in records]
+        else:
+            raise ValueError(f"Unknown event stream: {stream}")
+        async with self._session_factory() as session, session.begin():
+            session.add_all(rows)
@@ -1,33 +1,25 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from app.services.state_store import InMemoryStateStore, StateStore
 
 
 class StateService:
-    def __init__(self) -> None:
-        self._latest_state: Dict[str, Dict[str, Any]] = {}
-        self._versions: Dict[str, int] = {}
-        self._events: Dict[str, List[Dict[str, Any]]] = {}
-
-    def apply_patch(self, session_id: str, patch: Dict[str, Any], version: int) -> Dict[str, Any]:
-        current = self._latest_state.get(session_id, {})
-        merged = {**current, **patch}
-        self._latest_state[session_id] = merged
-        self._versions[session_id] = version
-        event = {
-            "patch": patch,
-            "version": version,
-            "updated_at": datetime.utcnow(),
-        }
-        self._events.setdefault(session_id, []).append(event)
-        return event
-
-    def get_state(self, session_id: str) -> Dict[str, Any]:
-        return self._latest_state.get(session_id, {})
-
-    def get_version(self, session_id: str) -> int:
-        return self._versions.get(session_id, 0)
-
-    def events(self, session_id: str) -> List[Dict[str, Any]]:
-        return list(self._events.get(session_id, []))
+    def __init__(self, store: Optional[StateStore] = None) -> None:
+        self._store = store or InMemoryStateStore()
+
+    async def apply_patch(self, session_id: str, patch: Dict[str, Any], version: int) -> Dict[str, Any]:
+        return await self._store.apply(session_id, patch, version)
+
+    async def get_state(self, session_id: str) -> Dict[str, Any]:
+        return (await self._store.get(session_id))[0]
+
+    async def get_version(self, session_id: str) -> int:
+        return (await self._store.get(session_id))[1]
+
+    async def get_state_at(self, session_id: str, version: int) -> Dict[str, Any]:
+        return await self._store.state_at(session_id, version)
+
+    async def events(self, session_id: str) -> List[Dict[str, Any]]:
+        return await self._store.history(session_id)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Tuple
+
+
+class StateVersionConflict(Exception):
+    def __init__(self, session_id: str, version: int, current: int) -> None:
+        super().__init__(
+            f"Cannot apply state version {version} to session {session_id}; expected version {current + 1}"
+        )
+        self.current_version = current
+
+
+def check_patch(patch: Any) -> None:
+    if not isinstance(patch, dict):
+        raise ValueError("UI state patch must be an object")
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    if not isinstance(patch, dict):
+        return patch
+    merged = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict):
+            merged[key] = merge_patch(merged.get(key), value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def replay(base: Dict[str, Any], base_version: int, events: List[Dict[str, Any]], version: int) -> Dict[str, Any]:
+    state = base
+    for event in events:
+        if base_version < event["version"] <= version:
+            state = merge_patch(state, event["patch"])
+    return state
+
+
+class StateStore:
+    async def apply(self, session_id: str, patch: Dict[str, Any], version: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def get(self, session_id: str) -> Tuple[Dict[str, Any], int]:
+        raise NotImplementedError
+
+    async def history(self, session_id: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def state_at(self, session_id: str, version: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+@dataclass
+class _Session:
+    history: Deque[Dict[str, Any]]
+    state: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0
+    snapshots: Deque[Tuple[int, Dict[str, Any]]] = field(default_factory=lambda: deque([(0, {})]))
+
+
+class InMemoryStateStore(StateStore):
+    def __init__(self, history_limit: int = 100, snapshot_interval: int = 20) -> None:
+        self._history_limit = history_limit
+        self._snapshot_interval = snapshot_interval
+        self._sessions: Dict[str, _Session] = {}
+
+    async def apply(self, session_id: str, patch: Dict[str, Any], version: int) -> Dict[str, Any]:
+        check_patch(patch)
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session(history=deque(maxlen=self._history_limit))
+        if version != session.version + 1:
+            raise StateVersionConflict(session_id, version, session.version)
+        session.state = merge_patch(session.state, patch)
+        session.version += 1
+        event = {"patch": patch, "version": session.version, "updated_at": datetime.utcnow()}
+        session.history.append(event)
+        if session.version % self._snapshot_interval == 0:
+            session.snapshots.append((session.version, session.state))
+        oldest = session.history[0]["version"] - 1
+        while session.snapshots and session.snapshots[0][0] < oldest:
+            session.snapshots.popleft()
+        return event
+
+    async def get(self, session_id: str) -> Tuple[Dict[str, Any], int]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return {}, 0
+        return session.state, session.version
+
+    async def history(self, session_id: str) -> List[Dict[str, Any]]:
+        session = self._sessions.get(session_id)
+        return list(session.history) if session else []
+
+    async def state_at(self, session_id: str, version: int) -> Dict[str, Any]:
+        session = self._sessions.get(session_id)
+        current = session.version if session else 0
+        if version == current:
+            return session.state if session else {}
+        candidates = [entry for entry in session.snapshots if entry[0] <= version] if session else []
+        if version > current or not candidates:
+            raise KeyError(f"State version {version} is not retained for session {session_id}")
+        base_version, base = candidates[-1]
+        return replay(base, base_version, list(session.history), version)
+
+
+class RedisStateStore(StateStore):
+    def __init__(
+        self,
+        client: Any,
+        history_limit: int = 100,
+        snapshot_interval: int = 20,
+        ttl_s: float = 86400.0,
+        prefix: str = "fabrix:state:",
+    ) -> None:
+        self._client = client
+        self._history_limit = history_limit
+        self._snapshot_interval = snapshot_interval
+        self._ttl_s = int(ttl_s)
+        self._prefix = prefix
+
+    def _keys(self, session_id: str) -> Tuple[str, str, str]:
+        base = self._prefix + session_id
+        return f"{base}:state", f"{base}:history", f"{base}:snapshots"
+
+    async def apply(self, session_id: str, patch: Dict[str, Any], version: int) -> Dict[str, Any]:
+        from redis.exceptions import WatchError
+
+        check_patch(patch)
+        state_key, history_key, snapshot_key = self._keys(session_id)
+        async with self._client.pipeline() as pipe:
+            try:
+                await pipe.watch(state_key)
+                raw_version, raw_state = await pipe.hmget(state_key, "version", "state")
+                current = int(raw_version or 0)
+                if version != current + 1:
+                    raise StateVersionConflict(session_id, version, current)
+                state = merge_patch(json.loads(raw_state) if raw_state else {}, patch)
+                event = {"patch": patch, "version": version, "updated_at": datetime.utcnow()}
+                pipe.multi()
+                pipe.hset(state_key, mapping={"version": version, "state": json.dumps(state)})
+                pipe.rpush(history_key, json.dumps(event, default=str))
+                pipe.ltrim(history_key, -self._history_limit, -1)
+                if version % self._snapshot_interval == 0:
+                    pipe.hset(snapshot_key, str(version), json.dumps(state))
+                    stale = [
+                        key
+                        for key in await self._client.hkeys(snapshot_key)
+                        if int(key) < version - self._history_limit
+                    ]
+                    if stale:
+                        pipe.hdel(snapshot_key, *stale)
+                for key in (state_key, history_key, snapshot_key):
+                    pipe.expire(key, self._ttl_s)
+                await pipe.execute()
+            except WatchError:
+                current = int(await self._client.hget(state_key, "version") or 0)
+                raise StateVersionConflict(session_id, version, current)
+        return event
+
+    async def get(self, session_id: str) -> Tuple[Dict[str, Any], int]:
+        raw_version, raw_state = await self._client.hmget(self._keys(session_id)[0], "version", "state")
+        return (json.loads(raw_state) if raw_state else {}), int(raw_version or 0)
+
+    async def history(self, session_id: str) -> List[Dict[str, Any]]:
+        events = [json.loads(raw) for raw in await self._client.lrange(self._keys(session_id)[1], 0, -1)]
+        for event in events:
+            event["updated_at"] = datetime.fromisoformat(event["updated_at"])
+        return events
+
+    async def state_at(self, session_id: str, version: int) -> Dict[str, Any]:
+        state, current = await self.get(session_id)
+        if version == current:
+            return state
+        events = await self.history(session_id)
+        snapshots = {int(key): raw for key, raw in (await self._client.hgetall(self._keys(session_id)[2])).items()}
+        snapshots[0] = "{}"
+        oldest = events[0]["version"] - 1 if events else current
+        candidates = [snapshot for snapshot in snapshots if oldest <= snapshot <= version]
+        if version > current or not candidates:
+            raise KeyError(f"State version {version} is not retained for session {session_id}")
+        base_version = max(candidates)
+        return replay(json.loads(snapshots[base_version]), base_version, events, version)
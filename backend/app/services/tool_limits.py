@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.schemas import ToolRunRequest
+
+
+class RateLimitExceeded(RuntimeError):
+    pass
+
+
+class RateLimiter:
+    async def acquire(self, tenant_id: str, tool: str, capacity: int, refill_per_s: float) -> bool:
+        raise NotImplementedError
+
+
+class TokenBucketLimiter(RateLimiter):
+    def __init__(self) -> None:
+        self._buckets: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+    async def acquire(self, tenant_id: str, tool: str, capacity: int, refill_per_s: float) -> bool:
+        now = time.monotonic()
+        key = (tenant_id, tool)
+        tokens, updated = self._buckets.get(key, (float(capacity), now))
+        tokens = min(float(capacity), tokens + (now - updated) * refill_per_s)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self._buckets[key] = (tokens, now)
+        return allowed
+
+
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+if rate > 0 then
+  redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+end
+return allowed
+"""
+
+
+_EXPIRE_PENDING_LUA = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local expired = {}
+for _, id in ipairs(ids) do
+  redis.call('ZREM', KEYS[1], id)
+  local raw = redis.call('HGET', KEYS[2], id)
+  if raw then
+    redis.call('HDEL', KEYS[2], id)
+    table.insert(expired, raw)
+  end
+end
+return expired
+"""
+
+
+class RedisTokenBucketLimiter(RateLimiter):
+    def __init__(self, client: Any, prefix: str = "fabrix:rate:") -> None:
+        self._prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def acquire(self, tenant_id: str, tool: str, capacity: int, refill_per_s: float) -> bool:
+        key = f"{self._prefix}{tenant_id}:{tool}"
+        return bool(await self._script(keys=[key], args=[capacity, refill_per_s]))
+
+
+class PendingActionTracker:
+    async def track(self, action: ToolRunRequest, timeout_ms: int) -> None:
+        raise NotImplementedError
+
+    async def get(self, action_id: str) -> Optional[ToolRunRequest]:
+        raise NotImplementedError
+
+    async def resolve(self, action_id: str) -> None:
+        raise NotImplementedError
+
+    async def expire(self) -> List[ToolRunRequest]:
+        return []
+
+
+class InMemoryPendingActionTracker(PendingActionTracker):
+    def __init__(self) -> None:
+        self._pending: Dict[str, Tuple[float, ToolRunRequest]] = {}
+        self._deadlines: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def track(self, action: ToolRunRequest, timeout_ms: int) -> None:
+        deadline = time.monotonic() + timeout_ms / 1000
+        self._pending[action.action_id] = (deadline, action)
+        heapq.heappush(self._deadlines, (deadline, action.action_id))
+
+    async def get(self, action_id: str) -> Optional[ToolRunRequest]:
+        entry = self._pending.get(action_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    async def resolve(self, action_id: str) -> None:
+        self._pending.pop(action_id, None)
+
+    async def expire(self) -> List[ToolRunRequest]:
+        now = time.monotonic()
+        expired: List[ToolRunRequest] = []
+        while self._deadlines and self._deadlines[0][0] < now:
+            deadline, action_id = heapq.heappop(self._deadlines)
+            entry = self._pending.get(action_id)
+            if entry is not None and entry[0] == deadline:
+                del self._pending[action_id]
+                expired.append(entry[1])
+        return expired
+
+
+class RedisPendingActionTracker(PendingActionTracker):
+    def __init__(self, client: Any, prefix: str = "fabrix:pending:", expire_batch: int = 500) -> None:
+        self._client = client
+        self._actions_key = prefix + "actions"
+        self._deadlines_key = prefix + "deadlines"
+        self._expire_batch = expire_batch
+        self._expire_script = client.register_script(_EXPIRE_PENDING_LUA)
+
+    async def track(self, action: ToolRunRequest, timeout_ms: int) -> None:
+        pipe = self._client.pipeline()
+        pipe.hset(self._actions_key, action.action_id, action.model_dump_json())
+        pipe.zadd(self._deadlines_key, {action.action_id: time.time() + timeout_ms / 1000})
+        await pipe.execute()
+
+    async def get(self, action_id: str) -> Optional[ToolRunRequest]:
+        pipe = self._client.pipeline()
+        pipe.hget(self._actions_key, action_id)
+        pipe.zscore(self._deadlines_key, action_id)
+        raw, deadline = await pipe.execute()
+        if raw is None or deadline is None or deadline < time.time():
+            return None
+        return ToolRunRequest.model_validate_json(raw)
+
+    async def resolve(self, action_id: str) -> None:
+        pipe = self._client.pipeline()
+        pipe.hdel(self._actions_key, action_id)
+        pipe.zrem(self._deadlines_key, action_id)
+        await pipe.execute()
+
+    async def expire(self) -> List[ToolRunRequest]:
+        expired = await self._expire_script(
+            keys=[self._deadlines_key, self._actions_key], args=[time.time(), self._expire_batch]
+        )
+        return [ToolRunRequest.model_validate_json(raw) for raw in expired]
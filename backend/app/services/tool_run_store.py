@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.schemas import ToolRunResult
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+
+
+class ToolRunStore:
+    async def add(self, result: ToolRunResult) -> None:
+        raise NotImplementedError
+
+    async def list_for_run(self, run_id: str) -> List[ToolRunResult]:
+        raise NotImplementedError
+
+
+class InMemoryToolRunStore(ToolRunStore):
+    def __init__(
+        self,
+        max_runs: int = 10_000,
+        ttl_s: float = 3600.0,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._max_runs = max_runs
+        self._ttl_s = ttl_s
+        self._metrics = metrics or default_metrics
+        self._runs: "OrderedDict[str, Tuple[float, Dict[str, ToolRunResult]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    async def add(self, result: ToolRunResult) -> None:
+        now = time.monotonic()
+        entry = self._runs.pop(result.run_id, None)
+        results = entry[1] if entry else {}
+        results[result.action_id] = result
+        self._runs[result.run_id] = (now + self._ttl_s, results)
+        self._evict(now)
+
+    async def list_for_run(self, run_id: str) -> List[ToolRunResult]:
+        entry = self._runs.get(run_id)
+        if entry is None:
+            return []
+        if entry[0] < time.monotonic():
+            del self._runs[run_id]
+            self._metrics.incr("tool.run_store.evictions", reason="ttl")
+            return []
+        return list(entry[1].values())
+
+    def _evict(self, now: float) -> None:
+        while self._runs:
+            run_id, (expires_at, _) = next(iter(self._runs.items()))
+            if expires_at >= now and len(self._runs) <= self._max_runs:
+                break
+            del self._runs[run_id]
+            self._metrics.incr("tool.run_store.evictions", reason="ttl" if expires_at < now else "size")
+
+
+class RedisToolRunStore(ToolRunStore):
+    def __init__(self, client: Any, ttl_s: float = 3600.0, prefix: str = "fabrix:tool_runs:") -> None:
+        self._client = client
+        self._ttl_s = int(ttl_s)
+        self._prefix = prefix
+
+    async def add(self, result: ToolRunResult) -> None:
+        key = self._prefix + result.run_id
+        pipe = self._client.pipeline()
+        pipe.hset(key, result.action_id, result.model_dump_json())
+        pipe.expire(key, self._ttl_s)
+        await pipe.execute()
+
+    async def list_for_run(self, run_id: str) -> List[ToolRunResult]:
+        return [ToolRunResult.model_validate_json(raw) for raw in await self._client.hvals(self._prefix + run_id)]
@@ -1,15 +1,40 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.models.schemas import ToolManifest, ToolRunRequest, ToolRunResult
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.services.grid_actions import ToolIndex
+from app.services.rbac import PermissionDenied, PermissionSet
+from app.services.schema_validation import CompiledSchema, compile_schema
+from app.services.tool_limits import (
+    InMemoryPendingActionTracker,
+    PendingActionTracker,
+    RateLimiter,
+    RateLimitExceeded,
+    TokenBucketLimiter,
+)
+from app.services.tool_run_store import InMemoryToolRunStore, ToolRunStore
 
 
 class ToolService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        metrics: Optional[MetricsRegistry] = None,
+        run_store: Optional[ToolRunStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        pending: Optional[PendingActionTracker] = None,
+        rate_limit_window_s: float = 60.0,
+    ) -> None:
         self._manifests: Dict[str, ToolManifest] = {}
-        self._runs: Dict[str, ToolRunResult] = {}
+        self._validators: Dict[str, Tuple[CompiledSchema, CompiledSchema]] = {}
+        self._metrics = metrics or default_metrics
+        self._runs = run_store or InMemoryToolRunStore(metrics=self._metrics)
+        self._rate_limiter = rate_limiter or TokenBucketLimiter()
+        self._pending = pending or InMemoryPendingActionTracker()
+        self._rate_limit_window_s = rate_limit_window_s
+        self._index: Optional[ToolIndex] = None
         self._register_defaults()
 
     def _register_defaults(self) -> None:
@@ -19,7 +44,17 @@ class ToolService:
                 description="Apply filter to a grid",
                 input_schema={
                     "type": "object",
-                    "properties": {"gridId": {"type": "string"}, "filters": {"type": "array"}},
+                    "properties": {
+                        "gridId": {"type": "string"},
+                        "filters": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {"field": {"type": "string"}, "op": {"type": "string"}},
+                                "required": ["field", "op"],
+                            },
+                        },
+                    },
                     "required": ["gridId", "filters"],
                 },
                 output_schema={"type": "object", "properties": {"applied": {"type": "boolean"}}},
@@ -33,7 +68,20 @@ class ToolService:
                 description="Apply sort to a grid",
                 input_schema={
                     "type": "object",
-                    "properties": {"gridId": {"type": "string"}, "sorts": {"type": "array"}},
+                    "properties": {
+                        "gridId": {"type": "string"},
+                        "sorts": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "field": {"type": "string"},
+                                    "dir": {"type": "string", "enum": ["asc", "desc"]},
+                                },
+                                "required": ["field"],
+                            },
+                        },
+                    },
                     "required": ["gridId", "sorts"],
                 },
                 output_schema={"type": "object", "properties": {"applied": {"type": "boolean"}}},
@@ -47,7 +95,10 @@ class ToolService:
                 description="Apply grouping to a grid",
                 input_schema={
                     "type": "object",
-                    "properties": {"gridId": {"type": "string"}, "groups": {"type": "array"}},
+                    "properties": {
+                        "gridId": {"type": "string"},
+                        "groups": {"type": "array", "items": {"type": "string"}},
+                    },
                     "required": ["gridId", "groups"],
                 },
                 output_schema={"type": "object", "properties": {"applied": {"type": "boolean"}}},
@@ -57,7 +108,10 @@ class ToolService:
         )
 
     def register(self, manifest: ToolManifest) -> None:
+        validators = (compile_schema(manifest.input_schema), compile_schema(manifest.output_schema))
         self._manifests[manifest.name] = manifest
+        self._validators[manifest.name] = validators
+        self._index = None
 
     def list_manifests(self) -> List[ToolManifest]:
         return list(self._manifests.values())
@@ -65,20 +119,61 @@ class ToolService:
     def get_manifest(self, name: str) -> ToolManifest:
         return self._manifests[name]
 
+    def tool_index(self) -> ToolIndex:
+        if self._index is None:
+            self._index = ToolIndex(self._manifests.values())
+        return self._index
+
+    def check_permissions(self, manifest: ToolManifest, permissions: Optional[PermissionSet]) -> None:
+        if permissions is None or not manifest.permissions:
+            return
+        missing = permissions.missing(manifest.permissions)
+        if missing:
+            self._metrics.incr("tool.permission_denied", tool=manifest.name)
+            raise PermissionDenied(f"Missing permissions for tool {manifest.name}: {missing}")
+
     def validate_args(self, manifest: ToolManifest, args: Dict[str, Any]) -> None:
-        schema = manifest.input_schema
-        required = schema.get("required", [])
-        for field in required:
-            if field not in args:
-                raise ValueError(f"Missing required field: {field}")
+        self._validators[manifest.name][0](args)
 
-    def create_action(self, tool: str, args: Dict[str, Any], run_id: str) -> ToolRunRequest:
+    def validate_output(self, manifest: ToolManifest, output: Dict[str, Any]) -> None:
+        self._validators[manifest.name][1](output)
+
+    async def create_action(
+        self,
+        tool: str,
+        args: Dict[str, Any],
+        run_id: str,
+        tenant_id: str = "",
+        permissions: Optional[PermissionSet] = None,
+    ) -> ToolRunRequest:
         manifest = self.get_manifest(tool)
+        self.check_permissions(manifest, permissions)
         self.validate_args(manifest, args)
-        return ToolRunRequest(run_id=run_id, action_id=str(uuid.uuid4()), tool=tool, args=args)
+        await self.expire_pending()
+        refill_per_s = manifest.rate_limit / self._rate_limit_window_s
+        if not await self._rate_limiter.acquire(tenant_id, tool, manifest.rate_limit, refill_per_s):
+            self._metrics.incr("tool.rate_limited", tool=tool)
+            raise RateLimitExceeded(f"Rate limit exceeded for tool {tool}")
+        self._metrics.incr("tool.actions", tool=tool)
+        action = ToolRunRequest(run_id=run_id, action_id=str(uuid.uuid4()), tool=tool, args=args)
+        await self._pending.track(action, manifest.timeout_ms)
+        return action
+
+    async def record_result(self, result: ToolRunResult) -> None:
+        await self.expire_pending()
+        action = await self._pending.get(result.action_id)
+        if action is None or action.run_id != result.run_id:
+            raise LookupError(f"Unknown or expired action: {result.action_id}")
+        if result.status == "ok":
+            self.validate_output(self.get_manifest(action.tool), result.output)
+        await self._pending.resolve(result.action_id)
+        await self._runs.add(result)
+        self._metrics.incr("tool.results", status=result.status)
 
-    def record_result(self, result: ToolRunResult) -> None:
-        self._runs[result.action_id] = result
+    async def expire_pending(self) -> None:
+        for action in await self._pending.expire():
+            await self._runs.add(ToolRunResult(run_id=action.run_id, action_id=action.action_id, status="timeout"))
+            self._metrics.incr("tool.results", status="timeout")
 
-    def list_results(self, run_id: str) -> List[ToolRunResult]:
-        return [r for r in self._runs.values() if r.run_id == run_id]
+    async def list_results(self, run_id: str) -> List[ToolRunResult]:
+        return await self._runs.list_for_run(run_id)
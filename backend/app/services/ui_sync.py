@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from app.models.schemas import ToolRunRequest, ToolRunResult
+from app.observability.metrics import MetricsRegistry, metrics as default_metrics
+from app.services.state_service import StateService
+from app.services.state_store import StateVersionConflict
+from app.services.tool_service import ToolService
+
+
+REPLY_TYPES = frozenset({"ack", "nack", "error", "snapshot"})
+
+
+class SessionHub:
+    def __init__(
+        self,
+        state_service: StateService,
+        tool_service: ToolService,
+        queue_size: int = 256,
+        max_tracked_runs: int = 10_000,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._state_service = state_service
+        self._tool_service = tool_service
+        self._queue_size = queue_size
+        self._max_tracked_runs = max_tracked_runs
+        self._metrics = metrics or default_metrics
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._run_sessions: "OrderedDict[str, str]" = OrderedDict()
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(session_id, set()).add(queue)
+        self._metrics.add_gauge("ui_sync.subscribers", 1)
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(session_id)
+        if queues and queue in queues:
+            queues.discard(queue)
+            self._metrics.add_gauge("ui_sync.subscribers", -1)
+            if not queues:
+                del self._subscribers[session_id]
+
+    async def publish(self, session_id: str, message: Dict[str, Any], exclude: Optional[asyncio.Queue] = None) -> None:
+        version: Optional[int] = None
+        for queue in list(self._subscribers.get(session_id, ())):
+            if queue is exclude:
+                continue
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                if version is None:
+                    version = await self.version(session_id)
+                self._resync(queue, version)
+            self._metrics.incr("ui_sync.messages", type=message["type"])
+
+    def _resync(self, queue: asyncio.Queue, version: int) -> None:
+        pending = [queue.get_nowait() for _ in range(queue.qsize())]
+        for item in pending:
+            if item.get("type") in REPLY_TYPES:
+                queue.put_nowait(item)
+        try:
+            queue.put_nowait({"type": "resync", "version": version})
+        except asyncio.QueueFull:
+            self._metrics.incr("ui_sync.resyncs_deferred")
+            return
+        self._metrics.incr("ui_sync.resyncs")
+
+    async def version(self, session_id: str) -> int:
+        return await self._state_service.get_version(session_id)
+
+    async def snapshot(self, session_id: str) -> Dict[str, Any]:
+        return {
+            "type": "snapshot",
+            "version": await self.version(session_id),
+            "ui_state": await self._state_service.get_state(session_id),
+        }
+
+    async def apply_patch(
+        self,
+        session_id: str,
+        patch: Dict[str, Any],
+        version: int,
+        source: Optional[asyncio.Queue] = None,
+    ) -> Dict[str, Any]:
+        event = await self._state_service.apply_patch(session_id, patch, version)
+        await self.publish(session_id, {"type": "state", "version": event["version"], "patch": patch}, exclude=source)
+        return event
+
+    async def apply_server_patch(self, session_id: str, patch: Dict[str, Any], attempts: int = 3) -> Dict[str, Any]:
+        for _ in range(attempts - 1):
+            try:
+                return await self.apply_patch(session_id, patch, await self.version(session_id) + 1)
+            except StateVersionConflict:
+                continue
+        return await self.apply_patch(session_id, patch, await self.version(session_id) + 1)
+
+    async def dispatch_actions(self, session_id: str, actions: List[ToolRunRequest]) -> None:
+        for action in actions:
+            self._run_sessions[action.run_id] = session_id
+            self._run_sessions.move_to_end(action.run_id)
+            await self.publish(session_id, {"type": "action", "action": action.model_dump(mode="json")})
+        while len(self._run_sessions) > self._max_tracked_runs:
+            self._run_sessions.popitem(last=False)
+
+    async def record_tool_result(
+        self, result: ToolRunResult, session_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        await self._tool_service.record_result(result)
+        session_id = session_id or self._run_sessions.get(result.run_id)
+        if session_id is None or result.status != "ok" or not result.ui_state_patch:
+            return None
+        return await self.apply_server_patch(session_id, result.ui_state_patch)